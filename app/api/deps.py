@@ -20,7 +20,11 @@ from app.providers.email import (
     MicrosoftGraphProvider,
     MockEmailProvider,
 )
+from app.services.job_queue_service import JobQueueService
+from app.services.llm_usage_service import LLMUsageService
+from app.services.single_flight_service import SingleFlightService
 from app.services.summarization_service import SummarizationService
+from app.services.summary_view_service import SummaryViewService
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -80,7 +84,7 @@ def get_email_provider() -> IEmailProvider:
     env = settings.ENVIRONMENT
 
     if env == "production":
-        return MicrosoftGraphProvider(access_token="...")
+        return MicrosoftGraphProvider()
 
     return MockEmailProvider()
 
@@ -100,6 +104,34 @@ async def async_redis() -> AsyncIterator[Redis]:
 AsyncRedisClientDep = Annotated[Redis, Depends(async_redis)]
 
 
+def get_single_flight(redis: AsyncRedisClientDep) -> SingleFlightService:
+    return SingleFlightService(redis)
+
+
+SingleFlightDep = Annotated[SingleFlightService, Depends(get_single_flight)]
+
+
+def get_job_queue(redis: AsyncRedisClientDep) -> JobQueueService:
+    return JobQueueService(redis)
+
+
+JobQueueDep = Annotated[JobQueueService, Depends(get_job_queue)]
+
+
+def get_summary_views(redis: AsyncRedisClientDep) -> SummaryViewService:
+    return SummaryViewService(redis)
+
+
+SummaryViewDep = Annotated[SummaryViewService, Depends(get_summary_views)]
+
+
+def get_llm_usage(redis: AsyncRedisClientDep) -> LLMUsageService:
+    return LLMUsageService(redis)
+
+
+LLMUsageDep = Annotated[LLMUsageService, Depends(get_llm_usage)]
+
+
 class RoleChecker:
     def __init__(self, allowed_roles: list[str]):
         self.allowed_roles = allowed_roles
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import accountants, login, private, utils, clients, firms
+from app.api.routes import accountants, login, private, utils, clients, firms, webhooks
 from app.core.config import settings
 
 api_router = APIRouter()
@@ -9,6 +9,7 @@ api_router.include_router(accountants.router)
 api_router.include_router(firms.router)
 api_router.include_router(utils.router)
 api_router.include_router(clients.router)
+api_router.include_router(webhooks.router)
 
 
 
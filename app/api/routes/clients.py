@@ -1,15 +1,25 @@
+import asyncio
+import json
+import logging
 import uuid
+from collections.abc import AsyncIterator
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from app import crud
 from app.api.deps import (
     CurrentUser,
+    JobQueueDep,
     SessionDep,
+    SingleFlightDep,
     SummarizerDep,
+    SummaryViewDep,
     get_email_provider,
 )
+from app.core.db import AsyncSessionLocal
+from app.llms.resilient_llm import CircuitOpenError
 from app.models import (
     Client,
     ClientCreate,
@@ -20,6 +30,9 @@ from app.models import (
 )
 from app.providers.email import IEmailProvider
 from app.schema.enums import FirmRole
+from app.schema.job import Job
+from app.services.single_flight_service import SingleFlightService
+from app.services.summarization_service import SummarizationService, summary_flight_key
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
@@ -144,6 +157,8 @@ async def get_client_summary(
     session: SessionDep,
     current_user: CurrentUser,
     summarizer: SummarizerDep,
+    single_flight: SingleFlightDep,
+    summary_views: SummaryViewDep,
     email_provider: IEmailProvider = Depends(get_email_provider),
 ):
     """
@@ -162,25 +177,42 @@ async def get_client_summary(
         if not firm_accountant or firm_accountant.firm_id != client.firm_id:
             raise HTTPException(status_code=403, detail="Not enough permissions")
 
+    # Keeps the summary pre-warmed while people look at it
+    await summary_views.record(client_id)
+
     # 2. Check if summary exists in DB (and is not stale)
     existing_summary = await summarizer.get_stored_summary(client_id)
     if existing_summary:
         return existing_summary
 
-    # 3. If no summary, trigger initial generation
-    return await summarizer.process_and_store_summary(client_id, email_provider)
+    # 3. If no summary, trigger initial generation. Concurrent requests for
+    # the same client wait for a single generation.
+    try:
+        return await single_flight.do(
+            summary_flight_key(client_id),
+            lambda: summarizer.process_and_store_summary(client_id, email_provider),
+        )
+    except CircuitOpenError:
+        raise HTTPException(
+            status_code=503, detail="Summaries are temporarily unavailable"
+        )
 
 
-@router.post("/{client_id}/refresh", response_model=dict)
-async def refresh_client_summary(
+@router.get("/{client_id}/summary/stream")
+async def stream_client_summary(
     client_id: uuid.UUID,
     session: SessionDep,
     current_user: CurrentUser,
-    summarizer: SummarizerDep,
+    single_flight: SingleFlightDep,
+    summary_views: SummaryViewDep,
     email_provider: IEmailProvider = Depends(get_email_provider),
 ):
     """
-    Bypasses cache, re-fetches emails from Mock/Graph, and updates the summary.
+    Server-Sent Events version of `/{client_id}/summary`. Emits `delta`
+    events with the raw model output as it is generated, `actor` and
+    `open_item` events as soon as each item is complete, and a final
+    `summary` event once the summary is stored. With threading, threads are
+    generated concurrently and `delta` events are `{"thread_id", "text"}`.
     """
     client = await crud.client.get(session=session, id=client_id)
     if not client:
@@ -193,11 +225,133 @@ async def refresh_client_summary(
         if not firm_accountant or firm_accountant.firm_id != client.firm_id:
             raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    # Force re-analysis
-    updated_summary = await summarizer.process_and_store_summary(
-        client_id, email_provider, force_refresh=True
+    await summary_views.record(client_id)
+    return StreamingResponse(
+        _summary_events(client_id, single_flight, email_provider),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return updated_summary
+
+
+_flights: set[asyncio.Task] = set()
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _summary_events(
+    client_id: uuid.UUID,
+    single_flight: SingleFlightService,
+    email_provider: IEmailProvider,
+) -> AsyncIterator[str]:
+    """
+    Runs the streaming generation under the client's single-flight key. If
+    another request is already generating, only its final summary is sent.
+
+    The generation opens its own session, as the request's is closed before
+    the response streams, and runs to completion if the client disconnects
+    so the summary is still stored and handed to any followers.
+    """
+    events: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+
+    async def generate() -> dict:
+        summary: dict = {}
+        async with AsyncSessionLocal() as session:
+            summarizer = SummarizationService(session)
+            async for event, data in summarizer.stream_summary(client_id, email_provider):
+                await events.put((event, data))
+                if event == "summary":
+                    summary = data
+        return summary
+
+    flight = asyncio.create_task(single_flight.do(summary_flight_key(client_id), generate))
+    # Held until done, since the stream may close before the flight does
+    _flights.add(flight)
+    flight.add_done_callback(_flights.discard)
+    sent_summary = False
+    try:
+        while not sent_summary:
+            next_event = asyncio.create_task(events.get())
+            await asyncio.wait({next_event, flight}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_event.done():
+                next_event.cancel()
+                break
+            event, data = next_event.result()
+            yield _sse(event, data)
+            sent_summary = event == "summary"
+
+        # Let the leader publish its result to any followers. When another
+        # request was generating, only its final summary is available.
+        summary = await asyncio.shield(flight)
+        while not sent_summary and not events.empty():
+            event, data = events.get_nowait()
+            yield _sse(event, data)
+            sent_summary = event == "summary"
+        if not sent_summary:
+            yield _sse("summary", summary)
+    except Exception as e:
+        logging.error(f"Streaming summary for client {client_id} failed: {e}", exc_info=True)
+        yield _sse("error", {"message": "Summary generation failed"})
+
+
+@router.post(
+    "/{client_id}/refresh",
+    response_model=Job,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def refresh_client_summary(
+    client_id: uuid.UUID,
+    session: SessionDep,
+    current_user: CurrentUser,
+    job_queue: JobQueueDep,
+):
+    """
+    Queues a refresh that bypasses cache, re-fetches emails from Mock/Graph,
+    and updates the summary. Poll `/{client_id}/jobs/{job_id}` for the result.
+    """
+    client = await crud.client.get(session=session, id=client_id)
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+
+    if not current_user.is_superuser:
+        firm_accountant = await crud.firm_accountant.get_by_param(
+            session=session, params={"accountant_id": current_user.id}
+        )
+        if not firm_accountant or firm_accountant.firm_id != client.firm_id:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    # Force re-analysis in the summary worker
+    return await job_queue.enqueue_summary_refresh(client_id, force_refresh=True)
+
+
+@router.get("/{client_id}/jobs/{job_id}", response_model=Job)
+async def read_client_job(
+    client_id: uuid.UUID,
+    job_id: str,
+    session: SessionDep,
+    current_user: CurrentUser,
+    job_queue: JobQueueDep,
+):
+    """
+    Reports whether a queued refresh is queued, running, done or failed,
+    with the summary once done.
+    """
+    client = await crud.client.get(session=session, id=client_id)
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+
+    if not current_user.is_superuser:
+        firm_accountant = await crud.firm_accountant.get_by_param(
+            session=session, params={"accountant_id": current_user.id}
+        )
+        if not firm_accountant or firm_accountant.firm_id != client.firm_id:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    job = await job_queue.get(job_id)
+    if not job or job.client_id != client_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 # ----------------------------------------------------------------
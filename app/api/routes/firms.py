@@ -1,10 +1,14 @@
 import uuid
+from datetime import date, timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, status
 
 from app import crud
 from app.api.deps import (
+    CurrentUser,
+    JobQueueDep,
+    LLMUsageDep,
     SessionDep,
     get_current_active_superuser,
 )
@@ -15,6 +19,9 @@ from app.models import (
     FirmUpdate,
     Message,
 )
+from app.schema.enums import JobKind
+from app.schema.job import Job
+from app.schema.llm_usage import FirmLLMUsage
 
 router = APIRouter(prefix="/firms", tags=["firms"])
 
@@ -78,4 +85,88 @@ async def delete_firm(session: SessionDep, firm_id: uuid.UUID) -> Any:
     if not firm:
         raise HTTPException(status_code=404, detail="Firm not found")
     await crud.firm.remove(session=session, id=firm_id)
-    return Message(message="Firm deleted successfully")
\ No newline at end of file
+    return Message(message="Firm deleted successfully")
+
+
+@router.post(
+    "/{firm_id}/refresh-summaries",
+    response_model=Job,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def refresh_firm_summaries(
+    firm_id: uuid.UUID,
+    session: SessionDep,
+    current_user: CurrentUser,
+    job_queue: JobQueueDep,
+    force_refresh: bool = False,
+) -> Any:
+    """
+    FIRM ADMIN ONLY: Queue a refresh of every client summary in the firm.
+    Clients whose emails did not change are skipped unless `force_refresh`.
+    """
+    firm = await crud.firm.get(session=session, id=firm_id)
+    if not firm:
+        raise HTTPException(status_code=404, detail="Firm not found")
+    if not current_user.is_superuser and not await crud.firm_accountant.is_admin(
+        session, firm_id=firm_id, accountant_id=current_user.id
+    ):
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    return await job_queue.enqueue_bulk_refresh(firm_id, force_refresh=force_refresh)
+
+
+@router.get("/{firm_id}/jobs/{job_id}", response_model=Job)
+async def read_firm_job(
+    firm_id: uuid.UUID,
+    job_id: str,
+    session: SessionDep,
+    current_user: CurrentUser,
+    job_queue: JobQueueDep,
+) -> Any:
+    """
+    FIRM ADMIN ONLY: Progress of a bulk refresh, including throughput.
+    """
+    if not current_user.is_superuser and not await crud.firm_accountant.is_admin(
+        session, firm_id=firm_id, accountant_id=current_user.id
+    ):
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    job = await job_queue.get(job_id)
+    if not job or job.kind != JobKind.BULK_REFRESH or job.firm_id != firm_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{firm_id}/llm-usage", response_model=FirmLLMUsage)
+async def read_firm_llm_usage(
+    firm_id: uuid.UUID,
+    session: SessionDep,
+    current_user: CurrentUser,
+    llm_usage: LLMUsageDep,
+    start: date | None = None,
+    end: date | None = None,
+    top: int = 10,
+) -> Any:
+    """
+    FIRM ADMIN ONLY: LLM tokens, latency and cost per day between `start`
+    and `end` (default: the last 30 days), and the clients that cost the most.
+    """
+    if not current_user.is_superuser and not await crud.firm_accountant.is_admin(
+        session, firm_id=firm_id, accountant_id=current_user.id
+    ):
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    end = end or llm_usage.today()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    return FirmLLMUsage(
+        firm_id=firm_id,
+        start=start,
+        end=end,
+        today=await llm_usage.firm_today(firm_id),
+        days=await crud.llm_usage.daily_totals(
+            session, firm_id=firm_id, start=start, end=end
+        ),
+        top_clients=await crud.llm_usage.top_clients(
+            session, firm_id=firm_id, start=start, end=end, limit=top
+        ),
+    )
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends
 from pydantic.networks import EmailStr
 
-from app.api.deps import get_current_active_superuser
+from app.api.deps import JobQueueDep, get_current_active_superuser
+from app.llms.registry import llm_registry
 from app.models import Message
+from app.services.adaptive_concurrency_service import limiter_metrics
+from app.services.summary_dirty_service import SummaryDirtyService
 
 
 router = APIRouter(prefix="/utils", tags=["utils"])
@@ -11,3 +14,26 @@ router = APIRouter(prefix="/utils", tags=["utils"])
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
+
+
+@router.get(
+    "/llm-metrics/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+async def llm_metrics(job_queue: JobQueueDep) -> dict:
+    """
+    LLM scheduler queue depth and wait times, per-route latencies and the
+    current adaptive concurrency limits for this process, plus the shared
+    background job backlog and the summaries waiting on a debounced refresh.
+    """
+    scheduler = llm_registry.scheduler
+    return {
+        "rate_limit_enabled": scheduler is not None,
+        "requests_per_minute": scheduler.requests_per_minute if scheduler else None,
+        "tokens_per_minute": scheduler.tokens_per_minute if scheduler else None,
+        "priorities": scheduler.metrics() if scheduler else {},
+        "routes": llm_registry.router.metrics() if llm_registry.router else {},
+        "concurrency_limits": limiter_metrics(),
+        "job_queue_depth": await job_queue.queue_depth(),
+        "dirty_summaries": await SummaryDirtyService(job_queue.redis).pending(),
+    }
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse, Response
+from pydantic import ValidationError
+
+from app.api.deps import get_email_provider
+from app.core.db import AsyncSessionLocal, get_async_redis
+from app.providers.email import MicrosoftGraphProvider
+from app.schema.notification import ChangeNotification, ChangeNotificationCollection
+from app.services.change_notification_service import (
+    ChangeNotificationService,
+    authentic_notifications,
+)
+from app.services.summary_dirty_service import SummaryDirtyService
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+
+
+async def process_notifications(notifications: list[ChangeNotification]) -> None:
+    provider = get_email_provider()
+    async with AsyncSessionLocal() as session, get_async_redis() as redis:
+        service = ChangeNotificationService(
+            session,
+            SummaryDirtyService(redis),
+            provider if isinstance(provider, MicrosoftGraphProvider) else None,
+        )
+        await service.process(notifications)
+
+
+@router.post("/graph", status_code=status.HTTP_202_ACCEPTED)
+async def graph_notifications(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    validationToken: str | None = None,
+) -> Response:
+    """
+    Microsoft Graph change notifications for the shared mailbox.
+
+    Answers the subscription validation handshake by echoing
+    `validationToken`. Notifications are acknowledged right away, since
+    Graph expects a reply within seconds; mapping them to clients and
+    marking their summaries dirty happens after the response.
+    """
+    if validationToken is not None:
+        return PlainTextResponse(validationToken)
+    try:
+        collection = ChangeNotificationCollection.model_validate_json(await request.body())
+    except ValidationError:
+        raise HTTPException(status_code=400, detail="Invalid change notification payload")
+
+    notifications = authentic_notifications(collection.value)
+    if notifications:
+        background_tasks.add_task(process_notifications, notifications)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
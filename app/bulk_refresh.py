@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import logging
+import uuid
+
+from app.api.deps import get_email_provider
+from app.core.config import settings
+from app.core.db import get_async_redis
+from app.llms.context import llm_priority
+from app.llms.registry import llm_registry
+from app.providers.email.graph_email_provider import close_graph_http_client
+from app.schema.enums import LLMPriority
+from app.schema.job import BulkRefreshReport
+from app.services.bulk_refresh_service import BulkRefreshService
+from app.services.single_flight_service import SingleFlightService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Refresh every client summary of a firm."
+    )
+    parser.add_argument("firm_id", type=uuid.UUID)
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.SUMMARY_BULK_CONCURRENCY
+    )
+    parser.add_argument(
+        "--llm-budget", type=int, default=settings.SUMMARY_BULK_LLM_BUDGET
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-summarize clients even if their emails did not change",
+    )
+    return parser.parse_args()
+
+
+async def log_progress(report: BulkRefreshReport) -> None:
+    logger.info(
+        f"{report.processed}/{report.total} clients "
+        f"({report.refreshed} refreshed, {report.skipped} skipped, "
+        f"{report.deferred} deferred, {report.failed} failed) "
+        f"- {report.clients_per_minute:.1f} clients/min"
+    )
+
+
+async def main() -> None:
+    args = parse_args()
+    llm_priority.set(LLMPriority.BACKGROUND)
+    llm_registry.start()
+    try:
+        async with get_async_redis() as redis:
+            service = BulkRefreshService(
+                get_email_provider(),
+                SingleFlightService(redis),
+                concurrency=args.concurrency,
+                llm_budget=args.llm_budget,
+            )
+            await service.refresh_firm(
+                args.firm_id, force_refresh=args.force, on_progress=log_progress
+            )
+    finally:
+        await llm_registry.close()
+        await close_graph_http_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -29,4 +29,26 @@ DATE_PROMPT = '''### Today Current Date and Time:\n {} at {} local time in the {
 
 
 
+DELTA_PROMPT = """
+You previously summarized an email thread between accountants and a client. New emails have
+arrived since then. Update the previous summary using ONLY the information in the new emails:
+- Add any new people involved to "actors".
+- Mark open items as resolved (remove them) when the new emails clearly close them.
+- Add new pending actions, unanswered questions, or follow-ups to "open_items".
+- Keep everything from the previous summary that the new emails do not change.
+
+Previous summary:
+
+{}
+"""
+
+REDUCE_PROMPT = """
+The email thread was too long to read at once, so it was split into consecutive parts and each
+part was summarized separately. Combine the partial summaries below, listed in chronological
+order, into a single summary of the whole thread:
+- Merge actors that refer to the same person or organization.
+- Drop open items that a later part shows as resolved, and merge duplicates.
+- "concluded" is true only if nothing is pending once all parts are considered.
+"""
+
 DUMMY_HASH = "$argon2id$v=19$m=65536,t=3,p=4$MjQyZWE1MzBjYjJlZTI0Yw$YTU4NGM5ZTZmYjE2NzZlZjY0ZWY3ZGRkY2U2OWFjNjk"
\ No newline at end of file
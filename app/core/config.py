@@ -87,6 +87,159 @@ class Settings(BaseSettings):
     EMAILS_FROM_NAME: str | None = None
     GEMINI_API_KEY: str
 
+    # Microsoft Graph mail provider, used when ENVIRONMENT=production. Client
+    # correspondence is read from GRAPH_MAILBOX with app-only credentials.
+    GRAPH_BASE_URL: str = "https://graph.microsoft.com/v1.0"
+    GRAPH_TOKEN_URL: str = "https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
+    GRAPH_TENANT_ID: str | None = None
+    GRAPH_CLIENT_ID: str | None = None
+    GRAPH_CLIENT_SECRET: str | None = None
+    GRAPH_MAILBOX: str | None = None
+    GRAPH_MAIL_FOLDERS: list[str] = ["inbox", "sentitems"]
+    GRAPH_PAGE_SIZE: int = 100
+    # Incremental sync through one delta link per mailbox folder, shared by
+    # all clients; the first sync, and a new client's backfill, only reach
+    # back this many days
+    GRAPH_DELTA_ENABLED: bool = True
+    GRAPH_SYNC_WINDOW_DAYS: int = 365
+    GRAPH_HTTP2: bool = True
+    GRAPH_MAX_CONNECTIONS: int = 20
+    GRAPH_TIMEOUT_SECONDS: float = 30
+    # Throttled (429/503) requests are retried after the Retry-After
+    GRAPH_MAX_RETRIES: int = 3
+    # Secret echoed as clientState by Graph change notifications to
+    # POST /webhooks/graph; notifications are ignored while it is unset
+    GRAPH_WEBHOOK_CLIENT_STATE: str | None = None
+
+    # "fake" swaps Gemini for the offline FakeLLM, for load and benchmark runs
+    LLM_BACKEND: Literal["google", "fake"] = "google"
+    FAKE_LLM_LATENCY_MS: float = 800
+    FAKE_LLM_LATENCY_JITTER: float = 0.3
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LLM_CHUNK_SIZE: int = 40
+    FAKE_LLM_CHUNK_DELAY_MS: float = 20
+    FAKE_LLM_SEED: int | None = None
+
+    # Summaries of small mailboxes go to a lighter model with a smaller
+    # output budget; see app/llms/router.py for the routes
+    LLM_ROUTING_ENABLED: bool = True
+    LLM_MODEL: str = "gemini-3-flash-preview"
+    LLM_SMALL_MODEL: str = "gemini-2.5-flash-lite"
+    LLM_SMALL_INPUT_TOKENS: int = 4_000
+    LLM_SMALL_EMAIL_COUNT: int = 20
+
+    # Per-call token, latency and cost accounting, buffered in process and
+    # written every FLUSH seconds (or once BATCH calls are waiting). Prices
+    # are USD per million input and output tokens; models not listed are
+    # counted at no cost.
+    LLM_USAGE_TRACKING_ENABLED: bool = True
+    LLM_USAGE_POSTGRES_ENABLED: bool = True
+    LLM_USAGE_REDIS_RETENTION_DAYS: int = 35
+    LLM_USAGE_FLUSH_SECONDS: float = 5
+    LLM_USAGE_FLUSH_BATCH: int = 500
+    LLM_PRICES_PER_MILLION_TOKENS: dict[str, tuple[float, float]] = {
+        "gemini-3-flash-preview": (0.50, 3.00),
+        "gemini-2.5-flash-lite": (0.10, 0.40),
+    }
+
+    # Identical prompts are answered from a Redis (and optionally Postgres)
+    # cache. The date in the prompt is rounded down to this many minutes so
+    # prompts built within the same window are byte-identical.
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 7
+    LLM_CACHE_POSTGRES_ENABLED: bool = False
+    SUMMARY_PROMPT_TIME_QUANTUM_MINUTES: int = 60 * 24
+
+    # Provider quota shared by all workers; interactive calls are admitted
+    # before background refreshes, which may not dip into the share of each
+    # bucket kept for interactive calls
+    LLM_RATE_LIMIT_ENABLED: bool = True
+    LLM_REQUESTS_PER_MINUTE: int = 1_000
+    LLM_TOKENS_PER_MINUTE: int = 1_000_000
+    LLM_INTERACTIVE_RESERVED_SHARE: float = 0.2
+
+    # Per-attempt deadline, retries and circuit breaker around LLM calls.
+    # Hedging sends a duplicate request once a call is slower than the recent
+    # LLM_HEDGE_PERCENTILE latency, so it is off by default to spare quota.
+    LLM_CALL_TIMEOUT_SECONDS: float = 60
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    LLM_RETRY_MAX_DELAY_SECONDS: float = 8
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_PERCENTILE: float = 95
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30
+
+    # Adaptive (AIMD) concurrency for upstreams that throttle with 429 and
+    # Retry-After, i.e. the LLM backend and each Graph mailbox. The limit
+    # grows while calls succeed and is cut by BACKOFF when throttled.
+    LLM_ADAPTIVE_CONCURRENCY_ENABLED: bool = True
+    ADAPTIVE_CONCURRENCY_INITIAL: int = 8
+    ADAPTIVE_CONCURRENCY_MIN: int = 1
+    ADAPTIVE_CONCURRENCY_MAX: int = 64
+    ADAPTIVE_CONCURRENCY_BACKOFF: float = 0.5
+    ADAPTIVE_CONCURRENCY_DEFAULT_RETRY_AFTER_SECONDS: float = 1
+
+    # Copies of the same message (other mailboxes, CC copies) are dropped
+    # before summarizing, keyed on Internet-Message-Id or a content hash
+    SUMMARY_DEDUP_ENABLED: bool = True
+    # Summarize each conversation thread on its own, caching thread summaries
+    # by content, and merge them into the client summary: a new reply only
+    # re-summarizes its own thread
+    SUMMARY_THREADING_ENABLED: bool = True
+    # Without threading, only send emails added since the stored summary to
+    # the LLM, together with the previous summary, instead of re-summarizing
+    # the whole history
+    SUMMARY_DELTA_ENABLED: bool = True
+    # Summaries cover emails received in the last this many days (None = all),
+    # read from the ingestion store by its (client_id, received_at) index
+    SUMMARY_EMAIL_WINDOW_DAYS: int | None = None
+    # Stored summaries older than this are regenerated on read
+    SUMMARY_STALE_AFTER_MINUTES: int = 60
+    # Refresh summaries when Graph change notifications mark them dirty
+    # rather than by age. Age then only drives a safety sweep for missed
+    # notifications, after SUMMARY_SAFETY_SWEEP_HOURS and off-peak only.
+    SUMMARY_CHANGE_NOTIFICATIONS_ENABLED: bool = False
+    SUMMARY_SAFETY_SWEEP_HOURS: int = 24
+    # Threads larger than this many (estimated) tokens are split into chunks,
+    # summarized concurrently and then reduced into a single summary
+    SUMMARY_CHUNK_TOKEN_BUDGET: int = 30_000
+    SUMMARY_CHUNK_CONCURRENCY: int = 4
+    # Concurrent summary generations for the same client share one LLM call
+    # across all workers; followers wait at most the lock TTL for the leader
+    SUMMARY_SINGLE_FLIGHT_LOCK_TTL_SECONDS: int = 120
+    SUMMARY_SINGLE_FLIGHT_RESULT_TTL_SECONDS: int = 10
+
+    # A change notification marks the client's summary dirty; its refresh is
+    # queued once no notification came for DEBOUNCE seconds, and at most
+    # MAX_DELAY after the first. app/summary_scheduler.py checks every POLL.
+    SUMMARY_DIRTY_DEBOUNCE_SECONDS: float = 5
+    SUMMARY_DIRTY_MAX_DELAY_SECONDS: float = 60
+    SUMMARY_DIRTY_POLL_SECONDS: float = 1
+
+    # Background jobs run by app/summary_worker.py. A running job holds a
+    # lease the worker renews; jobs whose lease lapsed (the worker died) are
+    # put back on the queue.
+    JOB_TTL_SECONDS: int = 60 * 60 * 24
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_LEASE_SECONDS: int = 60
+
+    # Firm-wide bulk refresh: clients processed at once (keep below the DB
+    # pool size) and maximum clients re-summarized by the LLM per run
+    SUMMARY_BULK_CONCURRENCY: int = 8
+    SUMMARY_BULK_LLM_BUDGET: int = 500
+
+    # app/summary_scheduler.py queues refreshes for summaries that will go
+    # stale within the lead time. During peak hours only clients viewed in
+    # the last SUMMARY_PREWARM_VIEWED_WITHIN_HOURS are pre-warmed; everyone
+    # else waits for the off-peak hours (UTC), in bigger batches.
+    SUMMARY_PREWARM_LEAD_MINUTES: int = 10
+    SUMMARY_PREWARM_INTERVAL_SECONDS: int = 60
+    SUMMARY_PREWARM_BATCH_SIZE: int = 50
+    SUMMARY_PREWARM_OFF_PEAK_BATCH_SIZE: int = 500
+    SUMMARY_PREWARM_OFF_PEAK_HOURS: list[int] = [0, 1, 2, 3, 4, 5, 6, 20, 21, 22, 23]
+    SUMMARY_PREWARM_VIEWED_WITHIN_HOURS: int = 24 * 7
+
 
     @model_validator(mode="after")
     def _set_default_emails_from(self) -> Self:
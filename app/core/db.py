@@ -64,15 +64,19 @@ def _get_redis_pool() -> ConnectionPool:
     return _redis_pool
 
 
-@asynccontextmanager
-async def get_async_redis() -> AsyncGenerator[Redis, None]:
+def get_redis_client() -> Redis:
     global _redis
 
     if _redis is None:
         _redis = Redis(connection_pool=_get_redis_pool())
 
+    return _redis
+
+
+@asynccontextmanager
+async def get_async_redis() -> AsyncGenerator[Redis, None]:
     try:
-        yield _redis
+        yield get_redis_client()
     finally:
         # Do NOT close per request
         # App shutdown should close the pool instead
@@ -1,5 +1,12 @@
 from .crud_accountant import accountant
 from .crud_client import client
+from .crud_email_fingerprint import email_fingerprint
 from .crud_email_summary import email_summary
 from .crud_firm import firm
 from .crud_firm_accountant import firm_accountant
+from .crud_graph_sync_state import graph_sync_state
+from .crud_ingested_email import ingested_email
+from .crud_llm_usage import llm_usage
+from .crud_mock_email import mock_email
+from .crud_seen_email import seen_email
+from .crud_thread_summary import thread_summary
@@ -1,6 +1,8 @@
+import uuid
+from collections.abc import Collection
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
@@ -20,10 +22,35 @@ class CRUDClient(CRUDBase[Client, ClientCreate, ClientUpdate]):
         result = await session.execute(
             select(Client)
             .where(Client.firm_id == firm_id)
+            .order_by(Client.id)
             .offset(skip)
             .limit(limit)
         )
         return list(result.scalars().all())
 
+    async def ids_by_emails(
+        self, session: AsyncSession, *, emails: Collection[str]
+    ) -> set[uuid.UUID]:
+        """Active clients with any of these (case-insensitive) addresses."""
+        by_email = await self.ids_by_email(session, emails=emails)
+        return {client_id for ids in by_email.values() for client_id in ids}
+
+    async def ids_by_email(
+        self, session: AsyncSession, *, emails: Collection[str]
+    ) -> dict[str, set[uuid.UUID]]:
+        """Active clients by lower-cased address, for the addresses given."""
+        if not emails:
+            return {}
+        result = await session.execute(
+            select(func.lower(Client.email), Client.id).where(
+                func.lower(Client.email).in_({e.lower() for e in emails}),
+                Client.is_active,
+            )
+        )
+        by_email: dict[str, set[uuid.UUID]] = {}
+        for email, client_id in result.tuples():
+            by_email.setdefault(email, set()).add(client_id)
+        return by_email
+
 
 client = CRUDClient(Client)
@@ -0,0 +1,51 @@
+import uuid
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.email_fingerprint import EmailFingerprint
+
+
+class CRUDEmailFingerprint(
+    CRUDBase[EmailFingerprint, EmailFingerprint, EmailFingerprint]
+):
+
+    async def get_by_client(
+        self, session: AsyncSession, *, client_id: uuid.UUID
+    ) -> dict[str, str]:
+        """Fingerprints of the client's summarized emails, keyed by email id."""
+        result = await session.execute(
+            select(EmailFingerprint.email_id, EmailFingerprint.fingerprint).where(
+                EmailFingerprint.client_id == client_id
+            )
+        )
+        return dict(result.tuples().all())
+
+    async def stage_changes(
+        self,
+        session: AsyncSession,
+        *,
+        client_id: uuid.UUID,
+        upserts: dict[str, str],
+        removed: list[str],
+    ) -> None:
+        """
+        Applies added, changed and removed fingerprints without committing,
+        so they land in the same transaction as the summary they describe.
+        """
+        changed = list(upserts) + removed
+        if changed:
+            await session.execute(
+                delete(EmailFingerprint).where(
+                    EmailFingerprint.client_id == client_id,
+                    EmailFingerprint.email_id.in_(changed),
+                )
+            )
+        session.add_all(
+            EmailFingerprint(client_id=client_id, email_id=email_id, fingerprint=fingerprint)
+            for email_id, fingerprint in upserts.items()
+        )
+
+
+email_fingerprint = CRUDEmailFingerprint(EmailFingerprint)
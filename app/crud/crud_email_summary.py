@@ -1,9 +1,13 @@
+import uuid
+from collections.abc import Collection
+from datetime import datetime
 from typing import Any
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
+from app.models.client import Client
 from app.models.email_summary import (
     EmailSummary,
     EmailSummaryCreate,
@@ -28,5 +32,33 @@ class CRUDEmailSummary(
         )
         return result.scalars().first()
 
+    async def list_refreshed_before(
+        self,
+        session: AsyncSession,
+        *,
+        refreshed_before: datetime,
+        client_ids: Collection[uuid.UUID] | None = None,
+        limit: int = 100,
+    ) -> list[EmailSummary]:
+        """
+        Summaries of active clients (of `client_ids` when given) last
+        refreshed before `refreshed_before`, oldest first. Served by the
+        index on `last_refreshed`.
+        """
+        statement = (
+            select(EmailSummary)
+            .join(Client, Client.id == EmailSummary.client_id)
+            .where(
+                EmailSummary.last_refreshed < refreshed_before,
+                Client.is_active,
+            )
+        )
+        if client_ids is not None:
+            statement = statement.where(EmailSummary.client_id.in_(client_ids))
+        result = await session.execute(
+            statement.order_by(EmailSummary.last_refreshed).limit(limit)
+        )
+        return list(result.scalars().all())
+
 
 email_summary = CRUDEmailSummary(EmailSummary)
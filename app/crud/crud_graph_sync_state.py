@@ -0,0 +1,92 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.graph_sync_state import GraphClientBackfill, GraphSyncState
+
+
+class CRUDGraphSyncState(CRUDBase[GraphSyncState, GraphSyncState, GraphSyncState]):
+
+    async def lock(self, session: AsyncSession, *, mailbox: str, folder: str) -> None:
+        """
+        Serializes syncs of the folder until the transaction ends, so each
+        continues from the delta link the previous one saved. An advisory
+        lock, since there is no row to lock before the first sync.
+        """
+        await session.execute(
+            select(func.pg_advisory_xact_lock(func.hashtext(mailbox), func.hashtext(folder)))
+        )
+
+    async def get_state(
+        self, session: AsyncSession, *, mailbox: str, folder: str
+    ) -> GraphSyncState | None:
+        return await session.scalar(
+            select(GraphSyncState).where(
+                GraphSyncState.mailbox == mailbox,
+                GraphSyncState.folder == folder,
+            )
+        )
+
+    async def is_synced(
+        self, session: AsyncSession, *, mailbox: str, folders: list[str]
+    ) -> bool:
+        """Whether every folder has been synced once and has a delta link."""
+        synced = await session.scalar(
+            select(func.count()).where(
+                GraphSyncState.mailbox == mailbox,
+                GraphSyncState.folder.in_(folders),
+            )
+        )
+        return synced == len(set(folders))
+
+    async def save_delta_link(
+        self, session: AsyncSession, *, mailbox: str, folder: str, delta_link: str
+    ) -> None:
+        """Not committed, so it lands together with the synced emails."""
+        statement = insert(GraphSyncState).values(
+            mailbox=mailbox,
+            folder=folder,
+            delta_link=delta_link,
+            synced_at=datetime.now(timezone.utc),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["mailbox", "folder"],
+            set_={
+                "delta_link": statement.excluded.delta_link,
+                "synced_at": statement.excluded.synced_at,
+            },
+        )
+        await session.execute(statement)
+
+    async def is_backfilled(
+        self, session: AsyncSession, *, client_id: uuid.UUID, mailbox: str
+    ) -> bool:
+        return (
+            await session.scalar(
+                select(GraphClientBackfill.client_id).where(
+                    GraphClientBackfill.client_id == client_id,
+                    GraphClientBackfill.mailbox == mailbox,
+                )
+            )
+        ) is not None
+
+    async def mark_backfilled(
+        self, session: AsyncSession, *, client_id: uuid.UUID, mailbox: str
+    ) -> None:
+        """Not committed."""
+        await session.execute(
+            insert(GraphClientBackfill)
+            .values(
+                client_id=client_id,
+                mailbox=mailbox,
+                backfilled_at=datetime.now(timezone.utc),
+            )
+            .on_conflict_do_nothing()
+        )
+
+
+graph_sync_state = CRUDGraphSyncState(GraphSyncState)
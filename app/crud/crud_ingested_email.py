@@ -0,0 +1,146 @@
+import uuid
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.ingested_email import IngestedEmail
+
+
+class CRUDIngestedEmail(CRUDBase[IngestedEmail, IngestedEmail, IngestedEmail]):
+
+    async def list_by_client(
+        self,
+        session: AsyncSession,
+        *,
+        client_id: uuid.UUID,
+        provider: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        after: tuple[datetime, uuid.UUID] | None = None,
+        limit: int | None = None,
+    ) -> list[IngestedEmail]:
+        """
+        Oldest first; `since` and `until` bound `received_at` (inclusive,
+        exclusive). Pages continue from `after`, the (received_at, id) of
+        the last row of the previous page.
+        """
+        statement = select(IngestedEmail).where(IngestedEmail.client_id == client_id)
+        if provider is not None:
+            statement = statement.where(IngestedEmail.provider == provider)
+        if since is not None:
+            statement = statement.where(IngestedEmail.received_at >= since)
+        if until is not None:
+            statement = statement.where(IngestedEmail.received_at < until)
+        if after is not None:
+            statement = statement.where(
+                tuple_(IngestedEmail.received_at, IngestedEmail.id) > after
+            )
+        result = await session.execute(
+            statement.order_by(IngestedEmail.received_at, IngestedEmail.id).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def list_by_message_ids(
+        self,
+        session: AsyncSession,
+        *,
+        client_id: uuid.UUID,
+        provider: str,
+        message_ids: Sequence[str],
+    ) -> list[IngestedEmail]:
+        if not message_ids:
+            return []
+        result = await session.execute(
+            select(IngestedEmail).where(
+                IngestedEmail.client_id == client_id,
+                IngestedEmail.provider == provider,
+                IngestedEmail.message_id.in_(message_ids),
+            )
+        )
+        return list(result.scalars().all())
+
+    async def list_message_ids(
+        self,
+        session: AsyncSession,
+        *,
+        provider: str,
+        since: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> set[str]:
+        """Ids of the provider's stored messages, across clients."""
+        statement = select(IngestedEmail.message_id).where(IngestedEmail.provider == provider)
+        if since is not None:
+            statement = statement.where(IngestedEmail.received_at >= since)
+        if created_before is not None:
+            statement = statement.where(IngestedEmail.created_at < created_before)
+        result = await session.execute(statement.distinct())
+        return set(result.scalars().all())
+
+    async def client_ids_for_message(
+        self, session: AsyncSession, *, provider: str, message_id: str
+    ) -> set[uuid.UUID]:
+        result = await session.execute(
+            select(IngestedEmail.client_id).where(
+                IngestedEmail.provider == provider,
+                IngestedEmail.message_id == message_id,
+            )
+        )
+        return set(result.scalars().all())
+
+    async def upsert_many(
+        self, session: AsyncSession, *, emails: Sequence[IngestedEmail]
+    ) -> None:
+        """Inserts `emails`, replacing stored copies of the same messages. Not committed."""
+        if not emails:
+            return
+        table = IngestedEmail.__table__
+        # Bind through the table so `body` is encrypted like other columns
+        statement = insert(table).values(
+            [{c.name: getattr(e, c.name) for c in table.columns} for e in emails]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["client_id", "provider", "message_id"],
+            set_={
+                c: statement.excluded[c]
+                for c in (
+                    "internet_message_id",
+                    "conversation_id",
+                    "in_reply_to",
+                    "references",
+                    "subject",
+                    "sender",
+                    "recipient",
+                    "body",
+                    "received_at",
+                )
+            },
+        )
+        await session.execute(statement)
+
+    async def remove_messages(
+        self,
+        session: AsyncSession,
+        *,
+        client_id: uuid.UUID | None,
+        provider: str,
+        message_ids: Sequence[str] | None = None,
+    ) -> None:
+        """
+        Deletes the given messages, or all of them when None, of the client
+        or of every client when `client_id` is None. Not committed.
+        """
+        statement = delete(IngestedEmail).where(IngestedEmail.provider == provider)
+        if client_id is not None:
+            statement = statement.where(IngestedEmail.client_id == client_id)
+        if message_ids is not None:
+            if not message_ids:
+                return
+            statement = statement.where(IngestedEmail.message_id.in_(message_ids))
+        await session.execute(statement)
+
+
+ingested_email = CRUDIngestedEmail(IngestedEmail)
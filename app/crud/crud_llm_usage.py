@@ -0,0 +1,76 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.llm_usage import LlmUsage
+
+COUNTERS = (
+    "calls",
+    "streamed_calls",
+    "input_tokens",
+    "output_tokens",
+    "cost_usd",
+    "latency_seconds",
+    "time_to_first_token_seconds",
+)
+
+
+class CRUDLlmUsage(CRUDBase[LlmUsage, LlmUsage, LlmUsage]):
+
+    async def increment(self, session: AsyncSession, *, usage: LlmUsage) -> None:
+        """
+        Adds the counters of `usage` to its (firm, day, client, model) row,
+        creating the row on first use.
+        """
+        values = usage.model_dump()
+        statement = insert(LlmUsage).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=["firm_id", "day", "client_id", "model"],
+            set_={
+                **{c: getattr(LlmUsage, c) + getattr(statement.excluded, c) for c in COUNTERS},
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        await session.execute(statement)
+        await session.commit()
+
+    async def daily_totals(
+        self, session: AsyncSession, *, firm_id: uuid.UUID, start: date, end: date
+    ) -> list[dict]:
+        result = await session.execute(
+            select(LlmUsage.day, *self._sums())
+            .where(LlmUsage.firm_id == firm_id, LlmUsage.day.between(start, end))
+            .group_by(LlmUsage.day)
+            .order_by(LlmUsage.day)
+        )
+        return [dict(row._mapping) for row in result]
+
+    async def top_clients(
+        self,
+        session: AsyncSession,
+        *,
+        firm_id: uuid.UUID,
+        start: date,
+        end: date,
+        limit: int = 10,
+    ) -> list[dict]:
+        """Clients of the firm with the highest LLM cost between `start` and `end`."""
+        cost = func.sum(LlmUsage.cost_usd)
+        result = await session.execute(
+            select(LlmUsage.client_id, *self._sums())
+            .where(LlmUsage.firm_id == firm_id, LlmUsage.day.between(start, end))
+            .group_by(LlmUsage.client_id)
+            .order_by(cost.desc())
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in result]
+
+    def _sums(self) -> list:
+        return [func.sum(getattr(LlmUsage, c)).label(c) for c in COUNTERS]
+
+
+llm_usage = CRUDLlmUsage(LlmUsage)
@@ -0,0 +1,86 @@
+import uuid
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy import delete, exists, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.ingested_email import IngestedEmail
+from app.models.mock_email import MockEmail, MockEmailCreate, MockEmailUpdate
+
+
+class CRUDMockEmail(CRUDBase[MockEmail, MockEmailCreate, MockEmailUpdate]):
+
+    def _involving(self, address: str):
+        return or_(MockEmail.recipient == address, MockEmail.sender == address)
+
+    async def list_by_participant(
+        self,
+        session: AsyncSession,
+        *,
+        address: str,
+        since: datetime | None = None,
+        after: tuple[datetime, str] | None = None,
+        limit: int | None = None,
+    ) -> list[MockEmail]:
+        """
+        Emails sent to or from `address`, oldest first. Pages continue from
+        `after`, the (received_at, id) of the last row of the previous page.
+        """
+        statement = select(MockEmail).where(self._involving(address))
+        if since is not None:
+            statement = statement.where(MockEmail.received_at >= since)
+        if after is not None:
+            statement = statement.where(tuple_(MockEmail.received_at, MockEmail.id) > after)
+        result = await session.execute(
+            statement.order_by(MockEmail.received_at, MockEmail.id).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def list_gone_ingested(
+        self,
+        session: AsyncSession,
+        *,
+        address: str,
+        client_id: uuid.UUID,
+        provider: str,
+        limit: int | None = None,
+    ) -> list[str]:
+        """
+        Message ids in the client's ingestion store with no email sent to or
+        from `address` left in the mailbox.
+        """
+        upstream = exists().where(MockEmail.id == IngestedEmail.message_id, self._involving(address))
+        result = await session.execute(
+            select(IngestedEmail.message_id)
+            .where(
+                IngestedEmail.client_id == client_id,
+                IngestedEmail.provider == provider,
+                ~upstream,
+            )
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def has_participant(self, session: AsyncSession, *, address: str) -> bool:
+        return bool(await session.scalar(select(exists().where(self._involving(address)))))
+
+    async def insert_many(self, session: AsyncSession, *, rows: Sequence[dict]) -> None:
+        """Inserts rows, skipping ids that already exist. Not committed."""
+        if rows:
+            await session.execute(insert(MockEmail).values(list(rows)).on_conflict_do_nothing())
+
+    async def remove_by_participants(
+        self, session: AsyncSession, *, addresses: Sequence[str]
+    ) -> None:
+        """Not committed."""
+        await session.execute(
+            delete(MockEmail).where(
+                or_(MockEmail.recipient.in_(addresses), MockEmail.sender.in_(addresses))
+            )
+        )
+
+
+mock_email = CRUDMockEmail(MockEmail)
@@ -0,0 +1,46 @@
+import uuid
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.seen_email import SeenEmail
+
+
+class CRUDSeenEmail(CRUDBase[SeenEmail, SeenEmail, SeenEmail]):
+
+    async def get_by_client(
+        self, session: AsyncSession, *, client_id: uuid.UUID
+    ) -> dict[str, str]:
+        """Dedup keys of the client's emails, keyed by email id."""
+        result = await session.execute(
+            select(SeenEmail.email_id, SeenEmail.dedup_key).where(
+                SeenEmail.client_id == client_id
+            )
+        )
+        return dict(result.tuples().all())
+
+    async def stage_changes(
+        self,
+        session: AsyncSession,
+        *,
+        client_id: uuid.UUID,
+        upserts: dict[str, str],
+        removed: list[str],
+    ) -> None:
+        """Applies new and removed keys without committing."""
+        changed = list(upserts) + removed
+        for start in range(0, len(changed), 10_000):
+            await session.execute(
+                delete(SeenEmail).where(
+                    SeenEmail.client_id == client_id,
+                    SeenEmail.email_id.in_(changed[start : start + 10_000]),
+                )
+            )
+        session.add_all(
+            SeenEmail(client_id=client_id, email_id=email_id, dedup_key=key)
+            for email_id, key in upserts.items()
+        )
+
+
+seen_email = CRUDSeenEmail(SeenEmail)
@@ -0,0 +1,46 @@
+import uuid
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.thread_summary import ThreadSummary
+
+
+class CRUDThreadSummary(CRUDBase[ThreadSummary, ThreadSummary, ThreadSummary]):
+
+    async def get_by_client(
+        self, session: AsyncSession, *, client_id: uuid.UUID
+    ) -> dict[str, str]:
+        """The client's cached thread summaries (JSON), keyed by thread fingerprint."""
+        result = await session.execute(
+            select(ThreadSummary.fingerprint, ThreadSummary.summary).where(
+                ThreadSummary.client_id == client_id
+            )
+        )
+        return dict(result.tuples().all())
+
+    async def stage_changes(
+        self,
+        session: AsyncSession,
+        *,
+        client_id: uuid.UUID,
+        upserts: list[ThreadSummary],
+        removed: list[str],
+    ) -> None:
+        """
+        Adds new thread summaries and drops those of threads that are gone,
+        without committing, like `email_fingerprint.stage_changes`.
+        """
+        changed = [t.fingerprint for t in upserts] + removed
+        if changed:
+            await session.execute(
+                delete(ThreadSummary).where(
+                    ThreadSummary.client_id == client_id,
+                    ThreadSummary.fingerprint.in_(changed),
+                )
+            )
+        session.add_all(upserts)
+
+
+thread_summary = CRUDThreadSummary(ThreadSummary)
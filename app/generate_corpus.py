@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+
+from app.core.db import AsyncSessionLocal
+from app.services.mock_corpus_service import CorpusSpec, MockCorpusService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Bulk-load a reproducible synthetic mailbox corpus into mockemail."
+    )
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--emails-per-client", type=int, default=200)
+    parser.add_argument(
+        "--thread-depth", type=int, default=6, help="Maximum messages per thread"
+    )
+    parser.add_argument(
+        "--no-quote-replies",
+        dest="quote_replies",
+        action="store_false",
+        help="Do not quote the previous message in replies",
+    )
+    parser.add_argument(
+        "--days", type=int, default=365, help="Spread threads over this many days"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--end",
+        type=datetime.fromisoformat,
+        help="Latest thread start (ISO date, default today); fix it to reproduce a dataset",
+    )
+    parser.add_argument(
+        "--firm-id",
+        type=uuid.UUID,
+        help="Also create a client in this firm for every generated mailbox",
+    )
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Delete the generated mailboxes' existing emails first",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    end = args.end
+    if end is not None and end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    spec = CorpusSpec(
+        clients=args.clients,
+        emails_per_client=args.emails_per_client,
+        thread_depth=args.thread_depth,
+        quote_replies=args.quote_replies,
+        days=args.days,
+        seed=args.seed,
+        end=end,
+    )
+    started = time.monotonic()
+    async with AsyncSessionLocal() as session:
+        total = await MockCorpusService(session, spec).load(
+            firm_id=args.firm_id, batch_size=args.batch_size, replace=args.replace
+        )
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"Loaded {total} emails for {spec.clients} mailboxes in {elapsed:.1f}s "
+        f"({total / max(elapsed, 1e-9):.0f} emails/s)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
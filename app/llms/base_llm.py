@@ -5,21 +5,53 @@ import logging
 
 
 from collections import defaultdict
+from contextlib import nullcontext
 
 from app.core.config import settings
+from app.llms.context import llm_client_id, llm_firm_id
+from app.schema.llm_usage import LLMUsage
 
 
 class BaseLLM:
-    def __init__(self, max_tokens=100, buffer_size=40, temperature: float=0.1,**kwargs):
+    # Provider implementations report each call here when set
+    usage = None
+    # ...and run each call inside a slot of this AdaptiveConcurrencyService
+    limiter = None
+
+    def __init__(self, max_tokens=100, buffer_size=40, temperature: float=0.1, model: str | None = None,**kwargs):
         self.max_tokens = max_tokens
         self.buffer_size = buffer_size
         self.temperature = temperature
+        self.model = model
         self.kwargs = kwargs
 
 
-    async def generate(self, messages, stream=True):
+    async def generate(self, messages, json_resp=False, model=None, max_tokens=None, response_schema=None):
         raise NotImplementedError
 
 
-    async def generate_stream(self, messages:list):
+    async def generate_stream(self, messages:list, model=None, max_tokens=None, response_schema=None):
         raise NotImplementedError
+
+
+    async def close(self):
+        """Releases connections held by the client, if any."""
+        pass
+
+
+    def _slot(self):
+        return self.limiter.slot() if self.limiter else nullcontext()
+
+
+    def _record_usage(self, model, input_tokens, output_tokens, latency, time_to_first_token=None):
+        if self.usage is None:
+            return
+        self.usage.record(LLMUsage(
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency_seconds=latency,
+            time_to_first_token_seconds=time_to_first_token,
+            client_id=llm_client_id.get(),
+            firm_id=llm_firm_id.get(),
+        ))
@@ -0,0 +1,95 @@
+import json
+import logging
+
+from pydantic import TypeAdapter, ValidationError
+
+from .base_llm import BaseLLM
+
+from app.services.llm_cache_service import LLMResponseCacheService
+
+
+class CachedLLM(BaseLLM):
+    """
+    Wraps another LLM and answers repeated prompts from
+    `LLMResponseCacheService` instead of calling the model again.
+
+    Only responses that parse are cached: JSON responses must be valid JSON,
+    and match `response_schema` when one is given, so a truncated or
+    malformed output is never served again.
+    """
+
+    def __init__(self, llm: BaseLLM, cache: LLMResponseCacheService):
+        self.llm = llm
+        self.cache = cache
+
+    @property
+    def model(self):
+        return self.llm.model
+
+    @property
+    def temperature(self):
+        return self.llm.temperature
+
+    async def close(self):
+        await self.llm.close()
+
+    def _key(self, messages, json_resp=False, model=None, max_tokens=None, response_schema=None):
+        return self.cache.key(
+            model=model or self.llm.model,
+            temperature=self.llm.temperature,
+            messages=messages,
+            json_resp=json_resp,
+            max_tokens=max_tokens,
+            response_schema=response_schema,
+        )
+
+    def _cacheable(self, response, json_resp=False, response_schema=None) -> bool:
+        if not response:
+            return False
+        try:
+            if response_schema is not None:
+                TypeAdapter(response_schema).validate_json(response)
+            elif json_resp:
+                json.loads(response)
+        except (ValidationError, ValueError):
+            logging.warning("Not caching an LLM response that does not parse")
+            return False
+        return True
+
+    async def generate(self, messages, json_resp=False, **kwargs):
+        key = self._key(
+            messages,
+            json_resp,
+            kwargs.get("model"),
+            kwargs.get("max_tokens"),
+            kwargs.get("response_schema"),
+        )
+        cached = await self.cache.get(key)
+        if cached is not None:
+            logging.info(f"LLM cache hit {key[:12]}")
+            return cached
+
+        response = await self.llm.generate(messages, json_resp=json_resp, **kwargs)
+        if self._cacheable(response, json_resp, kwargs.get("response_schema")):
+            await self.cache.set(key, response, model=kwargs.get("model") or self.llm.model)
+        return response
+
+    async def generate_stream(self, messages, **kwargs):
+        key = self._key(
+            messages,
+            model=kwargs.get("model"),
+            max_tokens=kwargs.get("max_tokens"),
+            response_schema=kwargs.get("response_schema"),
+        )
+        cached = await self.cache.get(key)
+        if cached is not None:
+            logging.info(f"LLM cache hit {key[:12]}")
+            yield cached
+            return
+
+        response = ""
+        async for chunk in self.llm.generate_stream(messages, **kwargs):
+            response += chunk
+            yield chunk
+        if self._cacheable(response, response_schema=kwargs.get("response_schema")):
+            await self.cache.set(key, response, model=kwargs.get("model") or self.llm.model)
@@ -0,0 +1,15 @@
+import uuid
+from contextvars import ContextVar
+
+from app.schema.enums import LLMPriority
+
+# Set by entry points (e.g. the summary worker) so LLM calls made deeper in
+# the stack are scheduled with the right priority.
+llm_priority: ContextVar[LLMPriority] = ContextVar(
+    "llm_priority", default=LLMPriority.INTERACTIVE
+)
+
+# Who an LLM call is made for, so its usage can be attributed. Set by
+# SummarizationService once it has loaded the client.
+llm_client_id: ContextVar[uuid.UUID | None] = ContextVar("llm_client_id", default=None)
+llm_firm_id: ContextVar[uuid.UUID | None] = ContextVar("llm_firm_id", default=None)
@@ -0,0 +1,122 @@
+import asyncio
+import hashlib
+import random
+import re
+import time
+
+from .base_llm import BaseLLM
+
+from app.core.config import settings
+from app.schema.summary import Actor, EmailThreadSummary, OpenItem
+from app.utils import estimate_tokens
+
+EMAIL_ADDRESS = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+SENTENCE = re.compile(r"[^.!?\n]+[.!?]?")
+REQUEST_WORDS = ("please", "could you", "can you", "need", "send", "?")
+
+
+class FakeLLMError(Exception):
+    """Simulated provider failure; `code` makes it look transient to retries."""
+
+    code = 503
+
+
+class FakeLLM(BaseLLM):
+    """
+    Offline stand-in for `GoogleLLM`, selected with `LLM_BACKEND=fake`.
+
+    Responses are valid `EmailThreadSummary` JSON built from the prompt
+    (actors from email addresses, open items from request-like sentences),
+    so the same input always gives the same output. Latency is log-normal
+    around `latency_ms` with spread `latency_jitter` (0 = fixed), and a
+    fraction `error_rate` of calls fail with `FakeLLMError`. Streams are
+    emitted in `chunk_size` character pieces, `chunk_delay_ms` apart.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = settings.FAKE_LLM_LATENCY_MS,
+        latency_jitter: float = settings.FAKE_LLM_LATENCY_JITTER,
+        error_rate: float = settings.FAKE_LLM_ERROR_RATE,
+        chunk_size: int = settings.FAKE_LLM_CHUNK_SIZE,
+        chunk_delay_ms: float = settings.FAKE_LLM_CHUNK_DELAY_MS,
+        seed: int | None = settings.FAKE_LLM_SEED,
+        temperature: float = 0.1,
+        model: str = "fake",
+        usage=None,
+        limiter=None,
+    ):
+        self.latency_ms = latency_ms
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.chunk_size = chunk_size
+        self.chunk_delay_ms = chunk_delay_ms
+        self.temperature = temperature
+        self.model = model
+        self.usage = usage
+        self.limiter = limiter
+        # Latency and failures are random per call; content is not
+        self.random = random.Random(seed)
+
+    async def generate(self, messages, json_resp=False, model=None, max_tokens=None, response_schema=None):
+        if not messages:
+            raise Exception("No messages provided")
+        started = time.monotonic()
+        async with self._slot():
+            await self._simulate_call()
+        response = self._respond(messages)
+        await self._record_fake_usage(model, messages, response, started)
+        return response
+
+    async def generate_stream(self, messages, model=None, max_tokens=None, response_schema=None):
+        if not messages:
+            raise Exception("No messages provided")
+        started = time.monotonic()
+        async with self._slot():
+            await self._simulate_call()
+            first_token = time.monotonic() - started
+            response = self._respond(messages)
+            for start in range(0, len(response), self.chunk_size):
+                if start:
+                    await asyncio.sleep(self.chunk_delay_ms / 1000)
+                yield response[start : start + self.chunk_size]
+        await self._record_fake_usage(model, messages, response, started, first_token)
+
+    async def _record_fake_usage(self, model, messages, response, started, first_token=None):
+        # Estimated, since there is no provider to report real counts
+        self._record_usage(
+            model or self.model,
+            input_tokens=sum(estimate_tokens(str(m["content"])) for m in messages),
+            output_tokens=estimate_tokens(response),
+            latency=time.monotonic() - started,
+            time_to_first_token=first_token,
+        )
+
+    async def _simulate_call(self) -> None:
+        latency = self.latency_ms * self.random.lognormvariate(0, self.latency_jitter)
+        await asyncio.sleep(latency / 1000)
+        if self.random.random() < self.error_rate:
+            raise FakeLLMError("Simulated LLM failure")
+
+    def _respond(self, messages) -> str:
+        prompt = "\n".join(str(m["content"]) for m in messages if m["role"] != "system")
+        seed = int.from_bytes(hashlib.sha256(prompt.encode()).digest()[:8], "big")
+        rng = random.Random(seed)
+
+        addresses = list(dict.fromkeys(EMAIL_ADDRESS.findall(prompt)))
+        requests = [
+            sentence.strip()
+            for sentence in SENTENCE.findall(prompt)
+            if any(word in sentence.lower() for word in REQUEST_WORDS)
+        ]
+        requests = list(dict.fromkeys(requests))[:5]
+
+        summary = EmailThreadSummary(
+            actors=[Actor(identifier=address) for address in addresses[:10]],
+            concluded=not requests,
+            open_items=[
+                OpenItem(description=request, owner=rng.choice(addresses) if addresses else None)
+                for request in requests
+            ],
+        )
+        return summary.model_dump_json()
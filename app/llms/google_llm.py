@@ -1,5 +1,6 @@
 import json
 import logging
+import time
 
 from .base_llm import BaseLLM
 
@@ -11,8 +12,10 @@ from app.core.config import settings
 
 
 class GoogleLLM(BaseLLM):
-    def __init__(self, max_tokens=100, buffer_size=40, temperature: float=0.1,model:str = 'gemini-3-flash-preview',**kwargs):
+    def __init__(self, max_tokens=100, buffer_size=40, temperature: float=0.1,model:str = settings.LLM_MODEL, usage=None, limiter=None,**kwargs):
         self.max_tokens = max_tokens
+        self.usage = usage
+        self.limiter = limiter
         self.buffer_size = buffer_size
         self.temperature = temperature
         self.kwargs = kwargs
@@ -28,54 +31,96 @@ class GoogleLLM(BaseLLM):
         )
 
 
-    async def generate(self, messages,json_resp=False):
+    async def generate(self, messages,json_resp=False, model=None, max_tokens=None, response_schema=None):
         if not messages:
             raise Exception("No messages provided")
 
         system_instruction, contents = await self._prepare_messages(messages)
-        self.config.system_instruction = system_instruction
 
-        response = await self.llm.aio.models.generate_content(
-            model=self.model,
-            contents=contents,
-            config=self.config
-        )
-
-        print(response.text)
-        if json_resp:
+        model = model or self.model
+        started = time.monotonic()
+        async with self._slot():
+            response = await self.llm.aio.models.generate_content(
+                model=model,
+                contents=contents,
+                config=self._call_config(system_instruction, max_tokens, response_schema)
+            )
+        self._record_response_usage(model, response.usage_metadata, time.monotonic() - started)
+
+        # Structured output is plain JSON already; leave any repair to the caller
+        if json_resp and not response_schema:
             return clean_json_string(response.text)
 
         return response.text
 
 
-    async def generate_stream(self, messages):
+    async def generate_stream(self, messages, model=None, max_tokens=None, response_schema=None):
         if not messages:
             raise Exception("No messages provided")
 
         system_instruction, contents = await self._prepare_messages(messages)
-        # Apply system instruction to the config for this specific call
-        self.config.system_instruction = system_instruction
 
         buffer = ""
-        logging.info(f"Streaming from Gemini API: {self.model}")
-
-        # Async streaming call using .aio
-        async for response in await self.llm.aio.models.generate_content_stream(
-            model=self.model,
-            contents=contents,
-            config=self.config
-        ):
-            chunk_text = response.text
-            if chunk_text:
-                buffer += chunk_text
-
-            if len(buffer) >= self.buffer_size:
-                yield buffer
-                buffer = ""
+        model = model or self.model
+        logging.info(f"Streaming from Gemini API: {model}")
+
+        started = time.monotonic()
+        first_token = None
+        usage_metadata = None
+        # Async streaming call using .aio; the slot is held until the stream ends
+        async with self._slot():
+            async for response in await self.llm.aio.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=self._call_config(system_instruction, max_tokens, response_schema)
+            ):
+                # Usage is cumulative; the last chunk carries the totals
+                usage_metadata = response.usage_metadata or usage_metadata
+                chunk_text = response.text
+                if chunk_text:
+                    if first_token is None:
+                        first_token = time.monotonic() - started
+                    buffer += chunk_text
+
+                if len(buffer) >= self.buffer_size:
+                    yield buffer
+                    buffer = ""
 
         if buffer:
             yield buffer
-        self.started_streaming = False
+
+        self._record_response_usage(
+            model, usage_metadata, time.monotonic() - started, first_token
+        )
+
+    async def close(self):
+        await self.llm.aio.aclose()
+
+    def _call_config(self, system_instruction, max_tokens=None, response_schema=None):
+        """
+        Per-call copy of the shared config, so concurrent calls never see each
+        other's system instruction, output budget or response schema.
+        """
+        update = {"system_instruction": system_instruction}
+        if max_tokens:
+            update["max_output_tokens"] = max_tokens
+        if response_schema:
+            # Constrains decoding to JSON matching the schema
+            update["response_mime_type"] = "application/json"
+            update["response_schema"] = response_schema
+        return self.config.model_copy(update=update)
+
+
+    def _record_response_usage(self, model, usage_metadata, latency, time_to_first_token=None):
+        # Thinking tokens are billed as output
+        self._record_usage(
+            model,
+            input_tokens=(usage_metadata and usage_metadata.prompt_token_count) or 0,
+            output_tokens=((usage_metadata and usage_metadata.candidates_token_count) or 0)
+            + ((usage_metadata and usage_metadata.thoughts_token_count) or 0),
+            latency=latency,
+            time_to_first_token=time_to_first_token,
+        )
 
 
     async def _prepare_messages(self, messages):
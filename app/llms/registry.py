@@ -0,0 +1,87 @@
+import logging
+
+from .base_llm import BaseLLM
+from .cached_llm import CachedLLM
+from .fake_llm import FakeLLM
+from .google_llm import GoogleLLM
+from .resilient_llm import ResilientLLM
+from .router import LLMRouter
+from .scheduled_llm import ScheduledLLM
+
+from app.core.config import settings
+from app.core.db import get_redis_client
+from app.services.adaptive_concurrency_service import get_limiter
+from app.services.llm_cache_service import LLMResponseCacheService
+from app.services.llm_scheduler_service import LLMSchedulerService
+from app.services.llm_usage_service import LLMUsageService
+
+
+class LLMRegistry:
+    """
+    Process-wide LLM clients.
+
+    Clients are built once and shared by every request and job, so HTTP
+    connections stay warm. They must therefore be safe for concurrent
+    coroutines: per-call settings are passed as arguments, never stored on
+    the client. The FastAPI lifespan (and long-running workers) call
+    `start()` and `close()`; `get()` builds the clients lazily otherwise.
+    """
+
+    def __init__(self):
+        self._llms: dict[str, BaseLLM] = {}
+        self.scheduler: LLMSchedulerService | None = None
+        self.router: LLMRouter | None = None
+        self.usage: LLMUsageService | None = None
+
+    def get(self, name: str = "default") -> BaseLLM:
+        if not self._llms:
+            self.start()
+        return self._llms[name]
+
+    def get_router(self) -> LLMRouter:
+        if not self._llms:
+            self.start()
+        return self.router
+
+    def start(self) -> None:
+        if self._llms:
+            return
+        usage = self.usage = (
+            LLMUsageService(get_redis_client())
+            if settings.LLM_USAGE_TRACKING_ENABLED
+            else None
+        )
+        limiter = (
+            get_limiter(f"llm:{settings.LLM_BACKEND}")
+            if settings.LLM_ADAPTIVE_CONCURRENCY_ENABLED
+            else None
+        )
+        llm: BaseLLM = (
+            FakeLLM(usage=usage, limiter=limiter)
+            if settings.LLM_BACKEND == "fake"
+            else GoogleLLM(usage=usage, limiter=limiter)
+        )
+        timeout = settings.LLM_CALL_TIMEOUT_SECONDS
+        if settings.LLM_RATE_LIMIT_ENABLED:
+            self.scheduler = LLMSchedulerService(get_redis_client())
+            # The deadline starts once the rate limiter admits the call
+            llm = ScheduledLLM(llm, self.scheduler, timeout=timeout)
+            timeout = None
+        # Retries and hedges go back through the rate limiter
+        llm = ResilientLLM(llm, timeout=timeout)
+        # Cache hits are answered before taking a rate-limit slot
+        if settings.LLM_CACHE_ENABLED:
+            llm = CachedLLM(llm, LLMResponseCacheService(get_redis_client()))
+        self._llms["default"] = llm
+        self.router = LLMRouter(llm)
+        logging.info(f"LLM clients ready: {', '.join(self._llms)}")
+
+    async def close(self) -> None:
+        llms, self._llms = self._llms, {}
+        for llm in llms.values():
+            await llm.close()
+        if self.usage is not None:
+            await self.usage.close()
+
+
+llm_registry = LLMRegistry()
@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+
+import httpx
+
+from .base_llm import BaseLLM
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: rate limited or a server-side hiccup
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the LLM while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed calls and rejects
+    calls for `reset_seconds`. After that a single trial call is let through
+    (half-open): success closes the breaker, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = settings.LLM_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds: float = settings.LLM_BREAKER_RESET_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_running = False
+
+    @property
+    def is_open(self) -> bool:
+        return (
+            self.opened_at is not None
+            and time.monotonic() - self.opened_at < self.reset_seconds
+        )
+
+    def before_call(self) -> None:
+        if self.opened_at is None:
+            return
+        if self.is_open or self._trial_running:
+            raise CircuitOpenError("LLM circuit breaker is open")
+        self._trial_running = True
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("LLM circuit breaker closed")
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def release(self) -> None:
+        """Ends a call that says nothing about the LLM's health, e.g. one that was cancelled."""
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_running = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            logger.warning(f"LLM circuit breaker open after {self.failures} failures")
+            self.opened_at = time.monotonic()
+
+
+class ResilientLLM(BaseLLM):
+    """
+    Wraps another LLM with a per-attempt deadline (None leaves it to the
+    wrapped LLM, e.g. `ScheduledLLM` once a slot is granted), jittered exponential
+    retries on transient errors, an optional hedged second request once an
+    attempt is slower than the recent `hedge_percentile` latency, and a
+    circuit breaker that fails fast with `CircuitOpenError`.
+
+    Streams are only retried until their first chunk arrives; after that a
+    failure is passed through, since part of the response was already used.
+    """
+
+    def __init__(
+        self,
+        llm: BaseLLM,
+        breaker: CircuitBreaker | None = None,
+        timeout: float | None = settings.LLM_CALL_TIMEOUT_SECONDS,
+        max_retries: int = settings.LLM_MAX_RETRIES,
+        hedging: bool = settings.LLM_HEDGING_ENABLED,
+        hedge_percentile: float = settings.LLM_HEDGE_PERCENTILE,
+    ):
+        self.llm = llm
+        self.breaker = breaker or CircuitBreaker()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self._latencies: deque[float] = deque(maxlen=200)
+
+    @property
+    def model(self):
+        return self.llm.model
+
+    @property
+    def temperature(self):
+        return self.llm.temperature
+
+    async def generate(self, messages, json_resp=False, **kwargs):
+        self.breaker.before_call()
+        try:
+            response = await self._with_retries(
+                lambda: self._hedged(
+                    lambda: self.llm.generate(messages, json_resp=json_resp, **kwargs)
+                )
+            )
+        except Exception as e:
+            self._record_error(e)
+            raise
+        except BaseException:
+            # Cancelled: let the next call be the half-open trial
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return response
+
+    async def generate_stream(self, messages, **kwargs):
+        self.breaker.before_call()
+
+        async def first_chunk():
+            stream = self.llm.generate_stream(messages, **kwargs)
+            try:
+                chunk = await asyncio.wait_for(anext(stream), self.timeout)
+            except BaseException:
+                await stream.aclose()
+                raise
+            return stream, chunk
+
+        try:
+            stream, chunk = await self._with_retries(first_chunk)
+        except StopAsyncIteration:
+            self.breaker.record_success()
+            return
+        except Exception as e:
+            self._record_error(e)
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+
+        try:
+            while True:
+                yield chunk
+                try:
+                    chunk = await asyncio.wait_for(anext(stream), self.timeout)
+                except StopAsyncIteration:
+                    return
+        finally:
+            await stream.aclose()
+
+    async def close(self):
+        await self.llm.close()
+
+    async def _with_retries(self, attempt):
+        for retry in range(self.max_retries + 1):
+            try:
+                return await attempt()
+            except Exception as e:
+                if retry == self.max_retries or not self._is_transient(e):
+                    raise
+                delay = random.uniform(
+                    0,
+                    min(
+                        settings.LLM_RETRY_MAX_DELAY_SECONDS,
+                        settings.LLM_RETRY_BASE_DELAY_SECONDS * 2**retry,
+                    ),
+                )
+                logger.warning(
+                    f"LLM call failed ({type(e).__name__}: {e}), "
+                    f"retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def _hedged(self, call):
+        """
+        Runs `call` with the deadline. With hedging on, a second identical
+        call is started once the first outlives the recent latency
+        percentile, and whichever finishes first wins.
+        """
+        started = time.monotonic()
+        hedge_after = self._hedge_delay()
+        primary = asyncio.ensure_future(asyncio.wait_for(call(), self.timeout))
+        if hedge_after is None:
+            result = await primary
+            self._latencies.append(time.monotonic() - started)
+            return result
+
+        attempts = [primary]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+            if not done:
+                logger.info(f"LLM call slower than {hedge_after:.2f}s, hedging")
+                attempts.append(
+                    asyncio.ensure_future(asyncio.wait_for(call(), self.timeout))
+                )
+            while True:
+                done, _ = await asyncio.wait(
+                    attempts, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    attempts.remove(task)
+                    if task.exception() is None or not attempts:
+                        self._latencies.append(time.monotonic() - started)
+                        return task.result()
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    def _hedge_delay(self) -> float | None:
+        # Wait for enough samples before trusting the percentile
+        if not self.hedging or len(self._latencies) < 20:
+            return None
+        latencies = sorted(self._latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self.hedge_percentile / 100))
+        return latencies[index]
+
+    def _record_error(self, e: Exception) -> None:
+        # A rejected request (bad prompt, auth, quota) says the LLM is up, so
+        # only transient errors count towards opening the breaker
+        if self._is_transient(e):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release()
+
+    def _is_transient(self, e: Exception) -> bool:
+        if isinstance(e, (asyncio.TimeoutError, httpx.TransportError)):
+            return True
+        # google.genai.errors.APIError and friends expose the HTTP status as `code`
+        return getattr(e, "code", None) in TRANSIENT_STATUS_CODES
@@ -0,0 +1,121 @@
+import logging
+import time
+from collections import deque
+
+from pydantic import BaseModel
+
+from .base_llm import BaseLLM
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMRoute(BaseModel):
+    name: str
+    model: str
+    max_tokens: int
+    # The route applies when the input is within both limits (None = no limit)
+    max_input_tokens: int | None = None
+    max_emails: int | None = None
+    # Inputs above this many tokens are summarized in chunks (None = never)
+    chunk_token_budget: int | None = None
+
+    def matches(self, input_tokens: int, email_count: int) -> bool:
+        return (self.max_input_tokens is None or input_tokens <= self.max_input_tokens) and (
+            self.max_emails is None or email_count <= self.max_emails
+        )
+
+
+def default_routes() -> list[LLMRoute]:
+    large = LLMRoute(
+        name="large",
+        model=settings.LLM_MODEL,
+        max_tokens=5_000,
+        chunk_token_budget=settings.SUMMARY_CHUNK_TOKEN_BUDGET,
+    )
+    if not settings.LLM_ROUTING_ENABLED:
+        return [large]
+    return [
+        LLMRoute(
+            name="small",
+            model=settings.LLM_SMALL_MODEL,
+            max_tokens=2_000,
+            max_input_tokens=settings.LLM_SMALL_INPUT_TOKENS,
+            max_emails=settings.LLM_SMALL_EMAIL_COUNT,
+        ),
+        LLMRoute(
+            name="standard",
+            model=settings.LLM_MODEL,
+            max_tokens=4_000,
+            max_input_tokens=settings.SUMMARY_CHUNK_TOKEN_BUDGET,
+        ),
+        large,
+    ]
+
+
+class LLMRouter:
+    """
+    Picks a model, output budget and chunking strategy from the size of the
+    input, and calls the wrapped LLM with them.
+
+    Routes are tried in order and the first match wins, so the last one
+    should have no limits. Every call is logged with its route and latency,
+    and recent latencies are kept per route for `metrics()`.
+    """
+
+    def __init__(self, llm: BaseLLM, routes: list[LLMRoute] | None = None):
+        self.llm = llm
+        self.routes = routes or default_routes()
+        self._latencies = {route.name: deque(maxlen=500) for route in self.routes}
+
+    def select(self, input_tokens: int, email_count: int = 0) -> LLMRoute:
+        route = next(
+            (r for r in self.routes if r.matches(input_tokens, email_count)),
+            self.routes[-1],
+        )
+        logger.info(
+            f"Routing {input_tokens} tokens from {email_count} emails to {route.name}"
+        )
+        return route
+
+    async def generate(
+        self, route: LLMRoute, messages, json_resp=False, response_schema=None
+    ):
+        started = time.monotonic()
+        response = await self.llm.generate(
+            messages,
+            json_resp=json_resp,
+            model=route.model,
+            max_tokens=route.max_tokens,
+            response_schema=response_schema,
+        )
+        self._record(route, started)
+        return response
+
+    async def generate_stream(self, route: LLMRoute, messages, response_schema=None):
+        started = time.monotonic()
+        async for chunk in self.llm.generate_stream(
+            messages,
+            model=route.model,
+            max_tokens=route.max_tokens,
+            response_schema=response_schema,
+        ):
+            yield chunk
+        self._record(route, started)
+
+    def _record(self, route: LLMRoute, started: float) -> None:
+        latency = time.monotonic() - started
+        self._latencies[route.name].append(latency)
+        logger.info(f"LLM route {route.name} ({route.model}) took {latency:.2f}s")
+
+    def metrics(self) -> dict:
+        metrics = {}
+        for name, latencies in self._latencies.items():
+            latencies = sorted(latencies)
+            metrics[name] = {
+                "calls": len(latencies),
+                "latency_seconds_p50": latencies[len(latencies) // 2] if latencies else 0.0,
+                "latency_seconds_p95": latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+            }
+        return metrics
@@ -0,0 +1,58 @@
+import asyncio
+
+from .base_llm import BaseLLM
+from .context import llm_priority
+
+from app.services.llm_scheduler_service import LLMSchedulerService
+from app.utils import estimate_tokens
+
+
+class ScheduledLLM(BaseLLM):
+    """
+    Wraps another LLM so every call first waits for a slot from
+    `LLMSchedulerService`, at the priority of the current `llm_priority`.
+
+    The `timeout` deadline starts once the slot is granted, so time queued
+    behind the rate limit never counts as a slow call. For streams it
+    applies to every chunk.
+    """
+
+    def __init__(
+        self, llm: BaseLLM, scheduler: LLMSchedulerService, timeout: float | None = None
+    ):
+        self.llm = llm
+        self.scheduler = scheduler
+        self.timeout = timeout
+
+    @property
+    def model(self):
+        return self.llm.model
+
+    @property
+    def temperature(self):
+        return self.llm.temperature
+
+    async def generate(self, messages, json_resp=False, **kwargs):
+        await self.scheduler.acquire(self._tokens(messages), llm_priority.get())
+        return await asyncio.wait_for(
+            self.llm.generate(messages, json_resp=json_resp, **kwargs), self.timeout
+        )
+
+    async def generate_stream(self, messages, **kwargs):
+        await self.scheduler.acquire(self._tokens(messages), llm_priority.get())
+        stream = self.llm.generate_stream(messages, **kwargs)
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(stream), self.timeout)
+                except StopAsyncIteration:
+                    return
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    async def close(self):
+        await self.llm.close()
+
+    def _tokens(self, messages):
+        return sum(estimate_tokens(str(m["content"])) for m in messages)
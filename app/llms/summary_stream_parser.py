@@ -0,0 +1,97 @@
+import json
+import logging
+from dataclasses import dataclass
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.schema.summary import Actor, OpenItem
+
+logger = logging.getLogger(__name__)
+
+# Array fields of EmailThreadSummary whose elements are emitted as they complete
+ITEM_ADAPTERS: dict[str, TypeAdapter] = {
+    "actors": TypeAdapter(Actor),
+    "open_items": TypeAdapter(OpenItem),
+}
+
+
+@dataclass
+class _Frame:
+    kind: str  # "{" or "["
+    start: int
+    # Key in the enclosing object this container is the value of
+    field: str | None = None
+    # For objects: the last key seen, and whether a key comes next
+    key: str | None = None
+    expect_key: bool = False
+
+
+class SummaryStreamParser:
+    """
+    Incremental parser for a streamed `EmailThreadSummary`.
+
+    Feed it the text chunks as they arrive; each call returns the `Actor`
+    and `OpenItem` objects that became syntactically complete in that chunk.
+    Scanning resumes where the previous chunk stopped, so the whole stream
+    is read once. Anything before the first `{` (e.g. a code fence) is
+    skipped; the full summary is still validated once the stream ends.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._stack: list[_Frame] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+
+    def feed(self, chunk: str) -> list[Actor | OpenItem]:
+        self.buffer += chunk
+        items: list[Actor | OpenItem] = []
+        buffer, stack = self.buffer, self._stack
+
+        for i in range(self._pos, len(buffer)):
+            ch = buffer[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    top = stack[-1]
+                    if top.kind == "{" and top.expect_key:
+                        top.key = json.loads(buffer[self._string_start : i + 1])
+                        top.expect_key = False
+                continue
+            if not stack and ch != "{":
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                parent = stack[-1] if stack else None
+                field = parent.key if parent and parent.kind == "{" else None
+                if parent and parent.kind == "[":
+                    field = parent.field
+                stack.append(_Frame(kind=ch, start=i, field=field, expect_key=ch == "{"))
+            elif ch in "}]":
+                frame = stack.pop()
+                # Root object, then the array, then the element being closed
+                if frame.kind == "{" and len(stack) == 2 and frame.field in ITEM_ADAPTERS:
+                    item = self._validate(frame.field, buffer[frame.start : i + 1])
+                    if item is not None:
+                        items.append(item)
+            elif ch == "," and stack[-1].kind == "{":
+                stack[-1].expect_key = True
+
+        self._pos = len(buffer)
+        return items
+
+    def _validate(self, field: str, text: str) -> Actor | OpenItem | None:
+        try:
+            return ITEM_ADAPTERS[field].validate_json(text)
+        except ValidationError as e:
+            logger.debug(f"Skipping invalid streamed {field} item: {e}")
+            return None
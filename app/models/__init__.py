@@ -17,6 +17,7 @@ from .client import (
     ClientsPublic,
     ClientUpdate,
 )
+from .email_fingerprint import EmailFingerprint
 from .email_summary import (
     EmailSummary,
     EmailSummaryCreate,
@@ -25,6 +26,12 @@ from .email_summary import (
 )
 from .firm import Firm, FirmBase, FirmCreate, FirmPublic, FirmsPublic, FirmUpdate
 from .firm_accountant import FirmAccountant, FirmAccountantPublic, FirmAccountantsPublic
+from .graph_sync_state import GraphClientBackfill, GraphSyncState
+from .ingested_email import IngestedEmail
+from .llm_response_cache import LlmResponseCache
+from .llm_usage import LlmUsage
 from .message import Message
 from .mock_email import MockEmail, MockEmailBase, MockEmailCreate, MockEmailPublic
+from .seen_email import SeenEmail
+from .thread_summary import ThreadSummary
 from .token import NewPassword, Token, TokenPayload
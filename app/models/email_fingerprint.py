@@ -0,0 +1,19 @@
+import uuid
+
+from sqlmodel import Field
+
+from .base import DbBase
+
+
+class EmailFingerprint(DbBase, table=True):
+    """
+    One row per email folded into a client's stored summary, so a refresh
+    can tell exactly which emails were added or removed since.
+    """
+
+    client_id: uuid.UUID = Field(
+        foreign_key="client.id", primary_key=True, ondelete="CASCADE"
+    )
+    email_id: str = Field(primary_key=True, max_length=255)
+    # sha256 of the email id, sender, recipient, timestamp, subject and body
+    fingerprint: str = Field(max_length=64)
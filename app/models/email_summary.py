@@ -64,7 +64,7 @@ class EmailSummary(DbBase, table=True):
     email_count: int
     summary_hash: str
 
-    last_refreshed: datetime
+    last_refreshed: datetime = Field(index=True)
     created_at: datetime = Field(default_factory=get_datetime_utc)
 
 
@@ -78,6 +78,8 @@ class EmailSummaryCreate(EmailSummaryBase):
     encrypted_summary: str
 
 
-class EmailSummaryUpdate(EmailSummaryBase):
+class EmailSummaryUpdate(DbBase):
+    email_count: int | None = None
+    last_refreshed: datetime | None = None
     encrypted_summary: str | None = None
     summary_hash: str | None = None
@@ -0,0 +1,35 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlmodel import Field
+
+from .base import DbBase
+
+
+def get_datetime_utc() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class GraphSyncState(DbBase, table=True):
+    """
+    Microsoft Graph delta link per mailbox and mail folder, shared by every
+    client whose mail is read from that mailbox.
+    """
+
+    mailbox: str = Field(primary_key=True, max_length=255)
+    folder: str = Field(primary_key=True, max_length=255)
+    delta_link: str
+    synced_at: datetime = Field(default_factory=get_datetime_utc)
+
+
+class GraphClientBackfill(DbBase, table=True):
+    """
+    Clients whose past mail was fetched from the mailbox. Mailbox delta
+    syncs only bring in changes, so a client added later is backfilled once.
+    """
+
+    client_id: uuid.UUID = Field(
+        foreign_key="client.id", primary_key=True, ondelete="CASCADE"
+    )
+    mailbox: str = Field(primary_key=True, max_length=255)
+    backfilled_at: datetime = Field(default_factory=get_datetime_utc)
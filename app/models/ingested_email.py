@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Index, UniqueConstraint
+from sqlmodel import Field
+from uuid6 import uuid7
+
+from .base import DbBase
+from .email_summary import EncryptedString
+
+
+def get_datetime_utc() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class IngestedEmail(DbBase, table=True):
+    """
+    Local copy of a client's emails as synced from an email provider, so
+    incremental (delta) syncs only have to fetch what changed upstream and
+    summaries are built from indexed local reads over a time window.
+    """
+
+    __table_args__ = (
+        # Dedup key: a provider message is stored once per client
+        UniqueConstraint("client_id", "provider", "message_id"),
+        Index("ix_ingested_email_client_id_received_at", "client_id", "received_at"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
+    client_id: uuid.UUID = Field(foreign_key="client.id", ondelete="CASCADE")
+    provider: str = Field(max_length=32)
+    # Provider-specific message id (e.g. the Graph message id)
+    message_id: str = Field(max_length=255)
+    internet_message_id: str | None = None
+    conversation_id: str | None = None
+    in_reply_to: str | None = None
+    references: str | None = None
+
+    subject: str
+    sender: str = Field(max_length=255)
+    recipient: str = Field(max_length=255)
+    body: str = Field(
+        sa_type=EncryptedString(),
+        nullable=False,
+    )
+    received_at: datetime
+
+    created_at: datetime = Field(default_factory=get_datetime_utc)
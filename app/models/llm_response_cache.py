@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+
+from sqlmodel import Field
+
+from .base import DbBase
+from .email_summary import EncryptedString
+
+
+def get_datetime_utc() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class LlmResponseCache(DbBase, table=True):
+    # sha256 of model, temperature and normalized prompt
+    key: str = Field(primary_key=True, max_length=64)
+    model: str = Field(max_length=255)
+
+    response: str = Field(
+        sa_type=EncryptedString(),
+        nullable=False,
+    )
+
+    expires_at: datetime = Field(index=True)
+    created_at: datetime = Field(default_factory=get_datetime_utc)
@@ -0,0 +1,32 @@
+import uuid
+from datetime import date, datetime, timezone
+
+from sqlmodel import Field
+
+from .base import DbBase
+
+
+def get_datetime_utc() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class LlmUsage(DbBase, table=True):
+    """
+    Daily LLM usage counters per firm, client and model. No foreign keys,
+    so the history survives deleting a client.
+    """
+
+    firm_id: uuid.UUID = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    client_id: uuid.UUID = Field(primary_key=True)
+    model: str = Field(primary_key=True, max_length=255)
+
+    calls: int = 0
+    streamed_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    latency_seconds: float = 0.0
+    time_to_first_token_seconds: float = 0.0
+
+    updated_at: datetime = Field(default_factory=get_datetime_utc)
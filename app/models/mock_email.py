@@ -1,6 +1,7 @@
 from datetime import datetime
 
 import uuid6
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -27,6 +28,13 @@ class MockEmailUpdate(SQLModel):
 
 
 class MockEmail(MockEmailBase, table=True):
+    __table_args__ = (
+        Index("ix_mockemail_recipient_received_at", "recipient", "received_at"),
+        Index("ix_mockemail_received_at", "received_at"),
+        # Mail from the client, for mailbox reads by participant
+        Index("ix_mockemail_sender_received_at", "sender", "received_at"),
+    )
+
     id: str = Field(default_factory=lambda: str(uuid6.uuid7()), primary_key=True)
 
 
@@ -0,0 +1,20 @@
+import uuid
+
+from sqlmodel import Field
+
+from .base import DbBase
+
+
+class SeenEmail(DbBase, table=True):
+    """
+    Dedup key of every email seen in a client's mailbox, so refreshes can
+    recognise copies of the same message without hashing them again.
+    """
+
+    client_id: uuid.UUID = Field(
+        foreign_key="client.id", primary_key=True, ondelete="CASCADE"
+    )
+    email_id: str = Field(primary_key=True, max_length=255)
+    # sha256 of the Internet-Message-Id, or of the sender, subject, minute
+    # and body when there is none
+    dedup_key: str = Field(max_length=64)
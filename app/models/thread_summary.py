@@ -0,0 +1,31 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlmodel import Field
+
+from .base import DbBase
+from .email_summary import EncryptedString
+
+
+def get_datetime_utc() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ThreadSummary(DbBase, table=True):
+    """
+    Summary of one conversation in a client's mailbox, keyed by the digest
+    of its emails' fingerprints, so only threads that changed since the
+    last refresh go to the LLM.
+    """
+
+    client_id: uuid.UUID = Field(
+        foreign_key="client.id", primary_key=True, ondelete="CASCADE"
+    )
+    fingerprint: str = Field(primary_key=True, max_length=64)
+    # EmailThreadSummary as JSON
+    summary: str = Field(
+        sa_type=EncryptedString(),
+        nullable=False,
+    )
+    email_count: int
+    created_at: datetime = Field(default_factory=get_datetime_utc)
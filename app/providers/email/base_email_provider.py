@@ -1,8 +1,24 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from app.schema.email import EmailMessage
 
 class IEmailProvider(ABC):
     @abstractmethod
     async def fetch_client_emails(self, client_email: str,**kwargs) -> list[EmailMessage]:
-        """Fetch all historical emails for a specific client across the firm."""
-        pass
\ No newline at end of file
+        """
+        Fetch all historical emails for a specific client across the firm, or
+        only those received from `since` on when that keyword is given.
+        """
+        pass
+
+    async def iter_client_emails(self, client_email: str, **kwargs) -> AsyncIterator[EmailMessage]:
+        """
+        Same emails as `fetch_client_emails`, oldest first, yielded as they
+        are read so the whole mailbox is never held in memory. With
+        `refresh=False` nothing is pulled from upstream and the emails synced
+        by the previous call are read again. Providers that can page should
+        override this; the default materializes `fetch_client_emails`.
+        """
+        emails = await self.fetch_client_emails(client_email, **kwargs)
+        for email in sorted(emails, key=lambda e: e.received_at):
+            yield email
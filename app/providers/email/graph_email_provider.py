@@ -1,18 +1,443 @@
+import asyncio
+import importlib.util
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+
 import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import crud
+from app.core.config import settings
+from app.core.db import get_async_redis
 from app.providers.email import IEmailProvider
 from app.schema.email import EmailMessage
+from app.services.adaptive_concurrency_service import (
+    AdaptiveConcurrencyService,
+    get_limiter,
+    is_throttled,
+)
+from app.services.email_store_service import SAVE_BATCH_SIZE, EmailStoreService
+from app.services.job_queue_service import JobQueueService
+from app.utils import ensure_aware
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_NAME = "graph"
+
+# Only the fields EmailMessage needs
+SELECT_FIELDS = ",".join(
+    [
+        "id",
+        "internetMessageId",
+        "conversationId",
+        "subject",
+        "from",
+        "toRecipients",
+        "ccRecipients",
+        "receivedDateTime",
+        "body",
+    ]
+)
+
+_http_client: httpx.AsyncClient | None = None
+_token: tuple[str, float] | None = None
+
+
+def get_graph_http_client() -> httpx.AsyncClient:
+    """
+    Process-wide pooled client for Graph, so connections (HTTP/2 when the
+    `h2` package is installed) are reused across requests.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=settings.GRAPH_HTTP2 and importlib.util.find_spec("h2") is not None,
+            timeout=settings.GRAPH_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.GRAPH_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GRAPH_MAX_CONNECTIONS,
+            ),
+        )
+    return _http_client
+
+
+async def close_graph_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+class GraphDeltaExpired(Exception):
+    """The stored delta link is no longer valid and a full sync is needed."""
 
 
 class MicrosoftGraphProvider(IEmailProvider):
-    def __init__(self, access_token: str):
-        self.base_url = "https://graph.microsoft.com/v1.0"
-        self.headers = {"Authorization": f"Bearer {access_token}"}
-
-    async def fetch_client_emails(self, client_email: str) -> list[EmailMessage]:
-        # In a real scenario, you'd use a $filter query to find emails 
-        # involving this client across the firm's shared mailboxes.
-        async with httpx.AsyncClient() as client:
-            # Example endpoint logic
-            # response = await client.get(f"{self.base_url}/users/...", headers=self.headers)
-            return [] # Placeholder for future implementation
\ No newline at end of file
+    """
+    Reads client correspondence from a shared Microsoft Graph mailbox.
+
+    With a `session` and `client_id`, mail is synced incrementally: the
+    mailbox keeps one Graph delta link per mail folder, only messages
+    changed since the last sync are fetched, and each one is stored in the
+    ingestion store (`EmailStoreService`) for every client among its
+    participants. A client new to the mailbox is backfilled once with a
+    participants `$filter`, as are reads without a session. Walking the
+    whole mailbox (first sync, expired delta link) only happens in the
+    worker, through `sync_mailbox`.
+
+    Pages are followed through `@odata.nextLink`, fetching the next page
+    while the current one is processed. Requests share an adaptive
+    concurrency limit per mailbox and are retried when Graph throttles.
+    """
+
+    def __init__(
+        self,
+        access_token: str | None = None,
+        mailbox: str | None = settings.GRAPH_MAILBOX,
+        http_client: httpx.AsyncClient | None = None,
+        base_url: str = settings.GRAPH_BASE_URL,
+        delta_enabled: bool = settings.GRAPH_DELTA_ENABLED,
+        limiter: AdaptiveConcurrencyService | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.mailbox = mailbox
+        self.access_token = access_token
+        self.http = http_client or get_graph_http_client()
+        self.delta_enabled = delta_enabled
+        self.limiter = limiter or get_limiter(f"graph:{mailbox}")
+
+    async def fetch_client_emails(
+        self,
+        client_email: str,
+        session: AsyncSession | None = None,
+        client_id: uuid.UUID | None = None,
+        since: datetime | None = None,
+        **kwargs,
+    ) -> list[EmailMessage]:
+        return [
+            e
+            async for e in self.iter_client_emails(
+                client_email, session=session, client_id=client_id, since=since, **kwargs
+            )
+        ]
+
+    async def iter_client_emails(
+        self,
+        client_email: str,
+        session: AsyncSession | None = None,
+        client_id: uuid.UUID | None = None,
+        since: datetime | None = None,
+        refresh: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[EmailMessage]:
+        if self.delta_enabled and session is not None and client_id is not None:
+            if refresh:
+                await self.sync_client(session, client_id, client_email)
+            async for email in EmailStoreService(session).iter(
+                client_id, provider=PROVIDER_NAME, since=since
+            ):
+                yield email
+            return
+        async for email in self._iter_filtered(client_email, since):
+            yield email
+
+    async def sync_client(
+        self, session: AsyncSession, client_id: uuid.UUID, client_email: str
+    ) -> None:
+        """
+        Brings the client's stored messages up to date with the mailbox.
+        Walking the whole mailbox (its first sync, or after a delta link
+        expired) is left to a worker job; until then the client is served
+        from its own backfill.
+        """
+        if not await crud.graph_sync_state.is_backfilled(
+            session, client_id=client_id, mailbox=self.mailbox
+        ):
+            await self._backfill(session, client_id, client_email)
+        await self.sync_mailbox(session, full_sync=False)
+
+    async def sync_mailbox(self, session: AsyncSession, full_sync: bool = True) -> None:
+        """
+        Applies the mailbox changes since the last sync to the stored
+        messages of every client taking part in them. Without `full_sync`,
+        a mailbox that has to be walked from scratch gets a mailbox sync job
+        queued instead.
+        """
+        synced = await crud.graph_sync_state.is_synced(
+            session, mailbox=self.mailbox, folders=settings.GRAPH_MAIL_FOLDERS
+        )
+        if not synced:
+            if full_sync:
+                await self._resync(session)
+            else:
+                await self._queue_full_sync()
+            return
+        try:
+            for folder in settings.GRAPH_MAIL_FOLDERS:
+                await self._sync_folder(session, folder)
+        except GraphDeltaExpired:
+            await session.rollback()
+            if not full_sync:
+                await self._queue_full_sync()
+                return
+            logger.warning(f"Graph delta link expired for {self.mailbox}, resyncing")
+            await self._resync(session, restart_before=datetime.now(timezone.utc))
+
+    async def _resync(
+        self, session: AsyncSession, restart_before: datetime | None = None
+    ) -> None:
+        """
+        Walks every folder over the sync window, overwriting the stored
+        messages in place, then removes the stored ones the walk did not
+        find (deleted upstream meanwhile). Folders with a delta link saved
+        since `restart_before` (or at all, without it) are synced
+        incrementally instead, e.g. when another worker just resynced them.
+        """
+        started = datetime.now(timezone.utc)
+        since = started - timedelta(days=settings.GRAPH_SYNC_WINDOW_DAYS)
+        seen: set[str] = set()
+        walked = [
+            await self._sync_folder(session, folder, seen, restart_before)
+            for folder in settings.GRAPH_MAIL_FOLDERS
+        ]
+        if not all(walked):
+            # Messages of folders not walked here were not seen
+            return
+        stored = await crud.ingested_email.list_message_ids(
+            session, provider=PROVIDER_NAME, since=since, created_before=started
+        )
+        gone = sorted(stored - seen)
+        store = EmailStoreService(session)
+        for start in range(0, len(gone), SAVE_BATCH_SIZE):
+            await store.remove(None, PROVIDER_NAME, gone[start : start + SAVE_BATCH_SIZE])
+        await session.commit()
+        logger.info(f"Graph resync of {self.mailbox}: {len(gone)} stale messages removed")
+
+    async def _backfill(
+        self, session: AsyncSession, client_id: uuid.UUID, client_email: str
+    ) -> None:
+        since = datetime.now(timezone.utc) - timedelta(days=settings.GRAPH_SYNC_WINDOW_DAYS)
+        store = EmailStoreService(session)
+        batch: list[EmailMessage] = []
+        count = 0
+        async for email in self._iter_filtered(client_email, since):
+            batch.append(email)
+            if len(batch) >= SAVE_BATCH_SIZE:
+                await store.save(client_id, PROVIDER_NAME, batch)
+                count += len(batch)
+                batch = []
+        await store.save(client_id, PROVIDER_NAME, batch)
+        await crud.graph_sync_state.mark_backfilled(
+            session, client_id=client_id, mailbox=self.mailbox
+        )
+        await session.commit()
+        logger.info(f"Graph backfill for client {client_id}: {count + len(batch)} messages")
+
+    async def _sync_folder(
+        self,
+        session: AsyncSession,
+        folder: str,
+        seen: set[str] | None = None,
+        restart_before: datetime | None = None,
+    ) -> bool:
+        """
+        Syncs the folder from its delta link, or walks it over the sync
+        window when it has none or the link predates `restart_before`.
+        Changed message ids are added to `seen`. Returns whether the folder
+        was walked.
+        """
+        await crud.graph_sync_state.lock(session, mailbox=self.mailbox, folder=folder)
+        state = await crud.graph_sync_state.get_state(
+            session, mailbox=self.mailbox, folder=folder
+        )
+        walk = state is None or (
+            restart_before is not None and ensure_aware(state.synced_at) < restart_before
+        )
+        url, params = (state.delta_link if state else None), None
+        if walk:
+            since = datetime.now(timezone.utc) - timedelta(days=settings.GRAPH_SYNC_WINDOW_DAYS)
+            url = f"{self._mailbox_url()}/mailFolders/{folder}/messages/delta"
+            params = {
+                "$select": SELECT_FIELDS,
+                "$filter": f"receivedDateTime ge {since:%Y-%m-%dT%H:%M:%SZ}",
+            }
+
+        changed = removed = 0
+        delta_link = None
+        async for page in self._pages(url, params):
+            items = page.get("value", [])
+            if seen is not None:
+                seen.update(item["id"] for item in items if "@removed" not in item)
+            page_changed, page_removed = await self._apply_changes(session, items)
+            changed += page_changed
+            removed += page_removed
+            delta_link = page.get("@odata.deltaLink", delta_link)
+
+        if delta_link:
+            await crud.graph_sync_state.save_delta_link(
+                session, mailbox=self.mailbox, folder=folder, delta_link=delta_link
+            )
+        await session.commit()
+        logger.info(
+            f"Graph {'resync' if walk else 'sync'} of {self.mailbox}/{folder}: "
+            f"{changed} changed, {removed} removed"
+        )
+        return walk
+
+    async def _queue_full_sync(self) -> None:
+        async with get_async_redis() as redis:
+            await JobQueueService(redis).enqueue_mailbox_sync(self.mailbox)
+
+    async def _apply_changes(
+        self, session: AsyncSession, items: list[dict]
+    ) -> tuple[int, int]:
+        """
+        Stores one delta page. Changed messages are reassigned to the
+        clients among their current participants, so a message is fetched
+        once however many clients it concerns. Not committed.
+        """
+        removed = [item["id"] for item in items if "@removed" in item]
+        changed = {item["id"]: item for item in items if "@removed" not in item}
+        store = EmailStoreService(session)
+        # Participants may have changed, so copies are dropped first
+        await store.remove(None, PROVIDER_NAME, removed + list(changed))
+
+        participants = {i: self._participants(item) for i, item in changed.items()}
+        clients = await crud.client.ids_by_email(
+            session, emails=set().union(*participants.values())
+        )
+        by_client: dict[uuid.UUID, list[EmailMessage]] = {}
+        for message_id, item in changed.items():
+            email = self._parse(item)
+            client_ids = {c for a in participants[message_id] for c in clients.get(a, ())}
+            for client_id in client_ids:
+                by_client.setdefault(client_id, []).append(email)
+        for client_id, emails in by_client.items():
+            await store.save(client_id, PROVIDER_NAME, emails)
+        return len(changed), len(removed)
+
+    async def _iter_filtered(
+        self, client_email: str, since: datetime | None = None
+    ) -> AsyncIterator[EmailMessage]:
+        address = client_email.replace("'", "''")
+        since = since or datetime(1900, 1, 1, tzinfo=timezone.utc)
+        params = {
+            "$select": SELECT_FIELDS,
+            # Graph needs the $orderby property to lead the $filter
+            "$filter": (
+                f"receivedDateTime ge {since.astimezone(timezone.utc):%Y-%m-%dT%H:%M:%SZ}"
+                f" and (from/emailAddress/address eq '{address}'"
+                f" or toRecipients/any(r:r/emailAddress/address eq '{address}')"
+                f" or ccRecipients/any(r:r/emailAddress/address eq '{address}'))"
+            ),
+            "$orderby": "receivedDateTime asc",
+            "$top": settings.GRAPH_PAGE_SIZE,
+        }
+        async for page in self._pages(f"{self._mailbox_url()}/messages", params):
+            for item in page.get("value", []):
+                yield self._parse(item)
+
+    async def message_participants(self, message_id: str) -> set[str]:
+        """Lower-cased sender and recipient addresses of a message."""
+        item = await self._get(
+            f"{self._mailbox_url()}/messages/{message_id}",
+            {"$select": "from,toRecipients,ccRecipients"},
+        )
+        return self._participants(item)
+
+    async def _pages(self, url: str, params: dict | None = None) -> AsyncIterator[dict]:
+        """
+        Yields result pages, requesting each `@odata.nextLink` as soon as the
+        page announcing it arrives.
+        """
+        next_page: asyncio.Task | None = asyncio.ensure_future(self._get(url, params))
+        try:
+            while next_page is not None:
+                page = await next_page
+                link = page.get("@odata.nextLink")
+                next_page = asyncio.ensure_future(self._get(link)) if link else None
+                yield page
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def _get(self, url: str, params: dict | None = None) -> dict:
+        headers = {
+            "Authorization": f"Bearer {await self._access_token()}",
+            "Prefer": (
+                'outlook.body-content-type="text", '
+                f"odata.maxpagesize={settings.GRAPH_PAGE_SIZE}"
+            ),
+        }
+        for attempt in range(settings.GRAPH_MAX_RETRIES + 1):
+            try:
+                # The limiter holds back further requests for the Retry-After
+                async with self.limiter.slot():
+                    response = await self.http.get(url, params=params, headers=headers)
+                    if response.status_code == 410:
+                        raise GraphDeltaExpired(response.text)
+                    response.raise_for_status()
+                    return response.json()
+            except httpx.HTTPStatusError as e:
+                if attempt == settings.GRAPH_MAX_RETRIES or not is_throttled(e):
+                    raise
+                logger.warning(f"Graph throttled {self.mailbox} ({e.response.status_code}), retrying")
+
+    async def _access_token(self) -> str:
+        """The token passed in, else an app-only token cached until it expires."""
+        global _token
+        if self.access_token:
+            return self.access_token
+        if _token and _token[1] > time.monotonic():
+            return _token[0]
+        response = await self.http.post(
+            settings.GRAPH_TOKEN_URL.format(tenant_id=settings.GRAPH_TENANT_ID),
+            data={
+                "client_id": settings.GRAPH_CLIENT_ID,
+                "client_secret": settings.GRAPH_CLIENT_SECRET,
+                "scope": "https://graph.microsoft.com/.default",
+                "grant_type": "client_credentials",
+            },
+        )
+        response.raise_for_status()
+        body = response.json()
+        # Renew a minute early
+        _token = (body["access_token"], time.monotonic() + body["expires_in"] - 60)
+        return _token[0]
+
+    def _mailbox_url(self) -> str:
+        if not self.mailbox:
+            raise ValueError("GRAPH_MAILBOX is not configured")
+        return f"{self.base_url}/users/{self.mailbox}"
+
+    def _involves(self, item: dict, client_email: str) -> bool:
+        return client_email.lower() in self._participants(item)
+
+    def _participants(self, item: dict) -> set[str]:
+        """Lower-cased sender and recipient addresses of a Graph message."""
+        recipients = (item.get("toRecipients") or []) + (item.get("ccRecipients") or [])
+        return {
+            address
+            for address in map(self._address, [item.get("from"), *recipients])
+            if address
+        }
+
+    def _address(self, recipient: dict | None) -> str:
+        return ((recipient or {}).get("emailAddress") or {}).get("address", "").lower()
+
+    def _parse(self, item: dict) -> EmailMessage:
+        to = item.get("toRecipients") or []
+        sender = self._address(item.get("from"))
+        return EmailMessage(
+            id=item["id"],
+            internet_message_id=item.get("internetMessageId"),
+            conversation_id=item.get("conversationId"),
+            sender=sender,
+            recipient=self._address(to[0]) if to else "",
+            subject=item.get("subject") or "",
+            body=(item.get("body") or {}).get("content") or "",
+            received_at=item["receivedDateTime"],
+        )
@@ -1,27 +1,125 @@
 import uuid
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime, timedelta, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+from app import crud
 from app.models import MockEmail as Email
+from app.schema.email import EmailMessage
+from app.services.email_store_service import EmailStoreService
+from app.utils import ensure_aware
 from .base_email_provider import IEmailProvider
 
+PROVIDER_NAME = "mock"
+BATCH_SIZE = 1_000
+
 
 class MockEmailProvider(IEmailProvider):
     """
     Abstracts the email data source.
+
+    Mail is read from the `mockemail` table, where `python -m app.generate_corpus`
+    loads synthetic mailboxes; a client with no mail there gets a small
+    sample mailbox on first fetch. Like a real provider, the emails it pulls
+    are written to the ingestion store when a `client_id` is given, which
+    each refresh reconciles with the mailbox (new and edited emails are
+    upserted, deleted ones removed), and read back from there over the
+    requested time window.
     """
 
+    def _email_id(self, client_email: str, subject: str) -> str:
+        # Stable ids so repeated fetches look like the same mailbox
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{client_email}/{subject}"))
+
     async def fetch_client_emails(
-        self, *, session: AsyncSession, client_email: str
-    ) -> Sequence[Email]:
+        self, *, session: AsyncSession, client_email: str, **kwargs
+    ) -> Sequence[Email | EmailMessage]:
+        return [
+            e
+            async for e in self.iter_client_emails(
+                session=session, client_email=client_email, **kwargs
+            )
+        ]
+
+    async def iter_client_emails(
+        self,
+        *,
+        session: AsyncSession,
+        client_email: str,
+        client_id: uuid.UUID | None = None,
+        since: datetime | None = None,
+        refresh: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[Email | EmailMessage]:
+        if refresh and not await crud.mock_email.has_participant(session, address=client_email):
+            session.add_all(self._mailbox(client_email))
+            await session.commit()
+        if client_id is None:
+            after = None
+            while True:
+                page = await crud.mock_email.list_by_participant(
+                    session, address=client_email, since=since, after=after, limit=BATCH_SIZE
+                )
+                for email in page:
+                    yield email
+                if len(page) < BATCH_SIZE:
+                    return
+                after = (page[-1].received_at, page[-1].id)
+
+        store = EmailStoreService(session)
+        if refresh:
+            await self._ingest(store, client_email, client_id)
+        async for email in store.iter(client_id, provider=PROVIDER_NAME, since=since):
+            yield email
+
+    async def _ingest(
+        self, store: EmailStoreService, client_email: str, client_id: uuid.UUID
+    ) -> None:
+        """
+        Reconciles the ingestion store with the mailbox, a batch at a time:
+        emails that are new or changed since they were copied are upserted,
+        and stored ones no longer in the mailbox are removed.
+        """
+        after = None
+        while True:
+            page = await crud.mock_email.list_by_participant(
+                store.session, address=client_email, after=after, limit=BATCH_SIZE
+            )
+            upstream = [EmailMessage.model_validate(e, from_attributes=True) for e in page]
+            stored = await store.get_many(client_id, PROVIDER_NAME, [e.id for e in upstream])
+            changed = [e for e in upstream if not self._same(e, stored.get(e.id))]
+            if changed:
+                await store.save(client_id, PROVIDER_NAME, changed)
+                await store.session.commit()
+            if len(page) < BATCH_SIZE:
+                break
+            after = (page[-1].received_at, page[-1].id)
+
+        while gone := await crud.mock_email.list_gone_ingested(
+            store.session,
+            address=client_email,
+            client_id=client_id,
+            provider=PROVIDER_NAME,
+            limit=BATCH_SIZE,
+        ):
+            await store.remove(client_id, PROVIDER_NAME, gone)
+            await store.session.commit()
+
+    def _same(self, email: EmailMessage, stored: EmailMessage | None) -> bool:
+        if stored is None:
+            return False
+        return email.model_copy(
+            update={"received_at": ensure_aware(email.received_at)}
+        ) == stored
+
+    def _mailbox(self, client_email: str) -> list[Email]:
         base_time = datetime.now(timezone.utc)
 
         return [
             Email(
-                id=uuid.uuid4(),
+                id=self._email_id(client_email, "Invoice #1023 Payment Reminder"),
                 subject="Invoice #1023 Payment Reminder",
                 sender="billing@vendor.com",
                 recipient=client_email,
@@ -30,7 +128,7 @@ class MockEmailProvider(IEmailProvider):
                 is_read=True,
             ),
             Email(
-                id=uuid.uuid4(),
+                id=self._email_id(client_email, "Quarterly Financial Report Q3"),
                 subject="Quarterly Financial Report Q3",
                 sender="cfo@client-corp.com",
                 recipient=client_email,
@@ -39,7 +137,7 @@ class MockEmailProvider(IEmailProvider):
                 is_read=False,
             ),
             Email(
-                id=uuid.uuid4(),
+                id=self._email_id(client_email, "Meeting Request: Tax Audit Prep"),
                 subject="Meeting Request: Tax Audit Prep",
                 sender="auditor@irs-proxy.com",
                 recipient=client_email,
@@ -48,7 +146,7 @@ class MockEmailProvider(IEmailProvider):
                 is_read=False,
             ),
             Email(
-                id=uuid.uuid4(),
+                id=self._email_id(client_email, "Receipt for your recent purchase"),
                 subject="Receipt for your recent purchase",
                 sender="no-reply@amazon-clone.com",
                 recipient=client_email,
@@ -57,7 +155,7 @@ class MockEmailProvider(IEmailProvider):
                 is_read=True,
             ),
             Email(
-                id=uuid.uuid4(),
+                id=self._email_id(client_email, "Urgent: Bank Reconciliation Discrepancy"),
                 subject="Urgent: Bank Reconciliation Discrepancy",
                 sender="controller@firm.com",
                 recipient=client_email,
@@ -1,11 +1,17 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel
 from datetime import datetime
 
 
 class EmailMessage(BaseModel):
     id: str
-    sender: EmailStr
-    recipient: EmailStr
+    # Plain strings: provider addresses are not always RFC-valid (e.g. Exchange DNs)
+    sender: str
+    recipient: str
     subject: str
-    body_content: str
+    body: str
     received_at: datetime
+    internet_message_id: str | None = None
+    conversation_id: str | None = None
+    # Raw In-Reply-To and References headers, when the provider has them
+    in_reply_to: str | None = None
+    references: str | None = None
@@ -1,6 +1,25 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class FirmRole(str, Enum):
     ADMIN = "ADMIN"
     USER = "USER"
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class JobKind(str, Enum):
+    SUMMARY_REFRESH = "summary_refresh"
+    BULK_REFRESH = "bulk_refresh"
+    MAILBOX_SYNC = "mailbox_sync"
+
+
+class LLMPriority(IntEnum):
+    # Lower values are scheduled first
+    INTERACTIVE = 0
+    BACKGROUND = 1
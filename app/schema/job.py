@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field
+from uuid6 import uuid7
+
+from app.schema.enums import JobKind, JobStatus
+
+
+def get_datetime_utc() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class BulkRefreshReport(BaseModel):
+    firm_id: uuid.UUID
+    total: int = 0
+    processed: int = 0
+    refreshed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    # Clients left untouched because the LLM budget ran out
+    deferred: int = 0
+    elapsed_seconds: float = 0.0
+    clients_per_minute: float = 0.0
+
+
+class Job(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid7()))
+    kind: JobKind
+    status: JobStatus = JobStatus.QUEUED
+    client_id: uuid.UUID | None = None
+    firm_id: uuid.UUID | None = None
+    # Graph mailbox, for mailbox syncs
+    mailbox: str | None = None
+    force_refresh: bool = False
+
+    result: dict | None = None
+    error: str | None = None
+
+    created_at: datetime = Field(default_factory=get_datetime_utc)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
@@ -0,0 +1,46 @@
+import uuid
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class LLMUsage(BaseModel):
+    """A single provider call."""
+
+    model: str
+    input_tokens: int
+    output_tokens: int
+    latency_seconds: float
+    # Only set for streamed calls
+    time_to_first_token_seconds: float | None = None
+    client_id: uuid.UUID | None = None
+    firm_id: uuid.UUID | None = None
+
+
+class LLMUsageTotals(BaseModel):
+    calls: int = 0
+    streamed_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    # Sums over all calls; divide by `calls` (or `streamed_calls`) for averages
+    latency_seconds: float = 0.0
+    time_to_first_token_seconds: float = 0.0
+
+
+class LLMUsageDay(LLMUsageTotals):
+    day: date
+
+
+class ClientLLMUsage(LLMUsageTotals):
+    client_id: uuid.UUID
+
+
+class FirmLLMUsage(BaseModel):
+    firm_id: uuid.UUID
+    start: date
+    end: date
+    # Live counters for the current UTC day
+    today: LLMUsageTotals
+    days: list[LLMUsageDay]
+    top_clients: list[ClientLLMUsage]
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ResourceData(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, extra="allow")
+
+    id: str | None = None
+
+
+class ChangeNotification(BaseModel):
+    """A Microsoft Graph change notification, e.g. for a new message."""
+
+    model_config = ConfigDict(populate_by_name=True, extra="allow")
+
+    subscription_id: str = Field(alias="subscriptionId")
+    client_state: str | None = Field(default=None, alias="clientState")
+    change_type: str = Field(alias="changeType")
+    # e.g. "Users/{user-id}/Messages/{message-id}"
+    resource: str
+    resource_data: ResourceData | None = Field(default=None, alias="resourceData")
+
+    @property
+    def message_id(self) -> str | None:
+        if self.resource_data and self.resource_data.id:
+            return self.resource_data.id
+        parts = self.resource.rstrip("/").split("/")
+        return parts[-1] if len(parts) > 1 else None
+
+
+class ChangeNotificationCollection(BaseModel):
+    value: list[ChangeNotification]
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statuses upstreams use to say "slow down"
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+def status_code(e: Exception) -> int | None:
+    """HTTP status of an httpx.HTTPStatusError or a google.genai APIError."""
+    response = getattr(e, "response", None)
+    return getattr(e, "code", None) or getattr(response, "status_code", None)
+
+
+def is_throttled(e: Exception) -> bool:
+    return status_code(e) in THROTTLE_STATUS_CODES
+
+
+def retry_after_seconds(e: Exception) -> float | None:
+    """The Retry-After of the error's response, in seconds or as an HTTP date."""
+    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveConcurrencyService:
+    """
+    AIMD concurrency limit for calls to an upstream that throttles.
+
+    Calls run inside `slot()`. Every successful call raises the limit by
+    1/limit, so it grows by about one per round of calls; a throttled call
+    (429/503) multiplies it by `backoff` and pauses new calls for the
+    response's Retry-After. Only calls started after the last cut can cut
+    it again, so a burst of throttled in-flight calls counts once. Other
+    errors leave the limit alone. The limit therefore settles just below
+    the upstream's throttling point instead of a hand-tuned constant.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = settings.ADAPTIVE_CONCURRENCY_INITIAL,
+        min_limit: int = settings.ADAPTIVE_CONCURRENCY_MIN,
+        max_limit: int = settings.ADAPTIVE_CONCURRENCY_MAX,
+        backoff: float = settings.ADAPTIVE_CONCURRENCY_BACKOFF,
+        default_retry_after: float = settings.ADAPTIVE_CONCURRENCY_DEFAULT_RETRY_AFTER_SECONDS,
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.default_retry_after = default_retry_after
+        self.in_flight = 0
+        self.throttled = 0
+        self.resume_at = 0.0
+        self._last_cut = 0.0
+        self._waiters: list[asyncio.Future] = []
+
+    @asynccontextmanager
+    async def slot(self):
+        started = await self._acquire()
+        try:
+            yield
+        except Exception as e:
+            if is_throttled(e):
+                self._release(started, throttled=True, retry_after=retry_after_seconds(e))
+            else:
+                self._release(started)
+            raise
+        except BaseException:
+            # Cancelled or closed early: says nothing about the upstream
+            self._release(started)
+            raise
+        self._release(started, succeeded=True)
+
+    async def _acquire(self) -> float:
+        while True:
+            pause = self.resume_at - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            elif self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return time.monotonic()
+            else:
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+                try:
+                    await waiter
+                finally:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+
+    def _release(
+        self,
+        started: float,
+        succeeded: bool = False,
+        throttled: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        self.in_flight -= 1
+        previous = int(self.limit)
+        if throttled:
+            self.throttled += 1
+            delay = self.default_retry_after if retry_after is None else retry_after
+            self.resume_at = max(self.resume_at, time.monotonic() + delay)
+            if started >= self._last_cut:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_cut = time.monotonic()
+        elif succeeded:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        if int(self.limit) != previous:
+            logger.info(f"Concurrency limit for {self.name}: {previous} -> {int(self.limit)}")
+        # Waiters re-check the limit and any pause themselves
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def metrics(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "throttled": self.throttled,
+            "paused_seconds": max(0.0, self.resume_at - time.monotonic()),
+        }
+
+
+_limiters: dict[str, AdaptiveConcurrencyService] = {}
+
+
+def get_limiter(name: str) -> AdaptiveConcurrencyService:
+    """Process-wide limiter per upstream, e.g. "llm:google" or "graph:<mailbox>"."""
+    if name not in _limiters:
+        _limiters[name] = AdaptiveConcurrencyService(name)
+    return _limiters[name]
+
+
+def limiter_metrics() -> dict[str, dict]:
+    return {name: limiter.metrics() for name, limiter in _limiters.items()}
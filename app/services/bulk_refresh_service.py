@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.models import Client
+from app.providers.email import IEmailProvider
+from app.schema.job import BulkRefreshReport
+from app.services.single_flight_service import SingleFlightService
+from app.services.summarization_service import SummarizationService, summary_flight_key
+
+logger = logging.getLogger(__name__)
+
+
+class BulkRefreshService:
+    """
+    Refreshes every client summary of a firm, skipping clients whose mailbox
+    hash is unchanged.
+
+    Clients are processed concurrently (each with its own DB session) up to
+    `concurrency`, and at most `llm_budget` clients are re-summarized per run;
+    the rest are reported as deferred.
+    """
+
+    def __init__(
+        self,
+        email_provider: IEmailProvider,
+        single_flight: SingleFlightService,
+        concurrency: int = settings.SUMMARY_BULK_CONCURRENCY,
+        llm_budget: int = settings.SUMMARY_BULK_LLM_BUDGET,
+    ):
+        self.email_provider = email_provider
+        self.single_flight = single_flight
+        self.concurrency = concurrency
+        self.llm_budget = llm_budget
+
+    async def refresh_firm(
+        self,
+        firm_id: uuid.UUID,
+        force_refresh: bool = False,
+        on_progress: Callable[[BulkRefreshReport], Awaitable[None]] | None = None,
+    ) -> BulkRefreshReport:
+        report = BulkRefreshReport(firm_id=firm_id)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        budget = self.llm_budget
+        started = time.monotonic()
+
+        def reserve_budget() -> bool:
+            nonlocal budget
+            if budget <= 0:
+                return False
+            budget -= 1
+            return True
+
+        async def refresh_client(client: Client) -> None:
+            async with semaphore:
+                try:
+                    outcome = await self._refresh_client(client, force_refresh, reserve_budget)
+                    if outcome == "refreshed":
+                        report.refreshed += 1
+                    elif outcome == "skipped":
+                        report.skipped += 1
+                    else:
+                        report.deferred += 1
+                except Exception as e:
+                    logger.error(f"Bulk refresh failed for client {client.id}: {e}", exc_info=True)
+                    report.failed += 1
+
+            report.processed += 1
+            report.elapsed_seconds = time.monotonic() - started
+            report.clients_per_minute = report.processed / report.elapsed_seconds * 60
+            if on_progress:
+                await on_progress(report)
+
+        async with AsyncSessionLocal() as session:
+            clients = await self._list_clients(session, firm_id)
+        report.total = len(clients)
+        await asyncio.gather(*(refresh_client(c) for c in clients))
+
+        logger.info(
+            f"Bulk refresh for firm {firm_id}: {report.refreshed} refreshed, "
+            f"{report.skipped} skipped, {report.deferred} deferred, {report.failed} failed "
+            f"at {report.clients_per_minute:.1f} clients/min"
+        )
+        return report
+
+    async def _refresh_client(
+        self,
+        client: Client,
+        force_refresh: bool,
+        reserve_budget: Callable[[], bool],
+    ) -> str:
+        async with AsyncSessionLocal() as session:
+            summarizer = SummarizationService(session)
+            mailbox = await summarizer.load_mailbox(client.id, self.email_provider)
+            if not force_refresh:
+                existing = await crud.email_summary.get_by_client(
+                    session=session, client_id=client.id
+                )
+                if summarizer.unchanged(existing, mailbox):
+                    return "skipped"
+            if not reserve_budget():
+                return "deferred"
+            await self.single_flight.do(
+                summary_flight_key(client.id, force_refresh),
+                lambda: summarizer.process_and_store_summary(
+                    client.id,
+                    self.email_provider,
+                    force_refresh=force_refresh,
+                    mailbox=mailbox,
+                ),
+            )
+            return "refreshed"
+
+    async def _list_clients(
+        self, session: AsyncSession, firm_id: uuid.UUID
+    ) -> list[Client]:
+        clients: list[Client] = []
+        skip, page_size = 0, 100
+        while True:
+            page = await crud.client.list_by_firm(
+                session=session, firm_id=firm_id, skip=skip, limit=page_size
+            )
+            clients.extend(c for c in page if c.is_active)
+            if len(page) < page_size:
+                return clients
+            skip += page_size
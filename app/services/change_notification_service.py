@@ -0,0 +1,83 @@
+import logging
+import secrets
+import uuid
+from collections.abc import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.providers.email.graph_email_provider import PROVIDER_NAME, MicrosoftGraphProvider
+from app.schema.notification import ChangeNotification
+from app.services.summary_dirty_service import SummaryDirtyService
+
+logger = logging.getLogger(__name__)
+
+
+def authentic_notifications(
+    notifications: Sequence[ChangeNotification],
+) -> list[ChangeNotification]:
+    """The notifications carrying our clientState; anyone can reach the webhook."""
+    secret = settings.GRAPH_WEBHOOK_CLIENT_STATE
+    if not secret:
+        logger.warning("Ignoring change notifications: GRAPH_WEBHOOK_CLIENT_STATE is not set")
+        return []
+    accepted = [
+        n
+        for n in notifications
+        if n.client_state and secrets.compare_digest(n.client_state, secret)
+    ]
+    if len(accepted) < len(notifications):
+        logger.warning(
+            f"Ignoring {len(notifications) - len(accepted)} change notifications "
+            "with an invalid clientState"
+        )
+    return accepted
+
+
+class ChangeNotificationService:
+    """
+    Maps Graph change notifications for the shared mailbox to the clients
+    they concern and marks those clients' summaries dirty.
+
+    A message already synced for a client (an update or a deletion) is
+    found in the ingestion store; for new and updated messages the
+    participants are also looked up in Graph and matched to client
+    addresses.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        dirty: SummaryDirtyService,
+        graph: MicrosoftGraphProvider | None = None,
+    ):
+        self.session = session
+        self.dirty = dirty
+        self.graph = graph
+
+    async def process(self, notifications: Sequence[ChangeNotification]) -> set[uuid.UUID]:
+        client_ids: set[uuid.UUID] = set()
+        for notification in notifications:
+            try:
+                client_ids |= await self.resolve_clients(notification)
+            except Exception as e:
+                logger.warning(f"Could not resolve change notification {notification.resource}: {e}")
+        for client_id in client_ids:
+            await self.dirty.mark_dirty(client_id)
+        logger.info(
+            f"{len(notifications)} change notifications marked {len(client_ids)} summaries dirty"
+        )
+        return client_ids
+
+    async def resolve_clients(self, notification: ChangeNotification) -> set[uuid.UUID]:
+        message_id = notification.message_id
+        if not message_id:
+            return set()
+        client_ids = await crud.ingested_email.client_ids_for_message(
+            self.session, provider=PROVIDER_NAME, message_id=message_id
+        )
+        if notification.change_type != "deleted" and self.graph is not None:
+            participants = await self.graph.message_participants(message_id)
+            client_ids |= await crud.client.ids_by_emails(self.session, emails=participants)
+        return client_ids
@@ -0,0 +1,88 @@
+import hashlib
+import logging
+import uuid
+from collections.abc import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.models import MockEmail as Email
+from app.services.email_thread_service import message_ids, normalize_subject
+from app.utils import ensure_aware
+
+logger = logging.getLogger(__name__)
+
+
+class EmailDedupService:
+    """
+    Drops copies of the same message from a mailbox stream, e.g. a message
+    fetched from several accountants' mailboxes or as a CC copy.
+
+    Copies share an Internet-Message-Id; for emails without one, a hash of
+    the sender, normalized subject, minute received and whitespace-
+    normalized body stands in. The first copy in the stream (the oldest)
+    is kept.
+
+    With a `client_id`, the key of every email is kept in the `seen_email`
+    index, so later refreshes look keys up by email id instead of hashing
+    the email again. `stage()` writes the index changes for the next
+    commit.
+    """
+
+    def __init__(self, session: AsyncSession | None = None, client_id: uuid.UUID | None = None):
+        self.session = session
+        self.client_id = client_id
+        self._index: dict[str, str] = {}
+        self._current: dict[str, str] = {}
+        self.duplicates = 0
+
+    async def load(self) -> None:
+        if self.session is not None and self.client_id is not None:
+            self._index = await crud.seen_email.get_by_client(
+                self.session, client_id=self.client_id
+            )
+
+    def key(self, email: Email) -> str:
+        message_id = message_ids(getattr(email, "internet_message_id", None))
+        if message_id:
+            source = f"message-id\x1f{message_id[0]}"
+        else:
+            source = "\x1f".join(
+                [
+                    "content",
+                    email.sender.lower(),
+                    normalize_subject(email.subject),
+                    f"{ensure_aware(email.received_at):%Y-%m-%dT%H:%M}",
+                    " ".join(email.body.split()),
+                ]
+            )
+        return hashlib.sha256(source.encode()).hexdigest()
+
+    async def unique(self, emails: AsyncIterator[Email]) -> AsyncIterator[Email]:
+        """One pass over a mailbox stream, without duplicates."""
+        seen: set[str] = set()
+        duplicates = 0
+        async for email in emails:
+            email_id = str(email.id)
+            key = self._current.get(email_id) or self._index.get(email_id) or self.key(email)
+            self._current[email_id] = key
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            yield email
+        self.duplicates = duplicates
+
+    async def stage(self) -> None:
+        """Records the keys of the last pass in `seen_email`. Not committed here."""
+        if self.session is None or self.client_id is None:
+            return
+        if self.duplicates:
+            logger.info(f"Skipped {self.duplicates} duplicate emails for client {self.client_id}")
+        await crud.seen_email.stage_changes(
+            self.session,
+            client_id=self.client_id,
+            upserts={i: k for i, k in self._current.items() if self._index.get(i) != k},
+            removed=[i for i in self._index if i not in self._current],
+        )
+        self._index = dict(self._current)
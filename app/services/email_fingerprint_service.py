@@ -0,0 +1,93 @@
+import hashlib
+import uuid
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.models import MockEmail as Email
+from app.utils import ensure_aware
+
+# Fingerprints are summed modulo 2**256, so the digest does not depend on
+# email order and can be updated by adding and subtracting fingerprints.
+DIGEST_MODULUS = 2**256
+
+
+@dataclass
+class MailboxDiff:
+    # Digest of the current mailbox
+    digest: str
+    # Current fingerprints, keyed by email id
+    fingerprints: dict[str, str]
+    # Ids of new emails, and of emails whose content changed since they were
+    # summarized
+    added: list[str] = field(default_factory=list)
+    # Ids of summarized emails that are gone or changed
+    removed: list[str] = field(default_factory=list)
+    # How many emails had been summarized before
+    known: int = 0
+
+
+class EmailFingerprintService:
+    """
+    Per-email fingerprints of the mailbox a client summary was built from.
+
+    Each email is hashed on its own (id, sender, recipient, timestamp,
+    subject and body), so no copy of the mailbox is ever built, and the
+    mailbox digest stored as `EmailSummary.summary_hash` is the sum of the
+    fingerprints. Comparing against the `email_fingerprint` table says
+    exactly which emails were added or removed.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def fingerprint(self, email: Email) -> str:
+        h = hashlib.sha256()
+        for value in (
+            email.id,
+            email.sender,
+            email.recipient,
+            ensure_aware(email.received_at).isoformat(),
+            email.subject,
+            email.body,
+        ):
+            h.update(str(value).encode())
+            # Field separator, so ("ab", "c") and ("a", "bc") differ
+            h.update(b"\x1f")
+        return h.hexdigest()
+
+    def digest(self, fingerprints: Iterable[str]) -> str:
+        total = sum(int(f, 16) for f in fingerprints) % DIGEST_MODULUS
+        return f"{total:064x}"
+
+    def fingerprint_emails(self, emails: Sequence[Email]) -> dict[str, str]:
+        return {str(e.id): self.fingerprint(e) for e in emails}
+
+    async def diff(
+        self, client_id: uuid.UUID, fingerprints: dict[str, str]
+    ) -> MailboxDiff:
+        """Compares the current mailbox, as fingerprints by email id, to the summarized one."""
+        stored = await crud.email_fingerprint.get_by_client(
+            self.session, client_id=client_id
+        )
+        return MailboxDiff(
+            digest=self.digest(fingerprints.values()),
+            fingerprints=fingerprints,
+            added=[i for i, f in fingerprints.items() if stored.get(i) != f],
+            removed=[i for i, f in stored.items() if fingerprints.get(i) != f],
+            known=len(stored),
+        )
+
+    async def stage(self, client_id: uuid.UUID, diff: MailboxDiff) -> None:
+        """
+        Records the mailbox in `diff` as summarized. Not committed here; the
+        summary write that follows commits both together.
+        """
+        await crud.email_fingerprint.stage_changes(
+            self.session,
+            client_id=client_id,
+            upserts={i: diff.fingerprints[i] for i in diff.added},
+            removed=[i for i in diff.removed if i not in diff.fingerprints],
+        )
@@ -0,0 +1,128 @@
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.models import IngestedEmail
+from app.schema.email import EmailMessage
+from app.utils import ensure_aware
+
+SAVE_BATCH_SIZE = 1_000
+READ_BATCH_SIZE = 500
+
+
+def email_window_start(now: datetime | None = None) -> datetime | None:
+    """Oldest `received_at` summaries look at, or None for the whole history."""
+    if settings.SUMMARY_EMAIL_WINDOW_DAYS is None:
+        return None
+    now = now or datetime.now(timezone.utc)
+    return now - timedelta(days=settings.SUMMARY_EMAIL_WINDOW_DAYS)
+
+
+class EmailStoreService:
+    """
+    The `ingested_email` table: every provider writes the client emails it
+    pulls here, deduplicated on (client, provider, message id), and reads
+    for summaries come back from it over an indexed time window.
+
+    Writes are staged on the session; callers commit.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def save(
+        self, client_id: uuid.UUID, provider: str, emails: Sequence[EmailMessage]
+    ) -> None:
+        # Batched to stay far below Postgres' bind parameter limit
+        for start in range(0, len(emails), SAVE_BATCH_SIZE):
+            await crud.ingested_email.upsert_many(
+                self.session,
+                emails=[
+                    IngestedEmail(
+                        client_id=client_id,
+                        provider=provider,
+                        message_id=email.id,
+                        **email.model_dump(exclude={"id"}),
+                    )
+                    for email in emails[start : start + SAVE_BATCH_SIZE]
+                ],
+            )
+
+    async def remove(
+        self,
+        client_id: uuid.UUID | None,
+        provider: str,
+        message_ids: Sequence[str] | None = None,
+    ) -> None:
+        """
+        Removes the given messages, or all from `provider`, of the client or
+        of every client when `client_id` is None.
+        """
+        await crud.ingested_email.remove_messages(
+            self.session, client_id=client_id, provider=provider, message_ids=message_ids
+        )
+
+    async def get_many(
+        self, client_id: uuid.UUID, provider: str, message_ids: Sequence[str]
+    ) -> dict[str, EmailMessage]:
+        """Stored copies of the given messages, by message id."""
+        stored = await crud.ingested_email.list_by_message_ids(
+            self.session, client_id=client_id, provider=provider, message_ids=message_ids
+        )
+        return {email.message_id: self._message(email) for email in stored}
+
+    async def read(
+        self,
+        client_id: uuid.UUID,
+        provider: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[EmailMessage]:
+        return [e async for e in self.iter(client_id, provider, since, until)]
+
+    async def iter(
+        self,
+        client_id: uuid.UUID,
+        provider: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> AsyncIterator[EmailMessage]:
+        """
+        Oldest first, `READ_BATCH_SIZE` rows at a time. Pages are keyed on
+        (received_at, id) rather than held open as a cursor, so the session
+        stays usable while the caller consumes them.
+        """
+        after = None
+        while True:
+            stored = await crud.ingested_email.list_by_client(
+                self.session,
+                client_id=client_id,
+                provider=provider,
+                since=since,
+                until=until,
+                after=after,
+                limit=READ_BATCH_SIZE,
+            )
+            for email in stored:
+                yield self._message(email)
+            if len(stored) < READ_BATCH_SIZE:
+                return
+            after = (stored[-1].received_at, stored[-1].id)
+
+    def _message(self, email: IngestedEmail) -> EmailMessage:
+        return EmailMessage(
+            id=email.message_id,
+            internet_message_id=email.internet_message_id,
+            conversation_id=email.conversation_id,
+            in_reply_to=email.in_reply_to,
+            references=email.references,
+            sender=email.sender,
+            recipient=email.recipient,
+            subject=email.subject,
+            body=email.body,
+            received_at=ensure_aware(email.received_at),
+        )
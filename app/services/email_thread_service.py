@@ -0,0 +1,124 @@
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from app.models import MockEmail as Email
+from app.schema.summary import Actor, ActorType, EmailThreadSummary
+from app.services.email_fingerprint_service import EmailFingerprintService
+
+# "Re:", "RE[2]:", "Fwd:", "AW:" ... possibly repeated
+SUBJECT_PREFIX = re.compile(r"^\s*((re|fw|fwd|aw|wg|sv|vs|tr)\s*(\[\d+\])?\s*:\s*)+", re.I)
+MESSAGE_ID = re.compile(r"<([^<>\s]+)>")
+
+
+def normalize_subject(subject: str | None) -> str:
+    return " ".join(SUBJECT_PREFIX.sub("", subject or "").lower().split())
+
+
+def message_ids(header: str | None) -> list[str]:
+    """Message ids in an In-Reply-To or References header, without brackets."""
+    if not header:
+        return []
+    ids = MESSAGE_ID.findall(header) or header.split()
+    return [i.strip("<>").lower() for i in ids if i.strip("<>")]
+
+
+@dataclass
+class EmailThread:
+    # Id of the thread's first email
+    id: str
+    email_ids: list[str] = field(default_factory=list)
+    # Order-independent digest of the member emails' fingerprints
+    fingerprint: str = ""
+    tokens: int = 0
+
+
+class EmailThreadService:
+    """
+    Groups a mailbox into conversations as its emails are scanned.
+
+    Emails are linked through, in order of preference, the provider's
+    conversation id, their Message-Id / In-Reply-To / References headers,
+    and, for emails carrying neither, the subject without "Re:"/"Fwd:"
+    prefixes between the same two addresses. Linked emails form one thread
+    (union-find), so a reply that only shares a header with one email of a
+    conversation still joins the whole conversation.
+    """
+
+    def __init__(self, fingerprints: EmailFingerprintService):
+        self.fingerprints = fingerprints
+        self._parent: dict[str, str] = {}
+        self._emails: list[tuple[str, str, int]] = []
+
+    def add(self, email: Email, fingerprint: str, tokens: int) -> None:
+        email_id = str(email.id)
+        node = f"email:{email_id}"
+        self._find(node)
+        self._emails.append((email_id, fingerprint, tokens))
+
+        conversation_id = getattr(email, "conversation_id", None)
+        own_id = message_ids(getattr(email, "internet_message_id", None))
+        references = message_ids(getattr(email, "in_reply_to", None)) + message_ids(
+            getattr(email, "references", None)
+        )
+        if conversation_id:
+            self._union(node, f"conversation:{conversation_id}")
+        for message_id in own_id + references:
+            self._union(node, f"message:{message_id}")
+        if not conversation_id and not references:
+            subject = normalize_subject(email.subject)
+            if subject:
+                parties = sorted({email.sender.lower(), email.recipient.lower()})
+                self._union(node, f"subject:{subject}:{'|'.join(parties)}")
+
+    def threads(self) -> list[EmailThread]:
+        """Threads in the order their first email was added."""
+        threads: dict[str, EmailThread] = {}
+        fingerprints: dict[str, list[str]] = {}
+        for email_id, fingerprint, tokens in self._emails:
+            root = self._find(f"email:{email_id}")
+            thread = threads.setdefault(root, EmailThread(id=email_id))
+            thread.email_ids.append(email_id)
+            thread.tokens += tokens
+            fingerprints.setdefault(root, []).append(fingerprint)
+        for root, thread in threads.items():
+            thread.fingerprint = self.fingerprints.digest(fingerprints[root])
+        return list(threads.values())
+
+    def _find(self, node: str) -> str:
+        self._parent.setdefault(node, node)
+        while self._parent[node] != node:
+            # Path halving keeps the trees flat
+            self._parent[node] = self._parent[self._parent[node]]
+            node = self._parent[node]
+        return node
+
+    def _union(self, a: str, b: str) -> None:
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a != root_b:
+            self._parent[root_b] = root_a
+
+
+def merge_thread_summaries(summaries: Sequence[EmailThreadSummary]) -> EmailThreadSummary:
+    """
+    The client-level summary of per-thread summaries, oldest thread first:
+    actors are deduplicated, open items kept in thread order, and the
+    mailbox is concluded when every thread is.
+    """
+    actors: dict[str, Actor] = {}
+    open_items = []
+    for summary in summaries:
+        for actor in summary.actors:
+            key = actor.identifier.strip().lower()
+            known = actors.get(key)
+            if known is None or (known.role == ActorType.unknown and actor.role != ActorType.unknown):
+                actors[key] = actor
+        for item in summary.open_items:
+            if item not in open_items:
+                open_items.append(item)
+    return EmailThreadSummary(
+        actors=list(actors.values()),
+        concluded=not open_items and all(s.concluded for s in summaries),
+        open_items=open_items,
+    )
+
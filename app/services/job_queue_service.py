@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.schema.enums import JobKind, JobStatus
+from app.schema.job import Job
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "jobs:queue"
+PROCESSING_KEY = "jobs:processing"
+LEASE_PREFIX = "jobs:lease:"
+ORPHAN_PREFIX = "jobs:orphan:"
+
+# Moves ids in the processing list without a live lease back onto the queue.
+# An id is only moved once it was already seen without a lease by an earlier
+# run, so a job a worker has just popped but not yet leased is left alone.
+REQUEUE_STALE_SCRIPT = """
+local requeued = {}
+for _, id in ipairs(redis.call("LRANGE", KEYS[1], 0, -1)) do
+    if redis.call("EXISTS", ARGV[1] .. id) == 0 then
+        if redis.call("SET", ARGV[2] .. id, "1", "NX", "EX", ARGV[3]) == false then
+            redis.call("DEL", ARGV[2] .. id)
+            if redis.call("LREM", KEYS[1], 1, id) > 0 then
+                redis.call("RPUSH", KEYS[2], id)
+                table.insert(requeued, id)
+            end
+        end
+    end
+end
+return requeued
+"""
+
+# Moves one job from the processing list back to the head of the queue
+REQUEUE_SCRIPT = """
+if redis.call("LREM", KEYS[1], 1, ARGV[1]) > 0 then
+    redis.call("RPUSH", KEYS[2], ARGV[1])
+end
+"""
+
+
+class JobQueueService:
+    """
+    Redis-backed background job queue.
+
+    Jobs are stored as JSON under `jobs:{id}` and their ids are pushed onto a
+    list that `app/summary_worker.py` pops from. A client (or firm, for bulk
+    refreshes) has at most one pending job: enqueueing again returns the job
+    already queued.
+
+    Popping moves the id into a processing list, where it stays until the
+    job is acknowledged, so a worker crash cannot lose it: while running,
+    the job holds a lease that `lease` renews, and `requeue_stale` puts
+    back the ids whose lease lapsed.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        job_ttl: int = settings.JOB_TTL_SECONDS,
+        lease_ttl: int = settings.JOB_LEASE_SECONDS,
+    ):
+        self.redis = redis
+        self.job_ttl = job_ttl
+        self.lease_ttl = lease_ttl
+
+    async def enqueue_summary_refresh(
+        self, client_id: uuid.UUID, force_refresh: bool = True
+    ) -> Job:
+        job = Job(
+            kind=JobKind.SUMMARY_REFRESH,
+            client_id=client_id,
+            force_refresh=force_refresh,
+        )
+        return await self._enqueue_once(job)
+
+    async def enqueue_bulk_refresh(
+        self, firm_id: uuid.UUID, force_refresh: bool = False
+    ) -> Job:
+        job = Job(
+            kind=JobKind.BULK_REFRESH,
+            firm_id=firm_id,
+            force_refresh=force_refresh,
+        )
+        return await self._enqueue_once(job)
+
+    async def enqueue_mailbox_sync(self, mailbox: str) -> Job:
+        return await self._enqueue_once(Job(kind=JobKind.MAILBOX_SYNC, mailbox=mailbox))
+
+    async def _enqueue_once(self, job: Job) -> Job:
+        """
+        Enqueues `job` unless an equivalent job is still queued, in which case
+        that one is returned (upgraded to a forced refresh if needed).
+        """
+        pending_key = self._pending_key(job)
+        if not await self.redis.set(pending_key, job.id, nx=True, ex=self.job_ttl):
+            pending_id = await self.redis.get(pending_key)
+            pending = await self.get(pending_id.decode()) if pending_id else None
+            if pending and pending.status == JobStatus.QUEUED:
+                if job.force_refresh and not pending.force_refresh:
+                    pending.force_refresh = True
+                    await self.save(pending)
+                return pending
+            await self.redis.set(pending_key, job.id, ex=self.job_ttl)
+        return await self.enqueue(job)
+
+    async def enqueue(self, job: Job) -> Job:
+        await self.save(job)
+        await self.redis.lpush(QUEUE_KEY, job.id)
+        return job
+
+    async def dequeue(self, timeout: int = 5) -> Job | None:
+        """
+        Blocks for up to `timeout` seconds waiting for the next job, leases
+        it and marks it running. Call `ack` once it is finished.
+        """
+        item = await self.redis.blmove(QUEUE_KEY, PROCESSING_KEY, timeout, "RIGHT", "LEFT")
+        if not item:
+            return None
+        job_id = item.decode()
+        await self.redis.set(self._lease_key(job_id), 1, ex=self.lease_ttl)
+        job = await self.get(job_id)
+        if job is None:
+            # Expired before a worker got to it
+            await self.ack(job_id)
+            return None
+        await self.redis.delete(self._pending_key(job))
+        job.status = JobStatus.RUNNING
+        job.started_at = self.now()
+        await self.save(job)
+        return job
+
+    async def ack(self, job_id: str) -> None:
+        """Removes a finished job from the processing list."""
+        await self.redis.lrem(PROCESSING_KEY, 1, job_id)
+        await self.redis.delete(self._lease_key(job_id))
+
+    @asynccontextmanager
+    async def lease(self, job: Job) -> AsyncIterator[None]:
+        """
+        Renews the job's lease while the block runs, and acknowledges it
+        once the block completes; the block handles the job's own failures.
+        A cancelled job (e.g. on worker shutdown) goes back on the queue,
+        and one interrupted otherwise is left to `requeue_stale`.
+        """
+
+        async def renew() -> None:
+            while True:
+                await asyncio.sleep(self.lease_ttl / 3)
+                await self.redis.set(self._lease_key(job.id), 1, ex=self.lease_ttl)
+
+        renewer = asyncio.create_task(renew())
+        try:
+            yield
+        except asyncio.CancelledError:
+            renewer.cancel()
+            await self.requeue(job.id)
+            raise
+        finally:
+            renewer.cancel()
+        await self.ack(job.id)
+
+    async def requeue(self, job_id: str) -> None:
+        """Puts a job being processed back at the head of the queue."""
+        await self.redis.eval(REQUEUE_SCRIPT, 2, PROCESSING_KEY, QUEUE_KEY, job_id)
+        await self.redis.delete(self._lease_key(job_id))
+        await self._reset(job_id)
+
+    async def requeue_stale(self) -> int:
+        """
+        Puts jobs whose worker stopped renewing their lease back on the
+        queue, ahead of newer jobs. Returns how many were requeued.
+        """
+        requeued = await self.redis.eval(
+            REQUEUE_STALE_SCRIPT,
+            2,
+            PROCESSING_KEY,
+            QUEUE_KEY,
+            LEASE_PREFIX,
+            ORPHAN_PREFIX,
+            self.lease_ttl * 3,
+        )
+        for job_id in requeued:
+            await self._reset(job_id.decode())
+        if requeued:
+            logger.warning(f"Requeued {len(requeued)} jobs abandoned by their worker")
+        return len(requeued)
+
+    async def _reset(self, job_id: str) -> None:
+        """Marks a requeued job queued again, and pending for its client or firm."""
+        job = await self.get(job_id)
+        if job is None:
+            return
+        job.status = JobStatus.QUEUED
+        job.started_at = None
+        await self.save(job)
+        await self.redis.set(self._pending_key(job), job.id, nx=True, ex=self.job_ttl)
+
+    async def get(self, job_id: str) -> Job | None:
+        raw = await self.redis.get(self._job_key(job_id))
+        return Job.model_validate_json(raw) if raw else None
+
+    async def save(self, job: Job) -> None:
+        await self.redis.set(
+            self._job_key(job.id), job.model_dump_json(), ex=self.job_ttl
+        )
+
+    async def mark_done(self, job: Job, result: dict | None = None) -> Job:
+        job.status = JobStatus.DONE
+        job.result = result
+        job.finished_at = self.now()
+        await self.save(job)
+        return job
+
+    async def mark_failed(self, job: Job, error: str) -> Job:
+        job.status = JobStatus.FAILED
+        job.error = error
+        job.finished_at = self.now()
+        await self.save(job)
+        return job
+
+    async def queue_depth(self) -> int:
+        return await self.redis.llen(QUEUE_KEY)
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"jobs:{job_id}"
+
+    def _lease_key(self, job_id: str) -> str:
+        return f"{LEASE_PREFIX}{job_id}"
+
+    def _pending_key(self, job: Job) -> str:
+        if job.kind == JobKind.BULK_REFRESH:
+            return f"jobs:pending-bulk:{job.firm_id}"
+        if job.kind == JobKind.MAILBOX_SYNC:
+            return f"jobs:pending-mailbox:{job.mailbox}"
+        return f"jobs:pending-summary:{job.client_id}"
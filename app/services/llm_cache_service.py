@@ -0,0 +1,119 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from redis.asyncio import Redis
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.models import LlmResponseCache
+from app.utils import ensure_aware
+
+
+class LLMResponseCacheService:
+    """
+    Content-addressed cache of raw LLM responses.
+
+    Keys hash the model, temperature, output budget, response format and
+    whitespace-normalized messages, so identical requests map to the same
+    entry. Redis is always used; Postgres
+    backs it up when `LLM_CACHE_POSTGRES_ENABLED` so entries survive Redis
+    evictions and restarts.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        ttl: int = settings.LLM_CACHE_TTL_SECONDS,
+        use_postgres: bool = settings.LLM_CACHE_POSTGRES_ENABLED,
+    ):
+        self.redis = redis
+        self.ttl = ttl
+        self.use_postgres = use_postgres
+
+    def key(
+        self,
+        *,
+        model: str | None,
+        temperature: float,
+        messages: list[dict],
+        json_resp: bool = False,
+        max_tokens: int | None = None,
+        response_schema: Any = None,
+    ) -> str:
+        normalized = [
+            {"role": m["role"], "content": " ".join(str(m["content"]).split())}
+            for m in messages
+        ]
+        payload = json.dumps(
+            {
+                "model": model,
+                "temperature": temperature,
+                "json_resp": json_resp,
+                "max_tokens": max_tokens,
+                "response_schema": self._schema(response_schema),
+                "messages": normalized,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> str | None:
+        raw = await self.redis.get(self._redis_key(key))
+        if raw is not None:
+            return raw.decode()
+        if not self.use_postgres:
+            return None
+
+        async with AsyncSessionLocal() as session:
+            entry = await session.get(LlmResponseCache, key)
+        if entry is None or self._expired(entry.expires_at):
+            return None
+        # Backfill Redis for the remaining lifetime of the entry
+        remaining = int((ensure_aware(entry.expires_at) - self.now()).total_seconds())
+        await self.redis.set(self._redis_key(key), entry.response, ex=max(remaining, 1))
+        return entry.response
+
+    async def set(self, key: str, response: str, *, model: str | None = None) -> None:
+        await self.redis.set(self._redis_key(key), response, ex=self.ttl)
+        if not self.use_postgres:
+            return
+
+        expires_at = self.now() + timedelta(seconds=self.ttl)
+        entry = LlmResponseCache(
+            key=key, model=model or "", response=response, expires_at=expires_at
+        )
+        values = {
+            column.name: getattr(entry, column.name)
+            for column in LlmResponseCache.__table__.columns
+        }
+        # Bind through the table so `response` is encrypted like other columns
+        statement = insert(LlmResponseCache.__table__).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=["key"],
+            set_={
+                "response": statement.excluded.response,
+                "expires_at": statement.excluded.expires_at,
+            },
+        )
+        async with AsyncSessionLocal() as session:
+            await session.execute(statement)
+            await session.commit()
+
+    def _schema(self, response_schema: Any) -> Any:
+        if response_schema is None:
+            return None
+        if hasattr(response_schema, "model_json_schema"):
+            return response_schema.model_json_schema()
+        return str(response_schema)
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def _expired(self, expires_at: datetime) -> bool:
+        return ensure_aware(expires_at) <= self.now()
+
+    def _redis_key(self, key: str) -> str:
+        return f"llm-cache:{key}"
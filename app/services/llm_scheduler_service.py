@@ -0,0 +1,176 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.schema.enums import LLMPriority
+
+logger = logging.getLogger(__name__)
+
+# Two token buckets (requests and tokens per minute) checked and debited
+# atomically. A call must leave ARGV[5] (a share of each bucket) untouched,
+# which is how the share reserved for interactive calls holds across
+# workers. Returns 0 when admitted, otherwise the milliseconds to wait.
+TOKEN_BUCKET_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local reserved_share = tonumber(ARGV[5])
+local wait = 0
+local levels = {}
+for i = 1, 2 do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local reserved = capacity * reserved_share
+    local cost = math.min(tonumber(ARGV[2 * i]), capacity - reserved)
+    local rate = capacity / 60000
+    local state = redis.call("HMGET", KEYS[i], "tokens", "ts")
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) * rate)
+    levels[i] = tokens
+    if tokens - reserved < cost then
+        wait = math.max(wait, math.ceil((cost + reserved - tokens) / rate))
+    end
+end
+if wait > 0 then
+    return wait
+end
+for i = 1, 2 do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local cost = math.min(tonumber(ARGV[2 * i]), capacity * (1 - reserved_share))
+    redis.call("HSET", KEYS[i], "tokens", tostring(levels[i] - cost), "ts", now)
+    redis.call("PEXPIRE", KEYS[i], 120000)
+end
+return 0
+"""
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    tokens: int = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class LLMSchedulerService:
+    """
+    Admits LLM calls under distributed requests-per-minute and
+    tokens-per-minute budgets, highest priority first.
+
+    The buckets live in Redis so every worker shares the provider quota, and
+    priority is enforced there too: background calls are only admitted while
+    the buckets hold more than `interactive_reserved_share` of their
+    capacity, so a fleet of refresh workers cannot drain the quota that
+    summary views need. Within a process, waiting calls are kept in a
+    priority queue and only the head of the queue polls the buckets.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        name: str = "default",
+        requests_per_minute: int = settings.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = settings.LLM_TOKENS_PER_MINUTE,
+        interactive_reserved_share: float = settings.LLM_INTERACTIVE_RESERVED_SHARE,
+    ):
+        self.redis = redis
+        self.keys = [f"llm-rate:{name}:requests", f"llm-rate:{name}:tokens"]
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.interactive_reserved_share = interactive_reserved_share
+
+        self._queue: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+        self._arrived = asyncio.Event()
+        self._admitted = dict.fromkeys(LLMPriority, 0)
+        self._wait_seconds = {p: deque(maxlen=500) for p in LLMPriority}
+
+    async def acquire(self, tokens: int, priority: LLMPriority) -> float:
+        """
+        Waits until the call may run and returns the time spent waiting.
+        """
+        waiter = _Waiter(
+            priority=int(priority),
+            seq=next(self._seq),
+            tokens=tokens,
+            enqueued_at=time.monotonic(),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._queue, waiter)
+        self._arrived.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+            raise
+
+        waited = time.monotonic() - waiter.enqueued_at
+        priority = LLMPriority(waiter.priority)
+        self._admitted[priority] += 1
+        self._wait_seconds[priority].append(waited)
+        return waited
+
+    async def _dispatch(self) -> None:
+        while self._queue:
+            head = self._queue[0]
+            try:
+                wait_ms = await self.redis.eval(
+                    TOKEN_BUCKET_SCRIPT,
+                    2,
+                    *self.keys,
+                    self.requests_per_minute,
+                    1,
+                    self.tokens_per_minute,
+                    head.tokens,
+                    self._reserved_share(LLMPriority(head.priority)),
+                )
+            except Exception as e:
+                # Never block LLM calls on a Redis outage
+                logger.warning(f"LLM rate limiter unavailable, admitting call: {e}")
+                wait_ms = 0
+
+            if wait_ms:
+                # A new arrival may outrank the head (e.g. an interactive
+                # call behind a background one held back by the reserve)
+                self._arrived.clear()
+                try:
+                    await asyncio.wait_for(self._arrived.wait(), wait_ms / 1000)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            # The head may have been cancelled while we were in Redis
+            if self._queue and self._queue[0] is head:
+                heapq.heappop(self._queue)
+                if not head.future.done():
+                    head.future.set_result(None)
+
+    def _reserved_share(self, priority: LLMPriority) -> float:
+        """Share of each bucket a call of `priority` must leave untouched."""
+        if priority == LLMPriority.INTERACTIVE:
+            return 0
+        return self.interactive_reserved_share
+
+    def metrics(self) -> dict:
+        metrics = {}
+        for priority in LLMPriority:
+            waits = sorted(self._wait_seconds[priority])
+            metrics[priority.name.lower()] = {
+                "queue_depth": sum(1 for w in self._queue if w.priority == priority),
+                "admitted": self._admitted[priority],
+                "wait_seconds_avg": sum(waits) / len(waits) if waits else 0.0,
+                "wait_seconds_p95": waits[int(len(waits) * 0.95)] if waits else 0.0,
+                "wait_seconds_max": waits[-1] if waits else 0.0,
+            }
+        return metrics
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import uuid
+from datetime import date, datetime, timezone
+
+from redis.asyncio import Redis
+
+from app import crud
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal
+from app.models import LlmUsage
+from app.schema.llm_usage import LLMUsage, LLMUsageTotals
+
+logger = logging.getLogger(__name__)
+
+
+class LLMUsageService:
+    """
+    Accounts tokens, latency and cost of every provider call.
+
+    Calls are added to per-firm daily counters in Redis (with a per-client
+    cost ranking), and to the `llm_usage` table when `use_postgres`. Calls
+    without a client or firm, e.g. ad hoc scripts, are only counted in Redis
+    under "unattributed".
+
+    `record` only buffers the call, so accounting never adds latency to, or
+    fails, the LLM call it describes. A background task writes the buffer
+    every `flush_seconds` (sooner once `flush_batch` calls are waiting): one
+    Redis pipeline and one Postgres upsert per (firm, client, model).
+    `close` writes what is left.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        use_postgres: bool = settings.LLM_USAGE_POSTGRES_ENABLED,
+        retention_days: int = settings.LLM_USAGE_REDIS_RETENTION_DAYS,
+        flush_seconds: float = settings.LLM_USAGE_FLUSH_SECONDS,
+        flush_batch: int = settings.LLM_USAGE_FLUSH_BATCH,
+    ):
+        self.redis = redis
+        self.use_postgres = use_postgres
+        self.retention_seconds = retention_days * 24 * 3600
+        self.flush_seconds = flush_seconds
+        self.flush_batch = flush_batch
+
+        self._pending: list[tuple[LLMUsage, float]] = []
+        self._full = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+
+    def cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        input_price, output_price = settings.LLM_PRICES_PER_MILLION_TOKENS.get(
+            model, (0.0, 0.0)
+        )
+        return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+    def record(self, usage: LLMUsage) -> None:
+        cost = self.cost(usage.model, usage.input_tokens, usage.output_tokens)
+        logger.info(
+            f"LLM call {usage.model}: {usage.input_tokens} in / {usage.output_tokens} out "
+            f"tokens, {usage.latency_seconds:.2f}s, ${cost:.6f} "
+            f"(client {usage.client_id}, firm {usage.firm_id})"
+        )
+        self._pending.append((usage, cost))
+        if len(self._pending) >= self.flush_batch:
+            self._full.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def flush(self) -> None:
+        """Writes the buffered calls."""
+        pending, self._pending = self._pending, []
+        self._full.clear()
+        if not pending:
+            return
+        try:
+            await self._record_redis(pending)
+            if self.use_postgres:
+                await self._record_postgres(
+                    [(u, c) for u, c in pending if u.firm_id and u.client_id]
+                )
+        except Exception as e:
+            logger.warning(f"Failed to record usage of {len(pending)} LLM calls: {e}")
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def firm_today(self, firm_id: uuid.UUID) -> LLMUsageTotals:
+        counters = await self.redis.hgetall(self._firm_key(self.today(), firm_id))
+        return LLMUsageTotals.model_validate(
+            {k.decode(): v.decode() for k, v in counters.items()}
+        )
+
+    async def _record_redis(self, pending: list[tuple[LLMUsage, float]]) -> None:
+        day = self.today()
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for usage, cost in pending:
+                firm_key = self._firm_key(day, usage.firm_id)
+                pipe.hincrby(firm_key, "calls", 1)
+                pipe.hincrby(firm_key, "input_tokens", usage.input_tokens)
+                pipe.hincrby(firm_key, "output_tokens", usage.output_tokens)
+                pipe.hincrbyfloat(firm_key, "cost_usd", cost)
+                pipe.hincrbyfloat(firm_key, "latency_seconds", usage.latency_seconds)
+                if usage.time_to_first_token_seconds is not None:
+                    pipe.hincrby(firm_key, "streamed_calls", 1)
+                    pipe.hincrbyfloat(
+                        firm_key,
+                        "time_to_first_token_seconds",
+                        usage.time_to_first_token_seconds,
+                    )
+                pipe.expire(firm_key, self.retention_seconds)
+                if usage.client_id:
+                    clients_key = f"{firm_key}:clients"
+                    pipe.zincrby(clients_key, cost, str(usage.client_id))
+                    pipe.expire(clients_key, self.retention_seconds)
+            await pipe.execute()
+
+    async def _record_postgres(self, pending: list[tuple[LLMUsage, float]]) -> None:
+        day = self.today()
+        rows: dict[tuple, LlmUsage] = {}
+        for usage, cost in pending:
+            key = (usage.firm_id, usage.client_id, usage.model)
+            row = rows.setdefault(
+                key,
+                LlmUsage(
+                    firm_id=usage.firm_id,
+                    day=day,
+                    client_id=usage.client_id,
+                    model=usage.model,
+                    calls=0,
+                    streamed_calls=0,
+                    input_tokens=0,
+                    output_tokens=0,
+                    cost_usd=0.0,
+                    latency_seconds=0.0,
+                    time_to_first_token_seconds=0.0,
+                ),
+            )
+            row.calls += 1
+            row.streamed_calls += int(usage.time_to_first_token_seconds is not None)
+            row.input_tokens += usage.input_tokens
+            row.output_tokens += usage.output_tokens
+            row.cost_usd += cost
+            row.latency_seconds += usage.latency_seconds
+            row.time_to_first_token_seconds += usage.time_to_first_token_seconds or 0.0
+        if not rows:
+            return
+        async with AsyncSessionLocal() as session:
+            for row in rows.values():
+                await crud.llm_usage.increment(session, usage=row)
+
+    def today(self) -> date:
+        return datetime.now(timezone.utc).date()
+
+    def _firm_key(self, day: date, firm_id: uuid.UUID | None) -> str:
+        return f"llm-usage:{day.isoformat()}:firm:{firm_id or 'unattributed'}"
@@ -0,0 +1,193 @@
+import logging
+import random
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.models import Client
+
+logger = logging.getLogger(__name__)
+
+STAFF = ["anna", "ben", "chloe", "dev", "emma", "farid"]
+THIRD_PARTIES = ["billing@vendor.com", "auditor@irs-proxy.com", "payroll@adp-clone.com"]
+TOPICS = [
+    ("Invoice #{n} payment reminder", "invoice #{n}", "arrange payment by Friday"),
+    ("Q{q} financial report", "the Q{q} report", "review the figures and send feedback"),
+    ("Tax audit preparation", "the audit file", "send the last three bank statements"),
+    ("Payroll run for {month}", "the {month} payroll", "confirm the new hires before Tuesday"),
+    ("Bank reconciliation discrepancy", "the reconciliation", "check the missing {amount} transfer"),
+    ("VAT return {month}", "the VAT return", "approve the draft so we can file it"),
+    ("Expense claims {month}", "the expense claims", "upload the missing receipts"),
+]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December"]
+OPENERS = ["Hi,", "Hello,", "Dear team,", "Good morning,"]
+UPDATES = [
+    "Thanks for the update on {thing}.",
+    "We have gone through {thing} and it mostly looks fine.",
+    "Following up on {thing} from last week.",
+    "Quick note regarding {thing}.",
+]
+REQUESTS = ["Could you please {action}?", "Can you {action}?", "We need you to {action}.", "Please {action}."]
+CLOSINGS = ["Thanks.", "Best regards.", "Kind regards.", "Cheers."]
+
+
+@dataclass
+class CorpusSpec:
+    clients: int = 100
+    emails_per_client: int = 200
+    # Messages per thread are drawn from 1..thread_depth
+    thread_depth: int = 6
+    # Replies quote the message they answer, like mail clients do
+    quote_replies: bool = True
+    # Threads start anywhere in the `days` before `end`
+    days: int = 365
+    seed: int = 0
+    end: datetime | None = None
+    domain: str = "corpus.example.com"
+
+    def __post_init__(self):
+        # Fix `end` for datasets that must be identical across days
+        if self.end is None:
+            self.end = datetime.now(timezone.utc).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+
+
+class MockCorpusService:
+    """
+    Generates a reproducible synthetic mailbox corpus and bulk-loads it into
+    `mockemail`, for benchmarking the pipeline at scale.
+
+    Every client gets `emails_per_client` emails in reply threads with the
+    firm's staff and third parties, spread over `days`. The same spec (and
+    `end`) always yields the same emails with the same ids, so loading it
+    twice inserts nothing new.
+    """
+
+    def __init__(self, session: AsyncSession, spec: CorpusSpec):
+        self.session = session
+        self.spec = spec
+
+    def client_email(self, index: int) -> str:
+        return f"client{index:05d}@{self.spec.domain}"
+
+    def client_id(self, index: int) -> uuid.UUID:
+        return uuid.uuid5(uuid.NAMESPACE_URL, f"corpus/{self.spec.seed}/client/{index}")
+
+    def client_emails(self, index: int) -> Iterator[dict]:
+        """The `mockemail` rows of one client, thread by thread."""
+        spec = self.spec
+        rng = random.Random(f"{spec.seed}/{index}")
+        client = self.client_email(index)
+        window = timedelta(days=spec.days).total_seconds()
+        count = 0
+        while count < spec.emails_per_client:
+            depth = min(rng.randint(1, spec.thread_depth), spec.emails_per_client - count)
+            title, thing, action = rng.choice(TOPICS)
+            values = {
+                "n": rng.randint(1000, 9999),
+                "q": rng.randint(1, 4),
+                "month": rng.choice(MONTHS),
+                "amount": f"${rng.randint(100, 99_999):,}",
+            }
+            subject = title.format(**values)
+            thing, action = thing.format(**values), action.format(**values)
+            other = rng.choice(
+                [f"{rng.choice(STAFF)}@firm.{spec.domain}"] * 3 + THIRD_PARTIES
+            )
+            sender, recipient = (client, other) if rng.random() < 0.5 else (other, client)
+            received_at = spec.end - timedelta(seconds=rng.uniform(0, window))
+            previous = None
+            for position in range(depth):
+                body = " ".join(
+                    [
+                        rng.choice(OPENERS),
+                        rng.choice(UPDATES).format(thing=thing),
+                        rng.choice(REQUESTS).format(action=action),
+                        rng.choice(CLOSINGS),
+                    ]
+                )
+                if previous and spec.quote_replies:
+                    quoted = "\n".join(f"> {line}" for line in previous["body"].splitlines())
+                    body += (
+                        f"\n\nOn {previous['received_at']:%a, %d %b %Y %H:%M}, "
+                        f"{previous['sender']} wrote:\n{quoted}"
+                    )
+                row = {
+                    "id": str(
+                        uuid.uuid5(uuid.NAMESPACE_URL, f"corpus/{spec.seed}/{index}/{count}")
+                    ),
+                    "subject": subject if position == 0 else f"Re: {subject}",
+                    "sender": sender,
+                    "recipient": recipient,
+                    "body": body,
+                    "received_at": received_at,
+                    "is_read": rng.random() < 0.7,
+                }
+                yield row
+                previous = row
+                count += 1
+                sender, recipient = recipient, sender
+                received_at += timedelta(hours=rng.expovariate(1 / 6))
+
+    async def load(
+        self, firm_id: uuid.UUID | None = None, batch_size: int = 5_000, replace: bool = False
+    ) -> int:
+        """
+        Inserts the corpus, committing every `batch_size` rows, and returns
+        the number of emails generated. With `firm_id` a `Client` is created
+        for every corpus mailbox, so the pipeline can summarize them.
+        """
+        clients = range(self.spec.clients)
+        for start in range(0, len(clients), 5_000):
+            chunk = clients[start : start + 5_000]
+            if firm_id is not None:
+                await self.session.execute(
+                    insert(Client)
+                    .values(
+                        [
+                            {
+                                "id": self.client_id(i),
+                                "firm_id": firm_id,
+                                "name": f"Corpus client {i}",
+                                "email": self.client_email(i),
+                                "is_active": True,
+                                "created_at": datetime.now(timezone.utc),
+                            }
+                            for i in chunk
+                        ]
+                    )
+                    .on_conflict_do_nothing()
+                )
+            if replace:
+                await crud.mock_email.remove_by_participants(
+                    self.session, addresses=[self.client_email(i) for i in chunk]
+                )
+        await self.session.commit()
+
+        total = 0
+        batch: list[dict] = []
+        for i in clients:
+            for row in self.client_emails(i):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    total += await self._flush(batch)
+            if (i + 1) % 100 == 0:
+                logger.info(f"{i + 1}/{self.spec.clients} mailboxes, {total + len(batch)} emails")
+        total += await self._flush(batch)
+        return total
+
+    async def _flush(self, batch: list[dict]) -> int:
+        # Seven columns per row; Postgres allows 65535 bind parameters
+        count = len(batch)
+        for start in range(0, count, 5_000):
+            await crud.mock_email.insert_many(self.session, rows=batch[start : start + 5_000])
+        await self.session.commit()
+        batch.clear()
+        return count
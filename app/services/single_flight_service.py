@@ -0,0 +1,187 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.llms.resilient_llm import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# Compare-and-delete so a leader never releases a lock that expired and was
+# taken over by another worker.
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Extends the lock only while this leader still holds it
+RENEW_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Leader failures re-raised as the same class on followers, so callers map
+# them to the same response (e.g. 503 while the LLM circuit is open)
+RELAYED_ERRORS: dict[str, type[Exception]] = {
+    e.__name__: e for e in (CircuitOpenError,)
+}
+
+
+class SingleFlightError(Exception):
+    """Raised on followers when the leader's call failed with an error not in `RELAYED_ERRORS`."""
+
+
+class SingleFlightService:
+    """
+    Collapses concurrent calls for the same key into a single execution.
+
+    Within a process, callers share one in-flight future. Across workers, a
+    Redis lock elects a leader, and followers wait for the leader's result on
+    a pub/sub channel instead of running the call themselves. The leader
+    renews the lock while it runs, so a slow call is never taken over by a
+    second leader. Results are tagged with the leader's lock token, so a
+    follower only ever takes the result of the flight it joined, never one
+    left over from an earlier one.
+    """
+
+    # Shared by every instance in the process
+    _inflight: dict[str, asyncio.Future] = {}
+
+    def __init__(
+        self,
+        redis: Redis,
+        lock_ttl: int = settings.SUMMARY_SINGLE_FLIGHT_LOCK_TTL_SECONDS,
+        result_ttl: int = settings.SUMMARY_SINGLE_FLIGHT_RESULT_TTL_SECONDS,
+    ):
+        self.redis = redis
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[dict]]) -> dict:
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        # Avoid "exception was never retrieved" when nobody else joined
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            result = await self._do_distributed(key, fn)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _do_distributed(
+        self, key: str, fn: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        lock_key = f"single-flight:lock:{key}"
+        result_prefix = f"single-flight:result:{key}"
+        channel = f"single-flight:channel:{key}"
+        token = uuid.uuid4().hex
+
+        while True:
+            if await self.redis.set(lock_key, token, nx=True, ex=self.lock_ttl):
+                return await self._lead(
+                    lock_key, f"{result_prefix}:{token}", channel, token, fn
+                )
+
+            result = await self._follow(lock_key, result_prefix, channel)
+            if result is not None:
+                return result
+            # The leader went away without publishing; try to take over
+            logger.warning(f"Single-flight leader for {key} vanished, retrying")
+
+    async def _lead(
+        self,
+        lock_key: str,
+        result_key: str,
+        channel: str,
+        token: str,
+        fn: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        async def renew() -> None:
+            while True:
+                await asyncio.sleep(self.lock_ttl / 3)
+                if not await self.redis.eval(
+                    RENEW_LOCK_SCRIPT, 1, lock_key, token, self.lock_ttl
+                ):
+                    logger.warning(f"Single-flight lock {lock_key} was lost")
+                    return
+
+        renewer = asyncio.create_task(renew())
+        try:
+            try:
+                result = await fn()
+            except Exception as exc:
+                await self._publish(
+                    result_key,
+                    channel,
+                    {"token": token, "error": str(exc), "type": type(exc).__name__},
+                )
+                raise
+            await self._publish(result_key, channel, {"token": token, "result": result})
+            return result
+        finally:
+            renewer.cancel()
+            await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+    async def _publish(self, result_key: str, channel: str, payload: dict) -> None:
+        # Stored too, for followers that subscribe after the publish
+        raw = json.dumps(payload)
+        await self.redis.set(result_key, raw, ex=self.result_ttl)
+        await self.redis.publish(channel, raw)
+
+    async def _follow(
+        self, lock_key: str, result_prefix: str, channel: str
+    ) -> dict | None:
+        """
+        Waits for the result of the leader currently holding the lock, for as
+        long as it keeps renewing it. Returns None if there is no leader, or
+        it released or lost the lock without publishing anything.
+        """
+        async with self.redis.pubsub() as pubsub:
+            await pubsub.subscribe(channel)
+            token = await self.redis.get(lock_key)
+            if token is None:
+                return None
+            token = token.decode() if isinstance(token, bytes) else token
+            while True:
+                # The leader may have finished before we subscribed
+                raw = await self.redis.get(f"{result_prefix}:{token}")
+                if raw is None:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    raw = message["data"] if message else None
+                payload = json.loads(raw) if raw is not None else None
+                if payload is not None and payload.get("token") == token:
+                    return self._result(payload)
+                if await self.redis.get(lock_key) not in (token, token.encode()):
+                    # Released or lost, unless the result is already stored
+                    raw = await self.redis.get(f"{result_prefix}:{token}")
+                    if raw is None:
+                        return None
+                    return self._result(json.loads(raw))
+
+    def _result(self, payload: dict) -> dict:
+        if "error" in payload:
+            error = RELAYED_ERRORS.get(payload.get("type"), SingleFlightError)
+            raise error(payload["error"])
+        return payload["result"]
@@ -1,27 +1,93 @@
-import hashlib
+import asyncio
 import json
+import logging
 import uuid
-from collections.abc import Sequence
-from datetime import date, datetime, timedelta, timezone
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import pytz
 from google import genai
 from google.genai import types
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import crud
-from app.constants import DATE_PROMPT, PROMPT
+from app.constants import DATE_PROMPT, DELTA_PROMPT, PROMPT, REDUCE_PROMPT
 from app.core.config import settings
-from app.llms.google_llm import GoogleLLM
+from app.llms.base_llm import BaseLLM
+from app.llms.context import llm_client_id, llm_firm_id
+from app.llms.registry import llm_registry
+from app.llms.resilient_llm import CircuitOpenError
+from app.llms.router import LLMRoute, LLMRouter
+from app.llms.summary_stream_parser import SummaryStreamParser
 from app.models import MockEmail as Email
 from app.models.email_summary import (
+    EmailSummary,
     EmailSummaryCreate,
     EmailSummaryUpdate,
 )
+from app.models.thread_summary import ThreadSummary
 from app.providers.email import IEmailProvider
-from app.schema.summary import EmailThreadSummary
-from app.utils import ensure_aware
+from app.schema.summary import Actor, EmailThreadSummary, OpenItem
+from app.services.email_dedup_service import EmailDedupService
+from app.services.email_fingerprint_service import EmailFingerprintService, MailboxDiff
+from app.services.email_store_service import email_window_start
+from app.services.email_thread_service import (
+    EmailThread,
+    EmailThreadService,
+    merge_thread_summaries,
+)
+from app.utils import ensure_aware, estimate_tokens, json_repair_candidates
+
+logger = logging.getLogger(__name__)
+
+
+# The schema never changes at runtime, so this part of the prompt and its
+# validator are built once
+SYSTEM_PROMPT = PROMPT.format(EmailThreadSummary.model_json_schema())
+SUMMARY_ADAPTER = TypeAdapter(EmailThreadSummary)
+
+EMPTY_SUMMARY = {
+    "actors": [],
+    "concluded": [],
+    "open_items": [],
+}
+
+
+@dataclass
+class Mailbox:
+    """
+    One scan of a client's mailbox: every email's fingerprint, the prompt
+    size and the conversation threads, but not the emails. `emails()`
+    streams them again, oldest first, for the passes that build prompts.
+    """
+
+    emails: Callable[[], AsyncIterator[Email]]
+    fingerprints: dict[str, str]
+    tokens: int
+    threads: list[EmailThread] = field(default_factory=list)
+
+
+def summary_stale_after() -> timedelta:
+    """Age at which a stored summary is regenerated on read and pre-warmed."""
+    if settings.SUMMARY_CHANGE_NOTIFICATIONS_ENABLED:
+        return timedelta(hours=settings.SUMMARY_SAFETY_SWEEP_HOURS)
+    return timedelta(minutes=settings.SUMMARY_STALE_AFTER_MINUTES)
+
+
+def summary_flight_key(client_id: uuid.UUID, force_refresh: bool = False) -> str:
+    """
+    Single-flight key for generating a client's summary. Forced refreshes
+    get their own, so they never settle for a non-forced flight's result.
+    """
+    return f"summary:{client_id}:force" if force_refresh else f"summary:{client_id}"
+
+
+async def _iterate(emails: Sequence[Email]) -> AsyncIterator[Email]:
+    for email in emails:
+        yield email
 
 
 class SummarizationService:
@@ -30,16 +96,22 @@ class SummarizationService:
     calling the summarization model, and caching the results.
     """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, llm: BaseLLM | None = None):
         self.session = session
-        self.llm = GoogleLLM()
+        self.fingerprints = EmailFingerprintService(session)
+        self.llm = llm or llm_registry.get()
+        # Keep latency stats process-wide unless a custom LLM is injected
+        self.router = LLMRouter(llm) if llm else llm_registry.get_router()
 
     async def get_stored_summary(
-        self, client_id: uuid.UUID, stale_after: timedelta = timedelta(hours=1)
+        self,
+        client_id: uuid.UUID,
+        stale_after: timedelta | None = None,
     ) -> dict[str, Any] | None:
         """
         Retrieves a summary from the database if it's not stale.
         """
+        stale_after = stale_after or summary_stale_after()
         summary = await crud.email_summary.get_by_client(
             session=self.session, client_id=client_id
         )
@@ -55,51 +127,293 @@ class SummarizationService:
         client_id: uuid.UUID,
         email_provider: IEmailProvider,
         force_refresh: bool = False,
+        mailbox: Mailbox | None = None,
     ) -> dict:
         """
         Fetches emails, generates a new summary, and stores it in the DB.
         - `force_refresh` will ignore any existing content hash checks.
+        - `mailbox` skips the scan when the caller already did `load_mailbox`.
+        """
+        if mailbox is None:
+            mailbox = await self.load_mailbox(client_id, email_provider)
+        existing_summary = await crud.email_summary.get_by_client(
+            session=self.session, client_id=client_id
+        )
+
+        # If the content hasn't changed and we're not forcing a refresh,
+        # just touch the updated_at timestamp and return the existing summary.
+        if not force_refresh and self.unchanged(existing_summary, mailbox):
+            return await self._touch_summary(existing_summary)
+
+        # Otherwise, generate a new summary
+        diff = await self.fingerprints.diff(client_id, mailbox.fingerprints)
+        failed: set[str] = set()
+        if mailbox.fingerprints and settings.SUMMARY_THREADING_ENABLED:
+            try:
+                new_summary_data = await self._summarize_threads(
+                    client_id, mailbox, failed, force_refresh
+                )
+            except CircuitOpenError:
+                return self._last_known_summary(existing_summary)
+        elif mailbox.fingerprints:
+            try:
+                # Map-reduce and multi-chunk delta prompts call the LLM too
+                route, messages = await self._summary_messages(
+                    existing_summary, diff, mailbox, force_refresh
+                )
+                response = await self.router.generate(
+                    route, messages, json_resp=True, response_schema=EmailThreadSummary
+                )
+            except CircuitOpenError:
+                return self._last_known_summary(existing_summary)
+            new_summary_data = self._safe_parse(response)
+        else:
+            new_summary_data = dict(EMPTY_SUMMARY)
+        return await self._store_summary(
+            client_id, existing_summary, new_summary_data, diff, complete=not failed
+        )
+
+    async def stream_summary(
+        self,
+        client_id: uuid.UUID,
+        email_provider: IEmailProvider,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Same as `get_stored_summary` falling back to `process_and_store_summary`,
+        but yields events while the LLM generates: `("delta", text)` for the
+        raw output, plus `("actor", dict)` and `("open_item", dict)` as soon as
+        each item is complete. Ends with a `("summary", dict)` event once the
+        summary is stored.
+
+        With threading, the changed threads are generated concurrently, so
+        each `delta` carries `{"thread_id", "text"}` instead of bare text.
+        Actors and open items of cached threads are yielded as they load,
+        and each actor is yielded once across threads.
+        """
+        stored = await self.get_stored_summary(client_id)
+        if stored:
+            yield "summary", stored
+            return
+
+        mailbox = await self.load_mailbox(client_id, email_provider)
+        existing_summary = await crud.email_summary.get_by_client(
+            session=self.session, client_id=client_id
+        )
+        if self.unchanged(existing_summary, mailbox):
+            yield "summary", await self._touch_summary(existing_summary)
+            return
+
+        diff = await self.fingerprints.diff(client_id, mailbox.fingerprints)
+        failed: set[str] = set()
+        if mailbox.fingerprints and settings.SUMMARY_THREADING_ENABLED:
+            summaries: dict[str, EmailThreadSummary] = {}
+            actors: set[str] = set()
+            events: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+            parsers: dict[str, SummaryStreamParser] = {}
+
+            def put_items(items: Sequence[Actor | OpenItem]) -> None:
+                for item in items:
+                    event = "actor" if isinstance(item, Actor) else "open_item"
+                    events.put_nowait((event, item))
+
+            def on_chunk(thread: EmailThread, chunk: str) -> None:
+                events.put_nowait(("delta", {"thread_id": thread.id, "text": chunk}))
+                put_items(parsers.setdefault(thread.id, SummaryStreamParser()).feed(chunk))
+
+            async def summarize() -> None:
+                async for thread, summary in self._iter_thread_summaries(
+                    client_id, mailbox, failed, on_chunk=on_chunk
+                ):
+                    summaries[thread.id] = summary
+                    # Streamed threads had their items yielded as they completed
+                    if thread.id not in parsers:
+                        put_items([*summary.actors, *summary.open_items])
+
+            task = asyncio.ensure_future(summarize())
+            try:
+                while not task.done() or not events.empty():
+                    next_event = asyncio.ensure_future(events.get())
+                    await asyncio.wait({next_event, task}, return_when=asyncio.FIRST_COMPLETED)
+                    if not next_event.done():
+                        next_event.cancel()
+                        continue
+                    event, data = next_event.result()
+                    if event == "actor":
+                        key = data.identifier.strip().lower()
+                        if key in actors:
+                            continue
+                        actors.add(key)
+                    if event != "delta":
+                        data = data.model_dump(mode="json")
+                    yield event, data
+                task.result()
+            except CircuitOpenError:
+                yield "summary", self._last_known_summary(existing_summary)
+                return
+            finally:
+                task.cancel()
+            new_summary_data = merge_thread_summaries(
+                [summaries[t.id] for t in mailbox.threads]
+            ).model_dump(mode="json")
+        elif mailbox.fingerprints:
+            parser = SummaryStreamParser()
+            try:
+                route, messages = await self._summary_messages(existing_summary, diff, mailbox)
+                async for chunk in self.router.generate_stream(
+                    route, messages, response_schema=EmailThreadSummary
+                ):
+                    yield "delta", chunk
+                    for item in parser.feed(chunk):
+                        event = "actor" if isinstance(item, Actor) else "open_item"
+                        yield event, item.model_dump(mode="json")
+            except CircuitOpenError:
+                # Raised before the first chunk, so nothing was streamed yet
+                yield "summary", self._last_known_summary(existing_summary)
+                return
+            new_summary_data = self._safe_parse(parser.buffer)
+        else:
+            new_summary_data = dict(EMPTY_SUMMARY)
+        yield "summary", await self._store_summary(
+            client_id, existing_summary, new_summary_data, diff, complete=not failed
+        )
+
+    async def summarize_emails(
+        self,
+        emails: Sequence[Email],
+    ) -> dict:
+        if not emails:
+            return dict(EMPTY_SUMMARY)
+
+        ordered = sorted(emails, key=lambda e: ensure_aware(e.received_at))
+        dedup = EmailDedupService()
+        route, messages = await self._full_messages(
+            await self._scan(lambda: dedup.unique(_iterate(ordered)))
+        )
+        response = await self.router.generate(
+            route, messages, json_resp=True, response_schema=EmailThreadSummary
+        )
+        return self._safe_parse(response)
+
+    async def summarize_delta(
+        self,
+        previous_summary: dict,
+        new_emails: Sequence[Email],
+    ) -> dict:
+        """
+        Folds `new_emails` into `previous_summary` without resending the
+        emails the previous summary was built from.
+        """
+        route, messages = await self._delta_messages(previous_summary, new_emails)
+        response = await self.router.generate(
+            route, messages, json_resp=True, response_schema=EmailThreadSummary
+        )
+        return self._safe_parse(response)
+
+    async def load_mailbox(
+        self, client_id: uuid.UUID, email_provider: IEmailProvider
+    ) -> Mailbox:
+        """
+        Syncs and scans the client's mailbox. Emails are streamed from the
+        provider, so only their fingerprints are kept, never the mailbox.
+        Duplicate copies of a message are left out of every pass.
         """
         client = await crud.client.get(session=self.session, id=client_id)
         if not client:
             # This should ideally not be reached if called from a route
             # that already validates the client
             raise ValueError("Invalid client_id")
+        # Attribute the LLM calls that follow to this client
+        llm_client_id.set(client.id)
+        llm_firm_id.set(client.firm_id)
 
-        emails = await email_provider.fetch_client_emails(
-            client_email=client.email, session=self.session
+        since = email_window_start(self.now())
+        dedup = EmailDedupService(self.session, client.id)
+        if settings.SUMMARY_DEDUP_ENABLED:
+            await dedup.load()
+        passes = 0
+
+        def emails() -> AsyncIterator[Email]:
+            nonlocal passes
+            passes += 1
+            # Only the first pass pulls from upstream; later ones re-read it
+            stream = email_provider.iter_client_emails(
+                client_email=client.email,
+                session=self.session,
+                client_id=client.id,
+                since=since,
+                refresh=passes == 1,
+            )
+            return dedup.unique(stream) if settings.SUMMARY_DEDUP_ENABLED else stream
+
+        mailbox = await self._scan(emails)
+        if settings.SUMMARY_DEDUP_ENABLED:
+            # Committed with the summary write that follows
+            await dedup.stage()
+        return mailbox
+
+    async def _scan(self, emails: Callable[[], AsyncIterator[Email]]) -> Mailbox:
+        fingerprints: dict[str, str] = {}
+        tokens = 0
+        threads = EmailThreadService(self.fingerprints)
+        async for e in emails():
+            fingerprint = self.fingerprints.fingerprint(e)
+            email_tokens = estimate_tokens(self._email_text([e]))
+            fingerprints[str(e.id)] = fingerprint
+            tokens += email_tokens
+            threads.add(e, fingerprint, email_tokens)
+        return Mailbox(
+            emails=emails,
+            fingerprints=fingerprints,
+            tokens=tokens,
+            threads=threads.threads(),
         )
-        new_hash = self.hash_emails(emails)
 
-        existing_summary = await crud.email_summary.get_by_client(
-            session=self.session, client_id=client_id
+    def unchanged(self, existing_summary: EmailSummary | None, mailbox: Mailbox) -> bool:
+        return bool(existing_summary) and existing_summary.summary_hash == (
+            self.fingerprints.digest(mailbox.fingerprints.values())
         )
 
-        # If the content hasn't changed and we're not forcing a refresh,
-        # just touch the updated_at timestamp and return the existing summary.
-        if (
-            not force_refresh
-            and existing_summary
-            and existing_summary.summary_hash == new_hash
-        ):
-            summary_to_update = EmailSummaryUpdate(last_refreshed=self.now())
-            await crud.email_summary.update(
-                session=self.session,
-                db_obj=existing_summary,
-                obj_in=summary_to_update,
-            )
-            return json.loads(existing_summary.encrypted_summary)
+    def _last_known_summary(self, existing_summary: EmailSummary | None) -> dict:
+        """
+        The stored summary, however stale, for when the LLM is unavailable.
+        """
+        if existing_summary is None:
+            raise CircuitOpenError("LLM unavailable and no stored summary to serve")
+        return json.loads(existing_summary.encrypted_summary)
 
-        # Otherwise, generate a new summary
-        new_summary_data = await self.summarize_emails(emails)
+    async def _touch_summary(self, existing_summary: EmailSummary) -> dict:
+        summary_to_update = EmailSummaryUpdate(last_refreshed=self.now())
+        await crud.email_summary.update(
+            session=self.session,
+            db_obj=existing_summary,
+            obj_in=summary_to_update,
+        )
+        return json.loads(existing_summary.encrypted_summary)
+
+    async def _store_summary(
+        self,
+        client_id: uuid.UUID,
+        existing_summary: EmailSummary | None,
+        new_summary_data: dict,
+        diff: MailboxDiff,
+        complete: bool = True,
+    ) -> dict:
+        """
+        An incomplete summary (some threads failed to summarize) is stored
+        without the mailbox digest, so the next refresh retries those threads
+        instead of finding the mailbox unchanged.
+        """
         new_summary_json = json.dumps(new_summary_data)
+        summary_hash = diff.digest if complete else ""
+        # Committed together with the summary below
+        await self.fingerprints.stage(client_id, diff)
 
         if existing_summary:
             summary_to_update = EmailSummaryUpdate(
                 encrypted_summary=new_summary_json,
-                summary_hash=new_hash,
+                summary_hash=summary_hash,
                 last_refreshed=self.now(),
-                email_count=len(emails),
+                email_count=len(diff.fingerprints),
             )
             updated_summary = await crud.email_summary.update(
                 session=self.session,
@@ -113,42 +427,339 @@ class SummarizationService:
             client_id=client_id,
             last_refreshed=self.now(),
             encrypted_summary=new_summary_json,
-            summary_hash=new_hash,
-            email_count=len(emails),
+            summary_hash=summary_hash,
+            email_count=len(diff.fingerprints),
         )
         new_summary = await crud.email_summary.create(
             session=self.session, obj_in=summary_to_create
         )
         return json.loads(new_summary.encrypted_summary)
 
-    async def summarize_emails(
+    async def _summary_messages(
         self,
-        emails: Sequence[Email],
+        existing_summary: EmailSummary | None,
+        diff: MailboxDiff,
+        mailbox: Mailbox,
+        force_refresh: bool = False,
+    ) -> tuple[LLMRoute, list[dict]]:
+        """
+        Route and messages for the final LLM call. When the stored summary
+        already covers every email still in the mailbox, only the new emails
+        are sent along with the previous summary.
+        """
+        new_ids = None if force_refresh else self._new_email_ids(existing_summary, diff)
+        if new_ids is not None:
+            new_ids = set(new_ids)
+            new_emails = [e async for e in mailbox.emails() if str(e.id) in new_ids]
+            return await self._delta_messages(
+                json.loads(existing_summary.encrypted_summary), new_emails
+            )
+        return await self._full_messages(mailbox)
+
+    async def _summarize_threads(
+        self,
+        client_id: uuid.UUID,
+        mailbox: Mailbox,
+        failed: set[str],
+        force_refresh: bool = False,
     ) -> dict:
-        if not emails:
-            return {
-                "actors": [],
-                "concluded": [],
-                "open_items": [],
-            }
+        summaries: dict[str, EmailThreadSummary] = {}
+        async for thread, summary in self._iter_thread_summaries(
+            client_id, mailbox, failed, force_refresh
+        ):
+            summaries[thread.id] = summary
+        return merge_thread_summaries(
+            [summaries[t.id] for t in mailbox.threads]
+        ).model_dump(mode="json")
 
-        email_text = "\n\n".join(
-            f"From: {e.sender}\nTo: {e.recipient}\n{e.body}" for e in emails
+    async def _iter_thread_summaries(
+        self,
+        client_id: uuid.UUID,
+        mailbox: Mailbox,
+        failed: set[str],
+        force_refresh: bool = False,
+        on_chunk: Callable[[EmailThread, str], None] | None = None,
+    ) -> AsyncIterator[tuple[EmailThread, EmailThreadSummary]]:
+        """
+        Summary of every thread in the mailbox: cached ones first, then the
+        threads whose emails changed, as the LLM finishes them. Each new
+        thread summary is staged as it arrives, and those of vanished threads
+        dropped, for the summary write that follows to commit.
+
+        A thread the LLM fails on gets an empty summary and its id is added
+        to `failed`; the refresh only fails when every changed thread did.
+        With `on_chunk`, changed threads are streamed through it.
+        """
+        cached = await crud.thread_summary.get_by_client(self.session, client_id=client_id)
+        changed: dict[str, EmailThread] = {}
+        for thread in mailbox.threads:
+            if thread.fingerprint in cached and not force_refresh:
+                yield thread, SUMMARY_ADAPTER.validate_json(cached[thread.fingerprint])
+            else:
+                changed[thread.id] = thread
+        logger.info(
+            f"Summarizing {len(changed)} of {len(mailbox.threads)} threads for client {client_id}"
         )
-        prompt = f"{PROMPT.format(EmailThreadSummary.model_json_schema())}\n{DATE_PROMPT.format(date.today(), datetime.now().strftime('%H:%M:%S'), pytz.timezone('UTC'))}"
-        messages = [{'role':'system','content':prompt},
-                    {'role':'user','content':f'Summarize this email thread \n{email_text}.'}]
 
-        return self._safe_parse(await self.llm.generate(messages,json_resp=True))
+        error: Exception | None = None
+        try:
+            async for thread, summary in self._map_threads(mailbox, changed, on_chunk):
+                if isinstance(summary, Exception):
+                    logger.warning(
+                        f"Summarizing thread {thread.id} for client {client_id} failed: {summary}"
+                    )
+                    failed.add(thread.id)
+                    error = summary
+                    summary = EmailThreadSummary(actors=[], concluded=False, open_items=[])
+                else:
+                    await crud.thread_summary.stage_changes(
+                        self.session,
+                        client_id=client_id,
+                        upserts=[
+                            ThreadSummary(
+                                client_id=client_id,
+                                fingerprint=thread.fingerprint,
+                                summary=summary.model_dump_json(),
+                                email_count=len(thread.email_ids),
+                            )
+                        ],
+                        removed=[],
+                    )
+                yield thread, summary
+        except CircuitOpenError:
+            # Keep the threads already summarized for the next attempt
+            await self.session.commit()
+            raise
+        if error is not None and len(failed) == len(changed):
+            raise error
+
+        current = {t.fingerprint for t in mailbox.threads}
+        await crud.thread_summary.stage_changes(
+            self.session,
+            client_id=client_id,
+            upserts=[],
+            removed=[f for f in cached if f not in current],
+        )
+
+    async def _map_threads(
+        self,
+        mailbox: Mailbox,
+        threads: dict[str, EmailThread],
+        on_chunk: Callable[[EmailThread, str], None] | None = None,
+    ) -> AsyncIterator[tuple[EmailThread, EmailThreadSummary | Exception]]:
+        """
+        Streams the mailbox once, starting a summary for each of `threads`
+        (keyed by id) as soon as its last email has been read, bounded by
+        `SUMMARY_CHUNK_CONCURRENCY`. Only the emails of threads still being
+        read are held in memory. A thread that fails is yielded with its
+        error, except for `CircuitOpenError`, which is raised. With
+        `on_chunk`, each thread is streamed and its chunks passed to it.
+        """
+        thread_of = {i: thread.id for thread in threads.values() for i in thread.email_ids}
+        semaphore = asyncio.Semaphore(settings.SUMMARY_CHUNK_CONCURRENCY)
+
+        async def summarize_thread(
+            thread: EmailThread, emails: list[Email]
+        ) -> tuple[EmailThread, EmailThreadSummary | Exception]:
+            try:
+                route, messages = await self._full_messages(
+                    await self._scan(lambda: _iterate(emails))
+                )
+                if on_chunk is None:
+                    response = await self.router.generate(
+                        route, messages, json_resp=True, response_schema=EmailThreadSummary
+                    )
+                else:
+                    chunks: list[str] = []
+                    async for chunk in self.router.generate_stream(
+                        route, messages, response_schema=EmailThreadSummary
+                    ):
+                        chunks.append(chunk)
+                        on_chunk(thread, chunk)
+                    response = "".join(chunks)
+                return thread, self._parse_summary(response)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                return thread, e
+            finally:
+                semaphore.release()
+
+        reading: dict[str, list[Email]] = {}
+        tasks: list[asyncio.Task] = []
+        try:
+            async for e in mailbox.emails():
+                thread_id = thread_of.get(str(e.id))
+                if thread_id is None:
+                    continue
+                emails = reading.setdefault(thread_id, [])
+                emails.append(e)
+                if len(emails) == len(threads[thread_id].email_ids):
+                    await semaphore.acquire()
+                    emails = reading.pop(thread_id)
+                    tasks.append(
+                        asyncio.ensure_future(summarize_thread(threads[thread_id], emails))
+                    )
+            # Emails that vanished since the scan leave threads incomplete
+            for thread_id, emails in reading.items():
+                await semaphore.acquire()
+                tasks.append(asyncio.ensure_future(summarize_thread(threads[thread_id], emails)))
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _full_messages(self, mailbox: Mailbox) -> tuple[LLMRoute, list[dict]]:
+        route = self.router.select(mailbox.tokens, len(mailbox.fingerprints))
+        budget = route.chunk_token_budget
+        if budget is not None and mailbox.tokens > budget:
+            partials = await self._map_chunks(self._iter_chunks(mailbox.emails(), budget))
+            return route, self._reduce_messages(partials)
+
+        text = "\n\n".join([self._email_text([e]) async for e in mailbox.emails()])
+        return route, [{'role':'system','content':self._system_prompt()},
+                {'role':'user','content':f'Summarize this email thread \n{text}.'}]
+
+    async def _delta_messages(
+        self, previous_summary: dict, new_emails: Sequence[Email]
+    ) -> tuple[LLMRoute, list[dict]]:
+        previous = json.dumps(previous_summary)
+        route = self._route(new_emails, extra_tokens=estimate_tokens(previous))
+        ordered = sorted(new_emails, key=lambda e: ensure_aware(e.received_at))
+        chunks = [c async for c in self._iter_chunks(_iterate(ordered), route.chunk_token_budget)]
+        if len(chunks) > 1:
+            partials = await self._map_chunks(_iterate(chunks))
+            partials.insert(0, EmailThreadSummary.model_validate(previous_summary))
+            return route, self._reduce_messages(partials)
+
+        prompt = f"{self._system_prompt()}\n{DELTA_PROMPT.format(previous)}"
+        return route, [{'role':'system','content':prompt},
+                {'role':'user','content':f'Update the summary with these new emails \n{chunks[0]}.'}]
+
+    def _reduce_messages(self, partials: Sequence[EmailThreadSummary]) -> list[dict]:
+        """
+        Messages combining chronologically ordered partial summaries into one.
+        """
+        parts = "\n\n".join(
+            f"Part {i}:\n{partial.model_dump_json()}"
+            for i, partial in enumerate(partials, start=1)
+        )
+        prompt = f"{self._system_prompt()}\n{REDUCE_PROMPT}"
+        return [{'role':'system','content':prompt},
+                {'role':'user','content':f'Combine these partial summaries \n{parts}'}]
+
+    async def _map_chunks(self, chunks: AsyncIterator[str]) -> list[EmailThreadSummary]:
+        """
+        Summarizes each chunk concurrently, bounded by `SUMMARY_CHUNK_CONCURRENCY`.
+        The next chunk is only pulled once a slot is free, so at most that
+        many chunks are held in memory.
+        """
+        semaphore = asyncio.Semaphore(settings.SUMMARY_CHUNK_CONCURRENCY)
+
+        async def summarize_chunk(chunk: str) -> EmailThreadSummary:
+            try:
+                messages = [{'role':'system','content':self._system_prompt()},
+                            {'role':'user','content':f'Summarize this part of an email thread \n{chunk}.'}]
+                route = self.router.select(estimate_tokens(chunk))
+                response = await self.router.generate(
+                    route, messages, json_resp=True, response_schema=EmailThreadSummary
+                )
+                return self._parse_summary(response)
+            finally:
+                semaphore.release()
+
+        tasks: list[asyncio.Task] = []
+        try:
+            async for chunk in chunks:
+                await semaphore.acquire()
+                tasks.append(asyncio.ensure_future(summarize_chunk(chunk)))
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _route(self, emails: Sequence[Email], extra_tokens: int = 0) -> LLMRoute:
+        tokens = extra_tokens + sum(estimate_tokens(self._email_text([e])) for e in emails)
+        return self.router.select(tokens, len(emails))
+
+    async def _iter_chunks(
+        self, emails: AsyncIterator[Email], budget: int | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Packs emails, in the order given, into prompt chunks of at most
+        `budget` estimated tokens (a single chunk when None). An email larger
+        than the budget gets a chunk of its own.
+        """
+        budget = budget or float("inf")
+        current: list[str] = []
+        current_tokens = 0
+        async for e in emails:
+            text = self._email_text([e])
+            tokens = estimate_tokens(text)
+            if current and current_tokens + tokens > budget:
+                yield "\n\n".join(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            yield "\n\n".join(current)
 
     def hash_emails(self, emails: Sequence[Email]) -> str:
-        payload = "".join(e.body for e in emails)
-        return hashlib.sha256(payload.encode()).hexdigest()
+        """Order-independent digest of the mailbox, see `EmailFingerprintService`."""
+        return self.fingerprints.digest(self.fingerprints.fingerprint_emails(emails).values())
+
+    def _new_email_ids(
+        self, existing_summary: EmailSummary | None, diff: MailboxDiff
+    ) -> list[str] | None:
+        """
+        Returns the ids of the emails not yet folded into `existing_summary`,
+        or None when a delta refresh is not possible and the whole mailbox
+        must be summarized.
+        """
+        if not settings.SUMMARY_DELTA_ENABLED or not existing_summary or not diff.known:
+            return None
+        # Removed or edited emails may still be reflected in the previous summary
+        if diff.removed or not diff.added:
+            return None
+        return diff.added
+
+    def _email_text(self, emails: Sequence[Email]) -> str:
+        return "\n\n".join(
+            f"From: {e.sender}\nTo: {e.recipient}\n{e.body}" for e in emails
+        )
+
+    def _system_prompt(self) -> str:
+        now = self._prompt_time()
+        return f"{SYSTEM_PROMPT}\n{DATE_PROMPT.format(now.date(), now.strftime('%H:%M:%S'), pytz.timezone('UTC'))}"
+
+    def _prompt_time(self) -> datetime:
+        """
+        Current time rounded down to `SUMMARY_PROMPT_TIME_QUANTUM_MINUTES`, so
+        prompts for the same emails stay byte-identical (and cacheable)
+        within that window.
+        """
+        quantum = settings.SUMMARY_PROMPT_TIME_QUANTUM_MINUTES * 60
+        timestamp = self.now().timestamp()
+        return datetime.fromtimestamp(timestamp - timestamp % quantum, tz=timezone.utc)
 
     def now(self) -> datetime:
         return datetime.now(timezone.utc)
 
     def _safe_parse(self, text: str) -> dict:
-        start = text.find("{")
-        end = text.rfind("}") + 1
-        return json.loads(text[start:end])
+        return self._parse_summary(text).model_dump(mode="json")
+
+    def _parse_summary(self, text: str) -> EmailThreadSummary:
+        """
+        Validates the model output, repairing it (e.g. when it was cut off at
+        the output budget) rather than throwing the whole call away.
+        """
+        for attempt, candidate in enumerate(json_repair_candidates(text or "")):
+            try:
+                summary = SUMMARY_ADAPTER.validate_json(candidate)
+            except ValidationError:
+                continue
+            if attempt:
+                logger.warning(f"Repaired malformed LLM summary after {attempt} attempts")
+            return summary
+        raise ValueError("LLM response is not a valid summary")
@@ -0,0 +1,79 @@
+import logging
+import uuid
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DUE_KEY = "summary-dirty:due"
+FIRST_SEEN_PREFIX = "summary-dirty:first:"
+
+# Marks a client dirty and (re)schedules its refresh DEBOUNCE seconds from
+# now, but never later than MAX_DELAY after it was first marked. Returns
+# the due time in milliseconds.
+MARK_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+redis.call("SET", KEYS[2], now, "NX", "PX", ARGV[4])
+local first = tonumber(redis.call("GET", KEYS[2]))
+local due = math.min(now + tonumber(ARGV[2]), first + tonumber(ARGV[3]))
+redis.call("ZADD", KEYS[1], due, ARGV[1])
+return due
+"""
+
+# Pops up to ARGV[1] clients whose refresh is due and clears their marks
+POP_DUE_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local ids = redis.call("ZRANGEBYSCORE", KEYS[1], "-inf", now, "LIMIT", 0, tonumber(ARGV[1]))
+for _, id in ipairs(ids) do
+    redis.call("ZREM", KEYS[1], id)
+    redis.call("DEL", ARGV[2] .. id)
+end
+return ids
+"""
+
+
+class SummaryDirtyService:
+    """
+    Tracks client summaries made stale by new mail, in Redis.
+
+    `mark_dirty` debounces: a burst of notifications for one client yields a
+    single refresh once the burst is over (or `max_delay` after it began),
+    and `pop_due` hands each due client out exactly once across schedulers.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        debounce: float = settings.SUMMARY_DIRTY_DEBOUNCE_SECONDS,
+        max_delay: float = settings.SUMMARY_DIRTY_MAX_DELAY_SECONDS,
+    ):
+        self.redis = redis
+        self.debounce_ms = int(debounce * 1000)
+        self.max_delay_ms = int(max_delay * 1000)
+
+    async def mark_dirty(self, client_id: uuid.UUID) -> None:
+        await self.redis.eval(
+            MARK_SCRIPT,
+            2,
+            DUE_KEY,
+            f"{FIRST_SEEN_PREFIX}{client_id}",
+            str(client_id),
+            self.debounce_ms,
+            self.max_delay_ms,
+            # Outlives the due time, so a late pop still finds it
+            self.max_delay_ms * 2,
+        )
+
+    async def is_dirty(self, client_id: uuid.UUID) -> bool:
+        return await self.redis.zscore(DUE_KEY, str(client_id)) is not None
+
+    async def pop_due(self, limit: int = 100) -> list[uuid.UUID]:
+        ids = await self.redis.eval(POP_DUE_SCRIPT, 1, DUE_KEY, limit, FIRST_SEEN_PREFIX)
+        return [uuid.UUID(i.decode() if isinstance(i, bytes) else i) for i in ids]
+
+    async def pending(self) -> int:
+        return await self.redis.zcard(DUE_KEY)
@@ -0,0 +1,25 @@
+import time
+import uuid
+
+from redis.asyncio import Redis
+
+VIEWS_KEY = "summary-views"
+
+
+class SummaryViewService:
+    """
+    When each client's summary was last read, in one Redis sorted set, so
+    the scheduler can keep the summaries people actually look at warm.
+    """
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    async def record(self, client_id: uuid.UUID) -> None:
+        await self.redis.zadd(VIEWS_KEY, {str(client_id): time.time()})
+
+    async def viewed_since(self, since: float) -> list[uuid.UUID]:
+        """Clients read since the `since` Unix time; older views are dropped."""
+        await self.redis.zremrangebyscore(VIEWS_KEY, "-inf", f"({since}")
+        ids = await self.redis.zrange(VIEWS_KEY, 0, -1)
+        return [uuid.UUID(i.decode() if isinstance(i, bytes) else i) for i in ids]
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from redis.asyncio import Redis
+
+from app import crud
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, get_async_redis
+from app.services.job_queue_service import JobQueueService
+from app.services.summarization_service import summary_stale_after
+from app.services.summary_dirty_service import SummaryDirtyService
+from app.services.summary_view_service import SummaryViewService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TICK_LOCK_KEY = "summary-scheduler:tick"
+
+
+def is_off_peak(now: datetime) -> bool:
+    return now.hour in settings.SUMMARY_PREWARM_OFF_PEAK_HOURS
+
+
+def batch_size(now: datetime) -> int:
+    if is_off_peak(now):
+        return settings.SUMMARY_PREWARM_OFF_PEAK_BATCH_SIZE
+    return settings.SUMMARY_PREWARM_BATCH_SIZE
+
+
+async def prewarm(redis: Redis, queue: JobQueueService) -> int:
+    """
+    Queues a non-forced refresh for every summary that goes stale within the
+    lead time, so readers are served from storage. Unchanged mailboxes only
+    get their `last_refreshed` touched by the worker. During peak hours only
+    recently viewed clients are pre-warmed; the rest wait for off-peak.
+
+    With change notifications, new mail already refreshes summaries through
+    the dirty set, so this is only a safety sweep, run off-peak.
+    """
+    now = datetime.now(timezone.utc)
+    if settings.SUMMARY_CHANGE_NOTIFICATIONS_ENABLED and not is_off_peak(now):
+        return 0
+    lead = timedelta(minutes=settings.SUMMARY_PREWARM_LEAD_MINUTES)
+    stale_after = summary_stale_after()
+
+    client_ids = None
+    if not is_off_peak(now):
+        viewed_within = timedelta(hours=settings.SUMMARY_PREWARM_VIEWED_WITHIN_HOURS)
+        client_ids = await SummaryViewService(redis).viewed_since(
+            (now - viewed_within).timestamp()
+        )
+        if not client_ids:
+            return 0
+
+    async with AsyncSessionLocal() as session:
+        expiring = await crud.email_summary.list_refreshed_before(
+            session=session,
+            refreshed_before=now - stale_after + lead,
+            client_ids=client_ids,
+            limit=batch_size(now),
+        )
+
+    queued = 0
+    for summary in expiring:
+        # Don't queue the same client again while its refresh is in flight
+        if await redis.set(
+            f"summary-scheduler:queued:{summary.client_id}",
+            1,
+            nx=True,
+            ex=int(lead.total_seconds()),
+        ):
+            await queue.enqueue_summary_refresh(summary.client_id, force_refresh=False)
+            queued += 1
+    return queued
+
+
+async def flush_dirty(dirty: SummaryDirtyService, queue: JobQueueService) -> int:
+    """
+    Queues a refresh for every client whose debounced change notifications
+    are due. Refreshes aren't forced: the worker re-syncs the mailbox and
+    only calls the LLM if its emails actually changed.
+    """
+    queued = 0
+    while client_ids := await dirty.pop_due():
+        for client_id in client_ids:
+            await queue.enqueue_summary_refresh(client_id, force_refresh=False)
+        queued += len(client_ids)
+    return queued
+
+
+async def prewarm_loop(redis: Redis, queue: JobQueueService) -> None:
+    while True:
+        # Only one scheduler instance does the work per interval
+        if await redis.set(
+            TICK_LOCK_KEY, 1, nx=True, ex=settings.SUMMARY_PREWARM_INTERVAL_SECONDS
+        ):
+            try:
+                queued = await prewarm(redis, queue)
+                if queued:
+                    logger.info(f"Queued {queued} summary refreshes")
+            except Exception as e:
+                logger.error(f"Pre-warming failed: {e}", exc_info=True)
+        await asyncio.sleep(settings.SUMMARY_PREWARM_INTERVAL_SECONDS)
+
+
+async def dirty_loop(redis: Redis, queue: JobQueueService) -> None:
+    # pop_due is atomic, so every scheduler instance can poll
+    dirty = SummaryDirtyService(redis)
+    while True:
+        try:
+            queued = await flush_dirty(dirty, queue)
+            if queued:
+                logger.info(f"Queued {queued} refreshes for changed mailboxes")
+        except Exception as e:
+            logger.error(f"Flushing dirty summaries failed: {e}", exc_info=True)
+        await asyncio.sleep(settings.SUMMARY_DIRTY_POLL_SECONDS)
+
+
+async def main() -> None:
+    logger.info("Starting summary scheduler")
+    async with get_async_redis() as redis:
+        queue = JobQueueService(redis)
+        await asyncio.gather(prewarm_loop(redis, queue), dirty_loop(redis, queue))
+
+if __name__ == "__main__":
+    asyncio.run(main())
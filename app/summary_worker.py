@@ -0,0 +1,113 @@
+import asyncio
+import logging
+
+from app.api.deps import get_email_provider
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, get_async_redis
+from app.llms.context import llm_priority
+from app.llms.registry import llm_registry
+from app.providers.email.graph_email_provider import (
+    MicrosoftGraphProvider,
+    close_graph_http_client,
+)
+from app.schema.enums import JobKind, LLMPriority
+from app.schema.job import BulkRefreshReport, Job
+from app.services.bulk_refresh_service import BulkRefreshService
+from app.services.job_queue_service import JobQueueService
+from app.services.single_flight_service import SingleFlightService
+from app.services.summarization_service import SummarizationService, summary_flight_key
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def run_summary_refresh(
+    job: Job, single_flight: SingleFlightService, queue: JobQueueService
+) -> dict:
+    async with AsyncSessionLocal() as session:
+        summarizer = SummarizationService(session)
+        return await single_flight.do(
+            summary_flight_key(job.client_id, job.force_refresh),
+            lambda: summarizer.process_and_store_summary(
+                job.client_id, get_email_provider(), force_refresh=job.force_refresh
+            ),
+        )
+
+
+async def run_bulk_refresh(
+    job: Job, single_flight: SingleFlightService, queue: JobQueueService
+) -> dict:
+    async def on_progress(report: BulkRefreshReport) -> None:
+        job.result = report.model_dump(mode="json")
+        await queue.save(job)
+
+    service = BulkRefreshService(get_email_provider(), single_flight)
+    report = await service.refresh_firm(
+        job.firm_id, force_refresh=job.force_refresh, on_progress=on_progress
+    )
+    return report.model_dump(mode="json")
+
+
+async def run_mailbox_sync(
+    job: Job, single_flight: SingleFlightService, queue: JobQueueService
+) -> dict:
+    # Walks the whole mailbox when needed, which interactive reads never do
+    async with AsyncSessionLocal() as session:
+        await MicrosoftGraphProvider(mailbox=job.mailbox).sync_mailbox(session)
+    return {}
+
+
+HANDLERS = {
+    JobKind.SUMMARY_REFRESH: run_summary_refresh,
+    JobKind.BULK_REFRESH: run_bulk_refresh,
+    JobKind.MAILBOX_SYNC: run_mailbox_sync,
+}
+
+
+async def work(queue: JobQueueService, single_flight: SingleFlightService) -> None:
+    # Queued work yields the LLM quota to interactive requests
+    llm_priority.set(LLMPriority.BACKGROUND)
+    while True:
+        job = await queue.dequeue()
+        if job is None:
+            continue
+        logger.info(f"Running job {job.id} ({job.kind.value})")
+        async with queue.lease(job):
+            try:
+                result = await HANDLERS[job.kind](job, single_flight, queue)
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {e}", exc_info=True)
+                await queue.mark_failed(job, str(e))
+            else:
+                await queue.mark_done(job, result)
+                logger.info(f"Job {job.id} done")
+
+
+async def requeue_stale(queue: JobQueueService) -> None:
+    """Returns jobs of crashed workers to the queue."""
+    while True:
+        try:
+            await queue.requeue_stale()
+        except Exception as e:
+            logger.error(f"Requeueing stale jobs failed: {e}", exc_info=True)
+        await asyncio.sleep(queue.lease_ttl)
+
+
+async def main() -> None:
+    logger.info(f"Starting summary worker with {settings.JOB_WORKER_CONCURRENCY} slots")
+    llm_registry.start()
+    try:
+        async with get_async_redis() as redis:
+            queue = JobQueueService(redis)
+            single_flight = SingleFlightService(redis)
+            await asyncio.gather(
+                requeue_stale(queue),
+                *(work(queue, single_flight) for _ in range(settings.JOB_WORKER_CONCURRENCY)),
+            )
+    finally:
+        await llm_registry.close()
+        await close_graph_http_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
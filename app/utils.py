@@ -1,6 +1,7 @@
 import json
 import logging
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -133,6 +134,79 @@ def ensure_aware(dt:datetime) -> datetime:
 
 
 
+def estimate_tokens(text: str) -> int:
+    # Rough heuristic (~4 characters per token), good enough for budgeting
+    return len(text) // 4 + 1
+
+
+# A true/false/null value cut off partway, e.g. `"concluded": tru`
+PARTIAL_LITERAL = re.compile(r"(?<=[:\[,])\s*(t|tr|tru|f|fa|fal|fals|n|nu|nul)$")
+LITERALS = {"t": "true", "f": "false", "n": "null"}
+
+
+def json_repair_candidates(text: str) -> Iterator[str]:
+    """
+    Yields JSON texts recovered from model output, most complete first.
+
+    The first candidate is the outermost object with any surrounding prose,
+    fences or `<think>` block dropped. If the output was cut off, the open
+    string or `true`/`false`/`null` literal is completed and later
+    candidates trim back to each earlier `,`, `{` or `[` before closing
+    every open array and object, so callers can keep the first one that
+    validates instead of regenerating.
+    """
+    if "</think>" in text:
+        text = text.split("</think>")[-1]
+    start = text.find("{")
+    if start == -1:
+        return
+
+    stack: list[str] = []
+    cuts: list[tuple[int, tuple[str, ...]]] = []
+    in_string = escaped = False
+    end = len(text)
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            cuts.append((i + 1, tuple(stack)))
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                end = i + 1
+                break
+        elif ch == ",":
+            cuts.append((i, tuple(stack)))
+
+    yield text[start:end]
+    if not stack:
+        return
+
+    # Truncated: close whatever was left open, completing a cut-off literal.
+    # A string cut right after its opening quote is dropped with its element
+    # rather than kept empty.
+    head = text[start:].rstrip()
+    if not in_string:
+        literal = PARTIAL_LITERAL.search(head)
+        if literal:
+            head = head[: literal.start(1)] + LITERALS[literal.group(1)[0]]
+        yield head + "".join(reversed(stack))
+    elif not head.endswith('"'):
+        yield (head[:-1] if escaped else head) + '"' + "".join(reversed(stack))
+    for cut, open_stack in reversed(cuts):
+        yield text[start:cut] + "".join(reversed(open_stack))
+
+
 def clean_json_string(json_str):
     if type(json_str) is not str:
         return json_str
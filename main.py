@@ -1,5 +1,6 @@
 import logging
 import uuid
+from contextlib import asynccontextmanager
 
 import sentry_sdk
 from fastapi import FastAPI, HTTPException
@@ -10,6 +11,8 @@ from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.llms.registry import llm_registry
+from app.providers.email.graph_email_provider import close_graph_http_client
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -19,10 +22,20 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared LLM clients live for the whole process
+    llm_registry.start()
+    yield
+    await llm_registry.close()
+    await close_graph_http_client()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -0,0 +1,38 @@
+import asyncio
+import contextlib
+import uuid
+
+import fakeredis
+
+from app.api.routes import clients
+from app.services.single_flight_service import SingleFlightService
+
+
+class Summarizer:
+    finished = False
+
+    def __init__(self, session):
+        pass
+
+    async def stream_summary(self, client_id, email_provider):
+        yield "delta", "{"
+        await asyncio.sleep(0.1)
+        Summarizer.finished = True
+        yield "summary", {"summary": "done"}
+
+
+def test_stream_disconnect_does_not_cancel_generation(monkeypatch) -> None:
+    monkeypatch.setattr(clients, "AsyncSessionLocal", contextlib.nullcontext)
+    monkeypatch.setattr(clients, "SummarizationService", Summarizer)
+    single_flight = SingleFlightService(fakeredis.FakeAsyncRedis())
+
+    async def run():
+        stream = clients._summary_events(uuid.uuid4(), single_flight, None)
+        assert (await anext(stream)).startswith("event: delta")
+        # The client goes away mid-stream
+        await stream.aclose()
+        await asyncio.sleep(0.3)
+
+    asyncio.run(run())
+
+    assert Summarizer.finished
@@ -0,0 +1,55 @@
+import asyncio
+
+import fakeredis
+
+from app.llms.cached_llm import CachedLLM
+from app.schema.summary import EmailThreadSummary
+from app.services.llm_cache_service import LLMResponseCacheService
+from tests.llms.test_resilient_llm import ScriptedLLM
+
+VALID = '{"actors": [], "concluded": true, "open_items": []}'
+MESSAGES = [{"role": "user", "content": "Summarize"}]
+
+
+def make_llm(*outcomes) -> tuple[CachedLLM, ScriptedLLM]:
+    inner = ScriptedLLM(*outcomes)
+    cache = LLMResponseCacheService(fakeredis.FakeAsyncRedis(), use_postgres=False)
+    return CachedLLM(inner, cache), inner
+
+
+def test_valid_responses_are_cached() -> None:
+    llm, inner = make_llm(VALID, "unused")
+
+    async def run():
+        return [
+            await llm.generate(MESSAGES, json_resp=True, response_schema=EmailThreadSummary)
+            for _ in range(2)
+        ]
+
+    assert asyncio.run(run()) == [VALID, VALID]
+    assert inner.calls == 1
+
+
+def test_truncated_responses_are_not_cached() -> None:
+    llm, inner = make_llm('{"actors": [], "concluded": tru', VALID)
+
+    async def run():
+        first = await llm.generate(MESSAGES, json_resp=True, response_schema=EmailThreadSummary)
+        second = await llm.generate(MESSAGES, json_resp=True, response_schema=EmailThreadSummary)
+        return first, second
+
+    assert asyncio.run(run())[1] == VALID
+    assert inner.calls == 2
+
+
+def test_key_covers_output_budget_and_schema() -> None:
+    cache = LLMResponseCacheService(fakeredis.FakeAsyncRedis(), use_postgres=False)
+    base = {"model": "m", "temperature": 0.1, "messages": MESSAGES, "json_resp": True}
+
+    keys = {
+        cache.key(**base),
+        cache.key(**base, max_tokens=500),
+        cache.key(**base, response_schema=EmailThreadSummary),
+    }
+
+    assert len(keys) == 3
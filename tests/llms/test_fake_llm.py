@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from app.llms.fake_llm import FakeLLM, FakeLLMError
+from app.schema.summary import EmailThreadSummary
+
+MESSAGES = [
+    {"role": "system", "content": "Summarize."},
+    {
+        "role": "user",
+        "content": (
+            "From: anna@client.com To: ben@firm.com\n"
+            "Could you send the Q3 bank statements? Thanks for the call."
+        ),
+    },
+]
+
+
+def make_llm(**kwargs) -> FakeLLM:
+    return FakeLLM(**{"latency_ms": 0, "error_rate": 0, "chunk_delay_ms": 0, **kwargs})
+
+
+class Usage:
+    def __init__(self):
+        self.calls = []
+
+    def record(self, usage) -> None:
+        self.calls.append(usage)
+
+
+def test_response_is_a_summary_built_from_the_prompt() -> None:
+    response = asyncio.run(make_llm().generate(MESSAGES, json_resp=True))
+
+    summary = EmailThreadSummary.model_validate_json(response)
+    assert [a.identifier for a in summary.actors] == ["anna@client.com", "ben@firm.com"]
+    assert [i.description for i in summary.open_items] == [
+        "Could you send the Q3 bank statements?"
+    ]
+    assert summary.open_items[0].owner in {"anna@client.com", "ben@firm.com"}
+    assert summary.concluded is False
+
+
+def test_same_prompt_gives_same_response() -> None:
+    first = asyncio.run(make_llm(seed=1).generate(MESSAGES))
+    second = asyncio.run(make_llm(seed=2).generate(MESSAGES))
+
+    assert first == second
+
+
+def test_stream_chunks_add_up_to_the_response() -> None:
+    llm = make_llm(chunk_size=7)
+
+    async def run():
+        return [chunk async for chunk in llm.generate_stream(MESSAGES)]
+
+    chunks = asyncio.run(run())
+
+    assert all(len(c) <= 7 for c in chunks)
+    assert "".join(chunks) == asyncio.run(llm.generate(MESSAGES))
+
+
+def test_error_rate_fails_calls() -> None:
+    with pytest.raises(FakeLLMError):
+        asyncio.run(make_llm(error_rate=1).generate(MESSAGES))
+
+
+def test_calls_are_recorded_as_usage() -> None:
+    usage = Usage()
+
+    async def run():
+        llm = make_llm(usage=usage)
+        await llm.generate(MESSAGES)
+        return [c async for c in llm.generate_stream(MESSAGES)]
+
+    asyncio.run(run())
+
+    assert [c.model for c in usage.calls] == ["fake", "fake"]
+    assert usage.calls[0].input_tokens > 0
+    assert usage.calls[0].time_to_first_token_seconds is None
+    assert usage.calls[1].time_to_first_token_seconds is not None
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from app.llms.base_llm import BaseLLM
+from app.llms.resilient_llm import CircuitBreaker, CircuitOpenError, ResilientLLM
+from app.llms.scheduled_llm import ScheduledLLM
+
+
+class Transient(Exception):
+    code = 503
+
+
+class ScriptedLLM(BaseLLM):
+    """Replies with each of `outcomes` in turn: a string, an exception or a delay."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.model = "scripted"
+        self.temperature = 0
+
+    async def generate(self, messages, json_resp=False, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else "ok"
+        if isinstance(outcome, float):
+            await asyncio.sleep(outcome)
+            return "slow"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_retries_transient_errors() -> None:
+    llm = ScriptedLLM(Transient(), "done")
+    resilient = ResilientLLM(llm, max_retries=2)
+
+    assert asyncio.run(resilient.generate([])) == "done"
+    assert llm.calls == 2
+    assert resilient.breaker.failures == 0
+
+
+def test_does_not_retry_other_errors() -> None:
+    llm = ScriptedLLM(ValueError("bad request"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(ResilientLLM(llm, max_retries=2).generate([]))
+    assert llm.calls == 1
+
+
+def test_breaker_opens_and_half_opens() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.05)
+    llm = ScriptedLLM(Transient(), Transient(), "recovered")
+    resilient = ResilientLLM(llm, breaker=breaker, max_retries=0)
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(Transient):
+                await resilient.generate([])
+        with pytest.raises(CircuitOpenError):
+            await resilient.generate([])
+        await asyncio.sleep(0.06)
+        return await resilient.generate([])
+
+    assert asyncio.run(scenario()) == "recovered"
+    assert breaker.opened_at is None
+    assert llm.calls == 3
+
+
+def test_other_errors_do_not_open_breaker() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    llm = ScriptedLLM(ValueError(), ValueError(), ValueError(), "ok")
+    resilient = ResilientLLM(llm, breaker=breaker, max_retries=0)
+
+    async def scenario():
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await resilient.generate([])
+        return await resilient.generate([])
+
+    assert asyncio.run(scenario()) == "ok"
+    assert breaker.failures == 0
+    assert breaker.opened_at is None
+
+
+def test_cancelled_trial_does_not_wedge_breaker() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.01)
+    llm = ScriptedLLM(Transient(), 1.0, "recovered")
+    resilient = ResilientLLM(llm, breaker=breaker, max_retries=0)
+
+    async def scenario():
+        with pytest.raises(Transient):
+            await resilient.generate([])
+        await asyncio.sleep(0.02)
+        trial = asyncio.ensure_future(resilient.generate([]))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        return await resilient.generate([])
+
+    assert asyncio.run(scenario()) == "recovered"
+
+
+def test_deadline_starts_after_admission() -> None:
+    class SlowScheduler:
+        async def acquire(self, tokens, priority):
+            await asyncio.sleep(0.1)
+
+    llm = ScriptedLLM(0.01)
+    scheduled = ScheduledLLM(llm, SlowScheduler(), timeout=0.05)
+
+    assert asyncio.run(ResilientLLM(scheduled, timeout=None).generate([])) == "slow"
@@ -0,0 +1,60 @@
+from app.llms.summary_stream_parser import SummaryStreamParser
+from app.schema.summary import Actor, OpenItem
+
+SUMMARY = (
+    '{"actors": [{"identifier": "anna@client.com", "role": "client"}, '
+    '{"identifier": "ben@firm.com"}], '
+    '"open_items": [{"description": "Send \\"Q3\\" statements {urgent}", "owner": "ben@firm.com"}], '
+    '"concluded": false}'
+)
+
+
+def feed_in_chunks(text: str, size: int) -> list[list]:
+    parser = SummaryStreamParser()
+    return [parser.feed(text[i : i + size]) for i in range(0, len(text), size)]
+
+
+def test_items_are_emitted_once_complete() -> None:
+    batches = feed_in_chunks(SUMMARY, 1)
+    items = [item for batch in batches for item in batch]
+
+    assert items == [
+        Actor(identifier="anna@client.com", role="client"),
+        Actor(identifier="ben@firm.com"),
+        OpenItem(description='Send "Q3" statements {urgent}', owner="ben@firm.com"),
+    ]
+    # Each on the chunk holding its closing brace
+    first = next(i for i, batch in enumerate(batches) if batch)
+    assert SUMMARY[first] == "}"
+
+
+def test_chunk_size_does_not_change_the_result() -> None:
+    expected = [item for batch in feed_in_chunks(SUMMARY, 1) for item in batch]
+
+    for size in (3, 17, len(SUMMARY)):
+        assert [item for batch in feed_in_chunks(SUMMARY, size) for item in batch] == expected
+
+
+def test_text_before_the_object_is_skipped() -> None:
+    parser = SummaryStreamParser()
+
+    items = parser.feed("```json\n" + SUMMARY + "\n```")
+
+    assert len(items) == 3
+    assert parser.buffer.startswith("```json")
+
+
+def test_invalid_items_are_skipped() -> None:
+    parser = SummaryStreamParser()
+
+    items = parser.feed('{"actors": [{"role": "client"}, {"identifier": "a@b.com"}], "open_items": []')
+
+    assert items == [Actor(identifier="a@b.com")]
+
+
+def test_objects_outside_item_arrays_are_ignored() -> None:
+    parser = SummaryStreamParser()
+
+    items = parser.feed('{"meta": {"identifier": "x"}, "note": "actors: [{}]", "actors": []}')
+
+    assert items == []
@@ -0,0 +1,255 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from app import crud
+from app.models.graph_sync_state import GraphSyncState
+from app.providers.email.graph_email_provider import (
+    SELECT_FIELDS,
+    GraphDeltaExpired,
+    MicrosoftGraphProvider,
+)
+from tests.utils.graph_stand_in import graph_message, graph_stand_in
+
+CLIENT = "client@example.com"
+
+
+def make_provider(app) -> MicrosoftGraphProvider:
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    return MicrosoftGraphProvider(
+        access_token="token",
+        mailbox="shared@firm.com",
+        http_client=http,
+        base_url="http://graph/v1.0",
+    )
+
+
+def test_fetch_follows_next_links() -> None:
+    messages = [graph_message(i, CLIENT, "staff@firm.com") for i in range(5)]
+    app = graph_stand_in(messages, page_size=2)
+
+    emails = asyncio.run(make_provider(app).fetch_client_emails(CLIENT))
+
+    assert [e.id for e in emails] == [m["id"] for m in messages]
+    assert len(app.state.requests) == 3
+    assert emails[0].sender == CLIENT
+    assert emails[0].recipient == "staff@firm.com"
+    assert emails[0].body == "Body 0"
+    assert emails[0].conversation_id == "conv-0"
+
+
+def test_fetch_selects_fields_and_filters_on_participants() -> None:
+    app = graph_stand_in([graph_message(0, CLIENT, "staff@firm.com")])
+
+    asyncio.run(make_provider(app).fetch_client_emails(CLIENT))
+
+    request = app.state.requests[0]
+    assert request.query_params["$select"] == SELECT_FIELDS
+    assert f"from/emailAddress/address eq '{CLIENT}'" in request.query_params["$filter"]
+    assert "toRecipients/any" in request.query_params["$filter"]
+    assert request.query_params["$orderby"] == "receivedDateTime asc"
+    assert request.headers["authorization"] == "Bearer token"
+    assert 'outlook.body-content-type="text"' in request.headers["prefer"]
+
+
+def test_pages_prefetches_next_page() -> None:
+    messages = [graph_message(i, CLIENT, "staff@firm.com") for i in range(4)]
+    app = graph_stand_in(messages, page_size=2)
+    provider = make_provider(app)
+
+    async def first_page():
+        pages = provider._pages(f"{provider._mailbox_url()}/messages")
+        page = await anext(pages)
+        # Let the prefetch run while the first page is "processed"
+        await asyncio.sleep(0.05)
+        requested = len(app.state.requests)
+        await pages.aclose()
+        return page, requested
+
+    page, requested = asyncio.run(first_page())
+
+    assert [m["id"] for m in page["value"]] == ["msg-0", "msg-1"]
+    assert requested == 2
+
+
+def test_involves_matches_any_participant_case_insensitively() -> None:
+    provider = make_provider(graph_stand_in([]))
+    cc = graph_message(0, "a@firm.com", "b@firm.com")
+    cc["ccRecipients"] = [{"emailAddress": {"address": CLIENT.upper()}}]
+
+    assert provider._involves(graph_message(0, CLIENT, "b@firm.com"), CLIENT)
+    assert provider._involves(graph_message(0, "a@firm.com", CLIENT), CLIENT)
+    assert provider._involves(cc, CLIENT)
+    assert not provider._involves(graph_message(0, "a@firm.com", "b@firm.com"), CLIENT)
+
+
+def test_expired_delta_link_raises() -> None:
+    provider = make_provider(graph_stand_in([]))
+    url = f"{provider._mailbox_url()}/mailFolders/inbox/messages/delta?$deltatoken=expired"
+
+    with pytest.raises(GraphDeltaExpired):
+        asyncio.run(provider._get(url))
+
+
+def test_fetch_since_bounds_received_time() -> None:
+    app = graph_stand_in([graph_message(0, CLIENT, "staff@firm.com")])
+    since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    asyncio.run(make_provider(app).fetch_client_emails(CLIENT, since=since))
+
+    assert app.state.requests[0].query_params["$filter"].startswith(
+        "receivedDateTime ge 2026-01-01T00:00:00Z and ("
+    )
+
+
+def test_iter_yields_pages_as_they_arrive() -> None:
+    messages = [graph_message(i, CLIENT, "staff@firm.com") for i in range(4)]
+    app = graph_stand_in(messages, page_size=2)
+    provider = make_provider(app)
+
+    async def first_email():
+        emails = provider.iter_client_emails(CLIENT)
+        email = await anext(emails)
+        await emails.aclose()
+        return email
+
+    assert asyncio.run(first_email()).id == "msg-0"
+    # The first page plus at most the prefetched second one
+    assert len(app.state.requests) <= 2
+
+
+def test_delta_changes_fan_out_to_participating_clients(monkeypatch) -> None:
+    first, second = uuid.uuid4(), uuid.uuid4()
+    removed, saved = [], {}
+
+    async def ids_by_email(session, *, emails):
+        known = {CLIENT: {first}, "other@example.com": {second}}
+        return {e: known[e] for e in emails if e in known}
+
+    async def remove_messages(session, *, client_id, provider, message_ids=None):
+        removed.append((client_id, list(message_ids)))
+
+    async def upsert_many(session, *, emails):
+        for email in emails:
+            saved.setdefault(email.client_id, []).append(email.message_id)
+
+    monkeypatch.setattr(crud.client, "ids_by_email", ids_by_email)
+    monkeypatch.setattr(crud.ingested_email, "remove_messages", remove_messages)
+    monkeypatch.setattr(crud.ingested_email, "upsert_many", upsert_many)
+
+    shared = graph_message(0, CLIENT, "staff@firm.com")
+    shared["ccRecipients"] = [{"emailAddress": {"address": "OTHER@example.com"}}]
+    items = [
+        shared,
+        graph_message(1, "staff@firm.com", CLIENT),
+        graph_message(2, "staff@firm.com", "nobody@example.com"),
+        {"id": "msg-9", "@removed": {"reason": "deleted"}},
+    ]
+    provider = make_provider(graph_stand_in([]))
+
+    counts = asyncio.run(provider._apply_changes(None, items))
+
+    assert counts == (3, 1)
+    assert removed == [(None, ["msg-9", "msg-0", "msg-1", "msg-2"])]
+    assert saved == {first: ["msg-0", "msg-1"], second: ["msg-0"]}
+
+
+class Session:
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        pass
+
+
+def stub_sync_state(monkeypatch, links: dict[str, str]) -> list[str]:
+    """Keeps delta links in `links`; returns the folders locked, in order."""
+    locked = []
+
+    async def lock(session, *, mailbox, folder):
+        locked.append(folder)
+
+    async def get_state(session, *, mailbox, folder):
+        if folder not in links:
+            return None
+        return GraphSyncState(
+            mailbox=mailbox,
+            folder=folder,
+            delta_link=links[folder],
+            synced_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        )
+
+    async def is_synced(session, *, mailbox, folders):
+        return all(f in links for f in folders)
+
+    async def save_delta_link(session, *, mailbox, folder, delta_link):
+        links[folder] = delta_link
+
+    async def ids_by_email(session, *, emails):
+        return {e: {uuid.uuid4()} for e in emails}
+
+    async def upsert_many(session, *, emails):
+        pass
+
+    monkeypatch.setattr(crud.graph_sync_state, "lock", lock)
+    monkeypatch.setattr(crud.graph_sync_state, "get_state", get_state)
+    monkeypatch.setattr(crud.graph_sync_state, "is_synced", is_synced)
+    monkeypatch.setattr(crud.graph_sync_state, "save_delta_link", save_delta_link)
+    monkeypatch.setattr(crud.client, "ids_by_email", ids_by_email)
+    monkeypatch.setattr(crud.ingested_email, "upsert_many", upsert_many)
+    return locked
+
+
+def test_interactive_sync_leaves_the_first_mailbox_walk_to_the_worker(monkeypatch) -> None:
+    stub_sync_state(monkeypatch, {})
+    queued = []
+
+    async def is_backfilled(session, *, client_id, mailbox):
+        return True
+
+    monkeypatch.setattr(crud.graph_sync_state, "is_backfilled", is_backfilled)
+    app = graph_stand_in([graph_message(0, CLIENT, "staff@firm.com")])
+    provider = make_provider(app)
+
+    async def queue_full_sync():
+        queued.append(provider.mailbox)
+
+    monkeypatch.setattr(provider, "_queue_full_sync", queue_full_sync)
+
+    asyncio.run(provider.sync_client(Session(), uuid.uuid4(), CLIENT))
+
+    assert queued == ["shared@firm.com"]
+    assert app.state.requests == []
+
+
+def test_expired_delta_link_resyncs_in_place(monkeypatch) -> None:
+    links = {
+        "inbox": "http://graph/v1.0/users/shared@firm.com/mailFolders/inbox/messages/delta?$deltatoken=expired",
+        "sentitems": "http://graph/v1.0/users/shared@firm.com/mailFolders/sentitems/messages/delta?$deltatoken=ok",
+    }
+    locked = stub_sync_state(monkeypatch, links)
+    removed = []
+
+    async def list_message_ids(session, *, provider, since=None, created_before=None):
+        return {"msg-0", "msg-deleted-meanwhile"}
+
+    async def remove_messages(session, *, client_id, provider, message_ids=None):
+        removed.append(list(message_ids) if message_ids is not None else None)
+
+    monkeypatch.setattr(crud.ingested_email, "list_message_ids", list_message_ids)
+    monkeypatch.setattr(crud.ingested_email, "remove_messages", remove_messages)
+    app = graph_stand_in([graph_message(0, CLIENT, "staff@firm.com")])
+
+    asyncio.run(make_provider(app).sync_mailbox(Session()))
+
+    # Every folder walked again over the window, each under its lock
+    walks = [r for r in app.state.requests if "$deltatoken" not in r.query_params]
+    assert sorted(r.url.path.split("/")[-3] for r in walks) == ["inbox", "sentitems"]
+    assert locked[-2:] == ["inbox", "sentitems"]
+    assert all(link.endswith("$deltatoken=next") for link in links.values())
+    # Stored mail is overwritten, never wiped; only what the walk missed goes
+    assert None not in removed
+    assert removed[-1] == ["msg-deleted-meanwhile"]
@@ -0,0 +1,76 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from app import crud
+from app.models import MockEmail
+from app.providers.email.mock_email_provider import MockEmailProvider
+from app.schema.email import EmailMessage
+
+CLIENT = "client@example.com"
+CLIENT_ID = uuid.uuid4()
+
+
+class Session:
+    async def commit(self) -> None:
+        pass
+
+
+class Store:
+    """In-memory stand-in for EmailStoreService."""
+
+    def __init__(self, emails: list[EmailMessage]):
+        self.session = Session()
+        self.emails = {e.id: e for e in emails}
+        self.saved: list[str] = []
+
+    async def get_many(self, client_id, provider, message_ids):
+        return {i: self.emails[i] for i in message_ids if i in self.emails}
+
+    async def save(self, client_id, provider, emails):
+        self.saved += [e.id for e in emails]
+        self.emails.update({e.id: e for e in emails})
+
+    async def remove(self, client_id, provider, message_ids):
+        for i in message_ids:
+            self.emails.pop(i, None)
+
+
+def mock_email(id: str, body: str = "Body") -> MockEmail:
+    return MockEmail(
+        id=id,
+        subject=f"Subject {id}",
+        sender=CLIENT,
+        recipient="staff@firm.com",
+        body=body,
+        # Naive, as read back from the `mockemail` column
+        received_at=datetime(2026, 1, 1),
+    )
+
+
+def stored(email: MockEmail) -> EmailMessage:
+    message = EmailMessage.model_validate(email, from_attributes=True)
+    return message.model_copy(
+        update={"received_at": message.received_at.replace(tzinfo=timezone.utc)}
+    )
+
+
+def test_ingest_reconciles_store_with_mailbox(monkeypatch) -> None:
+    mailbox = [mock_email("same"), mock_email("edited", body="New body"), mock_email("new")]
+    store = Store([stored(mock_email("same")), stored(mock_email("edited")), stored(mock_email("deleted"))])
+
+    async def list_by_participant(session, *, address, after=None, limit=None, **kwargs):
+        return mailbox if after is None else []
+
+    async def list_gone_ingested(session, *, address, client_id, provider, limit=None):
+        upstream = {e.id for e in mailbox}
+        return [i for i in store.emails if i not in upstream][:limit]
+
+    monkeypatch.setattr(crud.mock_email, "list_by_participant", list_by_participant)
+    monkeypatch.setattr(crud.mock_email, "list_gone_ingested", list_gone_ingested)
+
+    asyncio.run(MockEmailProvider()._ingest(store, CLIENT, CLIENT_ID))
+
+    assert sorted(store.saved) == ["edited", "new"]
+    assert sorted(store.emails) == ["edited", "new", "same"]
+    assert store.emails["edited"].body == "New body"
@@ -0,0 +1,96 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from app import crud
+from app.schema.email import EmailMessage
+from app.services.email_dedup_service import EmailDedupService
+
+CLIENT_ID = uuid.uuid4()
+
+
+def email(id: str, **fields) -> EmailMessage:
+    return EmailMessage(
+        **{
+            "id": id,
+            "sender": "anna@client.com",
+            "recipient": "ben@firm.com",
+            "subject": "Q3 statements",
+            "body": "Please send the Q3 statements.",
+            "received_at": datetime(2026, 1, 1, 9, 30, 15, tzinfo=timezone.utc),
+            **fields,
+        }
+    )
+
+
+async def _iterate(emails):
+    for e in emails:
+        yield e
+
+
+def unique_ids(service: EmailDedupService, emails: list[EmailMessage]) -> list[str]:
+    async def run():
+        return [e.id async for e in service.unique(_iterate(emails))]
+
+    return asyncio.run(run())
+
+
+def test_copies_sharing_a_message_id_are_dropped() -> None:
+    service = EmailDedupService()
+    emails = [
+        email("1", internet_message_id="<a@mail>"),
+        email("2", internet_message_id="<a@mail>", recipient="carl@firm.com", body="CC copy"),
+        email("3", internet_message_id="<b@mail>"),
+    ]
+
+    assert unique_ids(service, emails) == ["1", "3"]
+    assert service.duplicates == 1
+
+
+def test_copies_without_message_id_match_on_content() -> None:
+    emails = [
+        email("1"),
+        # Seconds and whitespace differ, subject has a reply prefix
+        email(
+            "2",
+            subject="RE: Q3 statements",
+            body="Please  send the\nQ3 statements.",
+            received_at=datetime(2026, 1, 1, 9, 30, 50, tzinfo=timezone.utc),
+        ),
+        email("3", body="Something else"),
+        email("4", sender="carl@firm.com"),
+    ]
+
+    assert unique_ids(EmailDedupService(), emails) == ["1", "3", "4"]
+
+
+def test_keys_are_reused_from_the_index_and_staged(monkeypatch) -> None:
+    staged = {}
+
+    async def get_by_client(session, *, client_id):
+        return {"1": "stored-key", "gone": "old-key"}
+
+    async def stage_changes(session, *, client_id, upserts, removed):
+        staged.update(upserts=upserts, removed=removed)
+
+    monkeypatch.setattr(crud.seen_email, "get_by_client", get_by_client)
+    monkeypatch.setattr(crud.seen_email, "stage_changes", stage_changes)
+    service = EmailDedupService(session=object(), client_id=CLIENT_ID)
+    asyncio.run(service.load())
+    monkeypatch.setattr(service, "key", lambda e: f"key-{e.id}")
+
+    assert unique_ids(service, [email("1"), email("2")]) == ["1", "2"]
+    asyncio.run(service.stage())
+
+    assert staged == {"upserts": {"2": "key-2"}, "removed": ["gone"]}
+
+
+def test_without_a_client_nothing_is_staged(monkeypatch) -> None:
+    async def stage_changes(session, **kwargs):
+        raise AssertionError("should not stage")
+
+    monkeypatch.setattr(crud.seen_email, "stage_changes", stage_changes)
+    service = EmailDedupService()
+    unique_ids(service, [email("1")])
+
+    asyncio.run(service.stage())
@@ -0,0 +1,86 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from app import crud
+from app.models import MockEmail
+from app.services.email_fingerprint_service import EmailFingerprintService
+
+CLIENT_ID = uuid.uuid4()
+
+
+def email(id: str, body: str = "Body") -> MockEmail:
+    return MockEmail(
+        id=id,
+        subject="Subject",
+        sender="anna@client.com",
+        recipient="ben@firm.com",
+        body=body,
+        received_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def diff_against(monkeypatch, stored: dict[str, str], current: dict[str, str]):
+    async def get_by_client(session, *, client_id):
+        return stored
+
+    monkeypatch.setattr(crud.email_fingerprint, "get_by_client", get_by_client)
+    return asyncio.run(EmailFingerprintService(None).diff(CLIENT_ID, current))
+
+
+def test_fingerprint_covers_content_and_ignores_timezone_representation() -> None:
+    service = EmailFingerprintService(None)
+    naive = email("1")
+    naive.received_at = datetime(2026, 1, 1)
+
+    assert service.fingerprint(email("1")) == service.fingerprint(naive)
+    assert service.fingerprint(email("1")) != service.fingerprint(email("1", body="Edited"))
+    assert service.fingerprint(email("1")) != service.fingerprint(email("2"))
+
+
+def test_digest_does_not_depend_on_order() -> None:
+    service = EmailFingerprintService(None)
+    fingerprints = service.fingerprint_emails([email("1"), email("2"), email("3")])
+
+    assert service.digest(fingerprints.values()) == service.digest(
+        reversed(list(fingerprints.values()))
+    )
+    assert service.digest([]) == "0" * 64
+
+
+def test_diff_lists_added_changed_and_removed_emails(monkeypatch) -> None:
+    service = EmailFingerprintService(None)
+    before = service.fingerprint_emails([email("kept"), email("edited"), email("gone")])
+    after = service.fingerprint_emails([email("kept"), email("edited", body="v2"), email("new")])
+
+    diff = diff_against(monkeypatch, before, after)
+
+    assert sorted(diff.added) == ["edited", "new"]
+    assert sorted(diff.removed) == ["edited", "gone"]
+    assert diff.known == 3
+    assert diff.digest == service.digest(after.values())
+
+
+def test_unchanged_mailbox_has_an_empty_diff(monkeypatch) -> None:
+    fingerprints = EmailFingerprintService(None).fingerprint_emails([email("1"), email("2")])
+
+    diff = diff_against(monkeypatch, dict(fingerprints), fingerprints)
+
+    assert diff.added == [] and diff.removed == []
+
+
+def test_stage_upserts_added_and_drops_only_vanished(monkeypatch) -> None:
+    staged = {}
+
+    async def stage_changes(session, *, client_id, upserts, removed):
+        staged.update(upserts=upserts, removed=removed)
+
+    monkeypatch.setattr(crud.email_fingerprint, "stage_changes", stage_changes)
+    service = EmailFingerprintService(None)
+    before = service.fingerprint_emails([email("edited"), email("gone")])
+    after = service.fingerprint_emails([email("edited", body="v2")])
+    diff = diff_against(monkeypatch, before, after)
+
+    asyncio.run(service.stage(CLIENT_ID, diff))
+
+    assert staged == {"upserts": after, "removed": ["gone"]}
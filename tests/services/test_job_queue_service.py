@@ -0,0 +1,107 @@
+import asyncio
+import uuid
+
+import fakeredis
+
+from app.schema.enums import JobStatus
+from app.services.job_queue_service import PROCESSING_KEY, JobQueueService
+
+
+def make_queue(redis=None) -> JobQueueService:
+    return JobQueueService(redis or fakeredis.FakeAsyncRedis(), lease_ttl=60)
+
+
+def test_dequeued_job_stays_in_processing_until_acked() -> None:
+    queue = make_queue()
+
+    async def run():
+        queued = await queue.enqueue_summary_refresh(uuid.uuid4())
+        job = await queue.dequeue(timeout=1)
+        assert job.id == queued.id
+        assert job.status == JobStatus.RUNNING
+        assert await queue.redis.lrange(PROCESSING_KEY, 0, -1) == [job.id.encode()]
+
+        async with queue.lease(job):
+            pass
+        return await queue.redis.llen(PROCESSING_KEY)
+
+    assert asyncio.run(run()) == 0
+
+
+def test_job_of_a_crashed_worker_is_requeued() -> None:
+    queue = make_queue()
+
+    async def run():
+        queued = await queue.enqueue_summary_refresh(uuid.uuid4())
+        await queue.dequeue(timeout=1)
+        # The worker dies: its lease is never renewed
+        await queue.redis.delete(f"jobs:lease:{queued.id}")
+
+        # Seen without a lease once before it is moved
+        assert await queue.requeue_stale() == 0
+        assert await queue.requeue_stale() == 1
+        requeued = await queue.get(queued.id)
+        job = await queue.dequeue(timeout=1)
+        return queued.id, requeued.status, job.id
+
+    queued_id, status, job_id = asyncio.run(run())
+    assert status == JobStatus.QUEUED
+    assert job_id == queued_id
+
+
+def test_leased_jobs_are_not_requeued() -> None:
+    queue = make_queue()
+
+    async def run():
+        await queue.enqueue_summary_refresh(uuid.uuid4())
+        await queue.dequeue(timeout=1)
+        await queue.requeue_stale()
+        await queue.requeue_stale()
+        return await queue.queue_depth(), await queue.redis.llen(PROCESSING_KEY)
+
+    assert asyncio.run(run()) == (0, 1)
+
+
+def test_cancelled_job_goes_back_on_the_queue() -> None:
+    queue = make_queue()
+
+    async def run():
+        queued = await queue.enqueue_summary_refresh(uuid.uuid4())
+        job = await queue.dequeue(timeout=1)
+
+        async def work():
+            async with queue.lease(job):
+                await asyncio.sleep(10)
+
+        task = asyncio.ensure_future(work())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        requeued = await queue.get(queued.id)
+        # Enqueueing the client again joins the requeued job
+        again = await queue.enqueue_summary_refresh(queued.client_id)
+        return (
+            requeued.status,
+            await queue.redis.llen(PROCESSING_KEY),
+            await queue.queue_depth(),
+            again.id == queued.id,
+        )
+
+    assert asyncio.run(run()) == (JobStatus.QUEUED, 0, 1, True)
+
+
+def test_job_interrupted_by_an_unhandled_error_is_not_acked() -> None:
+    queue = make_queue()
+
+    async def run():
+        await queue.enqueue_summary_refresh(uuid.uuid4())
+        job = await queue.dequeue(timeout=1)
+        try:
+            async with queue.lease(job):
+                raise KeyboardInterrupt
+        except KeyboardInterrupt:
+            pass
+        return await queue.redis.llen(PROCESSING_KEY)
+
+    assert asyncio.run(run()) == 1
@@ -0,0 +1,86 @@
+import asyncio
+
+import fakeredis
+
+from app.schema.enums import LLMPriority
+from app.services.llm_scheduler_service import LLMSchedulerService
+
+
+def make_scheduler() -> LLMSchedulerService:
+    return LLMSchedulerService(
+        fakeredis.FakeAsyncRedis(),
+        requests_per_minute=10,
+        tokens_per_minute=1_000,
+        interactive_reserved_share=0.5,
+    )
+
+
+def test_background_calls_leave_the_interactive_share() -> None:
+    scheduler = make_scheduler()
+
+    async def run():
+        for _ in range(5):
+            await asyncio.wait_for(scheduler.acquire(1, LLMPriority.BACKGROUND), 1)
+        blocked = asyncio.ensure_future(scheduler.acquire(1, LLMPriority.BACKGROUND))
+        await asyncio.sleep(0.1)
+        assert not blocked.done()
+
+        # Admitted from the reserve, ahead of the waiting background call
+        await asyncio.wait_for(scheduler.acquire(1, LLMPriority.INTERACTIVE), 1)
+        assert not blocked.done()
+        blocked.cancel()
+
+    asyncio.run(run())
+
+
+def test_reserve_is_shared_across_schedulers() -> None:
+    redis = fakeredis.FakeAsyncRedis()
+    schedulers = [
+        LLMSchedulerService(
+            redis, requests_per_minute=10, tokens_per_minute=1_000, interactive_reserved_share=0.5
+        )
+        for _ in range(2)
+    ]
+
+    async def run():
+        for i in range(5):
+            await asyncio.wait_for(schedulers[i % 2].acquire(1, LLMPriority.BACKGROUND), 1)
+        try:
+            await asyncio.wait_for(schedulers[0].acquire(1, LLMPriority.BACKGROUND), 0.2)
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    assert asyncio.run(run())
+
+
+def test_metrics_count_admitted_calls() -> None:
+    scheduler = make_scheduler()
+
+    asyncio.run(scheduler.acquire(1, LLMPriority.INTERACTIVE))
+
+    assert scheduler.metrics()["interactive"]["admitted"] == 1
+    assert scheduler.metrics()["background"]["admitted"] == 0
+
+
+def test_dispatcher_waits_out_a_bucket_refill() -> None:
+    # 600 tokens per minute refill 5 tokens in 0.5s
+    scheduler = LLMSchedulerService(
+        fakeredis.FakeAsyncRedis(),
+        requests_per_minute=1_000,
+        tokens_per_minute=600,
+        interactive_reserved_share=0,
+    )
+
+    async def run():
+        await asyncio.wait_for(scheduler.acquire(600, LLMPriority.INTERACTIVE), 1)
+        waited = await asyncio.wait_for(scheduler.acquire(5, LLMPriority.INTERACTIVE), 3)
+        # The dispatcher survived the wait and serves later calls too
+        dispatcher = scheduler._dispatcher
+        await asyncio.wait_for(scheduler.acquire(1, LLMPriority.INTERACTIVE), 3)
+        return waited, dispatcher
+
+    waited, dispatcher = asyncio.run(run())
+
+    assert waited >= 0.4
+    assert dispatcher.exception() is None
@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+
+import fakeredis
+
+from app.schema.llm_usage import LLMUsage
+from app.services.llm_usage_service import LLMUsageService
+
+FIRM_ID = uuid.uuid4()
+
+
+def usage() -> LLMUsage:
+    return LLMUsage(
+        model="gemini-2.5-flash-lite",
+        input_tokens=1_000,
+        output_tokens=100,
+        latency_seconds=0.5,
+        client_id=uuid.uuid4(),
+        firm_id=FIRM_ID,
+    )
+
+
+def make_service(**kwargs) -> LLMUsageService:
+    return LLMUsageService(fakeredis.FakeAsyncRedis(), use_postgres=False, **kwargs)
+
+
+def test_record_buffers_until_flushed() -> None:
+    service = make_service(flush_seconds=60)
+
+    async def run():
+        for _ in range(3):
+            service.record(usage())
+        before = await service.firm_today(FIRM_ID)
+        await service.close()
+        return before, await service.firm_today(FIRM_ID)
+
+    before, after = asyncio.run(run())
+
+    assert before.calls == 0
+    assert after.calls == 3
+    assert after.input_tokens == 3_000
+
+
+def test_full_batch_is_flushed_without_waiting() -> None:
+    service = make_service(flush_seconds=60, flush_batch=2)
+
+    async def run():
+        service.record(usage())
+        service.record(usage())
+        await asyncio.sleep(0.1)
+        totals = await service.firm_today(FIRM_ID)
+        await service.close()
+        return totals
+
+    assert asyncio.run(run()).calls == 2
+
+
+def test_buffer_is_flushed_periodically() -> None:
+    service = make_service(flush_seconds=0.1)
+
+    async def run():
+        service.record(usage())
+        await asyncio.sleep(0.3)
+        first = await service.firm_today(FIRM_ID)
+        # The flusher keeps running after a timed flush
+        service_flusher = service._flusher
+        service.record(usage())
+        await asyncio.sleep(0.3)
+        second = await service.firm_today(FIRM_ID)
+        alive = not service_flusher.done()
+        await service.close()
+        return first, second, alive
+
+    first, second, alive = asyncio.run(run())
+
+    assert (first.calls, second.calls) == (1, 2)
+    assert alive
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import uuid
+
+import fakeredis
+
+from app.llms.resilient_llm import CircuitOpenError
+from app.services.single_flight_service import SingleFlightService
+from app.services.summarization_service import summary_flight_key
+
+
+def test_concurrent_calls_share_one_execution() -> None:
+    service = SingleFlightService(fakeredis.FakeAsyncRedis())
+    calls = 0
+
+    async def fn():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"n": calls}
+
+    async def run():
+        return await asyncio.gather(*(service.do("key", fn) for _ in range(3)))
+
+    assert asyncio.run(run()) == [{"n": 1}] * 3
+    assert calls == 1
+
+
+def test_follower_ignores_result_of_an_earlier_flight() -> None:
+    redis = fakeredis.FakeAsyncRedis()
+    service = SingleFlightService(redis, lock_ttl=5)
+
+    async def run():
+        await service.do("key", lambda: asyncio.sleep(0, {"flight": "old"}))
+        # Another worker leads a newer flight
+        await redis.set("single-flight:lock:key", "new-token")
+        follower = asyncio.ensure_future(
+            service.do("key", lambda: asyncio.sleep(0, {"flight": "mine"}))
+        )
+        await asyncio.sleep(0.2)
+        assert not follower.done()
+
+        payload = json.dumps({"token": "new-token", "result": {"flight": "new"}})
+        await redis.set("single-flight:result:key:new-token", payload)
+        await redis.publish("single-flight:channel:key", payload)
+        return await asyncio.wait_for(follower, 3)
+
+    assert asyncio.run(run()) == {"flight": "new"}
+
+
+def test_leader_renews_lock_while_running() -> None:
+    redis = fakeredis.FakeAsyncRedis()
+    calls = []
+
+    async def slow():
+        calls.append("leader")
+        await asyncio.sleep(1.5)
+        return {"by": "leader"}
+
+    async def other():
+        calls.append("other")
+        return {"by": "other"}
+
+    async def run():
+        # Separate instances stand in for two workers
+        leader = asyncio.ensure_future(
+            SingleFlightService(redis, lock_ttl=1)._do_distributed("key", slow)
+        )
+        await asyncio.sleep(1.2)
+        follower = SingleFlightService(redis, lock_ttl=1)._do_distributed("key", other)
+        return await asyncio.gather(leader, follower)
+
+    assert asyncio.run(run()) == [{"by": "leader"}] * 2
+    assert calls == ["leader"]
+
+
+def test_follower_raises_the_leaders_error_class() -> None:
+    redis = fakeredis.FakeAsyncRedis()
+
+    async def failing():
+        await asyncio.sleep(0.2)
+        raise CircuitOpenError("LLM unavailable")
+
+    async def run():
+        leader = asyncio.ensure_future(
+            SingleFlightService(redis)._do_distributed("key", failing)
+        )
+        await asyncio.sleep(0.05)
+        follower = SingleFlightService(redis)._do_distributed(
+            "key", lambda: asyncio.sleep(0, {})
+        )
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    leader_error, follower_error = asyncio.run(run())
+
+    assert type(leader_error) is CircuitOpenError
+    assert type(follower_error) is CircuitOpenError
+    assert str(follower_error) == "LLM unavailable"
+
+
+def test_forced_refreshes_do_not_join_plain_flights() -> None:
+    client_id = uuid.uuid4()
+
+    assert summary_flight_key(client_id) != summary_flight_key(client_id, force_refresh=True)
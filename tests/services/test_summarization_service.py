@@ -0,0 +1,126 @@
+import asyncio
+import types
+import uuid
+
+import pytest
+
+from app import crud
+from app.core.config import settings
+from app.llms.fake_llm import FakeLLM
+from app.schema.summary import Actor, EmailThreadSummary
+from app.services.email_thread_service import EmailThread
+from app.services.summarization_service import SummarizationService
+
+CLIENT_ID = uuid.uuid4()
+
+
+class Session:
+    committed = False
+
+    async def commit(self) -> None:
+        self.committed = True
+
+
+def make_service(monkeypatch, outcomes: dict) -> tuple[SummarizationService, list]:
+    staged: list = []
+
+    async def get_by_client(session, *, client_id):
+        return {}
+
+    async def stage_changes(session, *, client_id, upserts, removed):
+        staged.extend(t.fingerprint for t in upserts)
+
+    async def map_threads(mailbox, threads, on_chunk=None):
+        for thread in threads.values():
+            yield thread, outcomes[thread.id]
+
+    monkeypatch.setattr(crud.thread_summary, "get_by_client", get_by_client)
+    monkeypatch.setattr(crud.thread_summary, "stage_changes", stage_changes)
+    service = SummarizationService(Session(), llm=FakeLLM())
+    monkeypatch.setattr(service, "_map_threads", map_threads)
+    return service, staged
+
+
+def mailbox(*ids: str):
+    return types.SimpleNamespace(
+        threads=[EmailThread(id=i, email_ids=[i], fingerprint=f"fp-{i}") for i in ids]
+    )
+
+
+def summary(concluded: bool) -> EmailThreadSummary:
+    return EmailThreadSummary(actors=[], concluded=concluded, open_items=[])
+
+
+def test_failing_thread_falls_back_to_an_empty_summary(monkeypatch) -> None:
+    service, staged = make_service(monkeypatch, {"a": summary(True), "b": ValueError("bad json")})
+    failed: set[str] = set()
+
+    async def run():
+        return [
+            (t.id, s)
+            async for t, s in service._iter_thread_summaries(CLIENT_ID, mailbox("a", "b"), failed)
+        ]
+
+    results = asyncio.run(run())
+
+    assert results == [("a", summary(True)), ("b", summary(False))]
+    assert failed == {"b"}
+    # Only the thread that succeeded is cached
+    assert staged == ["fp-a"]
+
+
+def test_refresh_fails_when_every_thread_fails(monkeypatch) -> None:
+    service, _ = make_service(monkeypatch, {"a": ValueError("bad json")})
+
+    async def run():
+        async for _ in service._iter_thread_summaries(CLIENT_ID, mailbox("a"), set()):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+
+def test_stream_summary_streams_each_thread(monkeypatch) -> None:
+    service, _ = make_service(monkeypatch, {})
+    streamed = EmailThreadSummary(
+        actors=[Actor(identifier="ann@example.com")], concluded=True, open_items=[]
+    )
+    text = streamed.model_dump_json()
+
+    async def map_threads(mailbox, threads, on_chunk=None):
+        for thread in threads.values():
+            for i in range(0, len(text), 8):
+                on_chunk(thread, text[i : i + 8])
+                await asyncio.sleep(0)
+            yield thread, streamed
+
+    async def none(*args, **kwargs):
+        return None
+
+    async def load_mailbox(client_id, email_provider):
+        box = mailbox("a", "b")
+        box.fingerprints = {"a": "fp-a", "b": "fp-b"}
+        return box
+
+    async def store_summary(client_id, existing_summary, new_summary_data, diff, complete):
+        return new_summary_data
+
+    monkeypatch.setattr(settings, "SUMMARY_THREADING_ENABLED", True)
+    monkeypatch.setattr(crud.email_summary, "get_by_client", none)
+    monkeypatch.setattr(service, "get_stored_summary", none)
+    monkeypatch.setattr(service, "load_mailbox", load_mailbox)
+    monkeypatch.setattr(service.fingerprints, "diff", none)
+    monkeypatch.setattr(service, "_map_threads", map_threads)
+    monkeypatch.setattr(service, "_store_summary", store_summary)
+
+    async def run():
+        return [e async for e in service.stream_summary(CLIENT_ID, None)]
+
+    events = asyncio.run(run())
+
+    assert events[0] == ("delta", {"thread_id": "a", "text": text[:8]})
+    assert {d["thread_id"] for e, d in events if e == "delta"} == {"a", "b"}
+    # Yielded while the first thread streams, and only once across threads
+    assert [e for e, _ in events].index("actor") < len(text) // 8 + 1
+    assert [d for e, d in events if e == "actor"] == [{"identifier": "ann@example.com", "role": "unknown"}]
+    assert events[-1] == ("summary", streamed.model_dump(mode="json"))
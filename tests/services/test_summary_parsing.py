@@ -0,0 +1,83 @@
+import pytest
+
+from app.llms.fake_llm import FakeLLM
+from app.services.summarization_service import SummarizationService
+from app.utils import json_repair_candidates
+
+SUMMARY = (
+    '{"actors": [{"identifier": "anna@client.com", "role": "client"}], '
+    '"open_items": [{"description": "Send Q3 statements"}, {"description": "Sign the engagement letter"}], '
+    '"concluded": false}'
+)
+
+
+def parse(text: str):
+    return SummarizationService(None, llm=FakeLLM())._parse_summary(text)
+
+
+def test_candidates_strip_think_block_and_prose() -> None:
+    text = f"<think>plan</think>Here you go:\n```json\n{SUMMARY}\n```"
+
+    assert next(json_repair_candidates(text)) == SUMMARY
+
+
+def test_no_candidates_without_an_object() -> None:
+    assert list(json_repair_candidates("I cannot help with that.")) == []
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ('{"a": tru', '{"a": true}'),
+        ('{"a": [1, fal', '{"a": [1, false]}'),
+        ('{"a": nu', '{"a": null}'),
+        ('{"a": "open', '{"a": "open"}'),
+        ('{"a": [1, 2', '{"a": [1, 2]}'),
+    ],
+)
+def test_truncated_output_is_closed(text: str, expected: str) -> None:
+    assert list(json_repair_candidates(text))[1] == expected
+
+
+def test_strings_that_look_like_literals_are_kept() -> None:
+    assert list(json_repair_candidates('{"a": "tru'))[1] == '{"a": "tru"}'
+
+
+def test_later_candidates_trim_back_to_earlier_elements() -> None:
+    candidates = list(json_repair_candidates('{"a": [1, 2], "b": {"c": '))
+
+    assert '{"a": [1, 2]}' in candidates
+    assert candidates[-1] == "{}"
+
+
+def test_parse_summary_accepts_valid_output() -> None:
+    summary = parse(SUMMARY)
+
+    assert summary.actors[0].identifier == "anna@client.com"
+    assert len(summary.open_items) == 2
+    assert summary.concluded is False
+
+
+def test_parse_summary_completes_truncated_literal() -> None:
+    summary = parse('{"actors": [], "open_items": [], "concluded": tru')
+
+    assert summary.concluded is True
+
+
+def test_parse_summary_drops_item_cut_off_mid_way() -> None:
+    summary = parse(
+        '{"concluded": false, "actors": [], '
+        '"open_items": [{"description": "Send Q3 statements"}, {"descr'
+    )
+
+    assert [i.description for i in summary.open_items] == ["Send Q3 statements"]
+
+
+def test_parse_summary_fails_when_required_fields_were_cut_off() -> None:
+    with pytest.raises(ValueError):
+        parse('{"actors": [], "open_items": [{"description": "Send Q3')
+
+
+def test_parse_summary_rejects_non_json() -> None:
+    with pytest.raises(ValueError):
+        parse("Sorry, no summary.")
@@ -0,0 +1,49 @@
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def graph_message(i: int, sender: str, to: str) -> dict:
+    return {
+        "id": f"msg-{i}",
+        "internetMessageId": f"<{i}@example.com>",
+        "conversationId": f"conv-{i % 3}",
+        "subject": f"Subject {i}",
+        "from": {"emailAddress": {"address": sender}},
+        "toRecipients": [{"emailAddress": {"address": to}}],
+        "ccRecipients": [],
+        "receivedDateTime": f"2026-01-01T00:{i:02d}:00Z",
+        "body": {"contentType": "text", "content": f"Body {i}"},
+    }
+
+
+def graph_stand_in(messages: list[dict], page_size: int = 2) -> FastAPI:
+    """
+    Minimal Microsoft Graph mailbox serving `messages` in pages of
+    `page_size` through `@odata.nextLink`. Requests are kept in
+    `app.state.requests` for assertions.
+    """
+    app = FastAPI()
+    app.state.requests = []
+
+    @app.get("/v1.0/users/{mailbox}/messages")
+    async def list_messages(mailbox: str, request: Request):
+        app.state.requests.append(request)
+        skip = int(request.query_params.get("$skip", 0))
+        body = {"value": messages[skip : skip + page_size]}
+        if skip + page_size < len(messages):
+            body["@odata.nextLink"] = (
+                f"{request.base_url}v1.0/users/{mailbox}/messages?$skip={skip + page_size}"
+            )
+        return body
+
+    @app.get("/v1.0/users/{mailbox}/mailFolders/{folder}/messages/delta")
+    async def delta(mailbox: str, folder: str, request: Request):
+        app.state.requests.append(request)
+        if request.query_params.get("$deltatoken") == "expired":
+            return JSONResponse({"error": {"code": "SyncStateNotFound"}}, status_code=410)
+        return {
+            "value": messages,
+            "@odata.deltaLink": f"{request.base_url}v1.0/users/{mailbox}/mailFolders/{folder}/messages/delta?$deltatoken=next",
+        }
+
+    return app